@@ -0,0 +1,14 @@
+"""Micro and scaling benchmarks for the seed package.
+
+Each module can be run directly, for instance:
+
+    python -m benchmarks.bench_common
+    python -m benchmarks.bench_seed --sizes 1000 100000 --output after.json
+    python -m benchmarks.compare before.json after.json
+    python -m benchmarks.bench_storage --size 100000
+    python -m benchmarks.bench_parallel --size 1000000 --workers 1 2 4 8
+    python -m benchmarks.bench_prompts --size 100000 --prompts 100000
+    python -m benchmarks.bench_incidence --size 100000 --edits 1000
+    python -m benchmarks.bench_memories --size 100000 --descriptors-per-asset 2
+    python -m benchmarks.bench_similarity --size 500000 --queries 100 --k 10
+"""
@@ -0,0 +1,130 @@
+"""Micro-benchmarks for the helper functions in seed.common"""
+
+import argparse
+import re
+import timeit
+
+from seed import common
+
+
+def recursive_fibonacci(n: int):
+    """The original double recursion implementation, kept as the baseline."""
+    if n <= 1:
+        return n
+    return recursive_fibonacci(n - 1) + recursive_fibonacci(n - 2)
+
+
+def linear_next_fibonacci(n: int):
+    """The original while-loop implementation of get_next_fibonacci, kept as the baseline."""
+    if n <= 0:
+        return 1
+    if n == 1:
+        return 2
+    a, b = 0, 1
+    while b < n:
+        a, b = b, a + b
+    if b == n:
+        return a + b
+    return b
+
+
+def float_is_fibonacci(n: int):
+    """The original floating point implementation of is_fibonacci, kept as the baseline."""
+    if n < 0:
+        return False
+    if n <= 1:
+        return True
+    for discriminant in (5 * n * n + 4, 5 * n * n - 4):
+        m = int(discriminant**0.5)
+        if m * m == discriminant:
+            return True
+    return False
+
+
+def regex_num_words(description: str):
+    """The original regex split implementation of get_num_words, kept as the baseline."""
+    return len(re.split(r"\s+", description))
+
+
+def time_call(func, arg, number):
+    """Average seconds per call of func(arg)."""
+    return timeit.timeit(lambda: func(arg), number=number) / number
+
+
+def bench_get_fibonacci(max_recursive_n: int):
+    """Print the before/after curve of get_fibonacci across n."""
+    print(f"{'n':>8} {'recursive (s)':>16} {'get_fibonacci (s)':>18}")
+    for n in [5, 10, 15, 20, 25, 30, 35, 50, 100, 1000, 10000, 100000]:
+        before = "-"
+        if n <= max_recursive_n:
+            before = f"{time_call(recursive_fibonacci, n, 1):.3e}"
+        after = f"{time_call(common.get_fibonacci, n, 1000):.3e}"
+        print(f"{n:>8} {before:>16} {after:>18}")
+
+
+def bench_next_fibonacci():
+    """Print the before/after curve of get_next_fibonacci across the size of n."""
+    print(f"{'n':>8} {'while-loop (s)':>16} {'get_next (s)':>18}")
+    for exponent in [1, 3, 6, 9, 20, 50, 100]:
+        n = 10**exponent
+        before = time_call(linear_next_fibonacci, n, 1000)
+        after = time_call(common.get_next_fibonacci, n, 1000)
+        print(f"{'1e' + str(exponent):>8} {before:>16.3e} {after:>18.3e}")
+
+
+def bench_is_fibonacci(batch_size: int):
+    """Print per-item cost of the float baseline, is_fibonacci and is_fibonacci_many."""
+    values = list(range(batch_size))
+    before = timeit.timeit(lambda: [float_is_fibonacci(n) for n in values], number=1) / batch_size
+    single = timeit.timeit(lambda: [common.is_fibonacci(n) for n in values], number=1) / batch_size
+    batch = timeit.timeit(lambda: common.is_fibonacci_many(values), number=1) / batch_size
+    print(f"is_fibonacci over {batch_size} values, seconds per item")
+    print(f"{'float baseline':>16} {'is_fibonacci':>16} {'is_fibonacci_many':>18}")
+    print(f"{before:>16.3e} {single:>16.3e} {batch:>18.3e}")
+
+    # The float baseline stops being exact once 5*n*n+4 is far enough past 2**53
+    missed = [i for i in range(200) if not float_is_fibonacci(common.get_fibonacci(i))]
+    print(f"F(0)..F(199) rejected by the float baseline: {len(missed)}, first at F({missed[0]})")
+
+
+def bench_get_num_words():
+    """Print the before/after cost of get_num_words for short and multi-kilobyte descriptions."""
+    samples = {
+        "short": "blue haired woman in bar",
+        "1 KiB": "lorem ipsum dolor sit amet " * 38,
+        "16 KiB": "lorem ipsum dolor sit amet " * 607,
+        "16 KiB utf-8": "crème brûlée à la française " * 585,
+    }
+    print(f"{'description':>14} {'re.split (s)':>14} {'get_num_words (s)':>18}")
+    for label, description in samples.items():
+        number = 100000 if label == "short" else 1000
+        before = time_call(regex_num_words, description, number)
+        after = time_call(common.get_num_words, description, number)
+        print(f"{label:>14} {before:>14.3e} {after:>18.3e}")
+
+    batch = list(samples.values()) * 10000
+    before = timeit.timeit(lambda: [regex_num_words(i) for i in batch], number=1)
+    after = timeit.timeit(lambda: common.count_words_many(batch), number=1)
+    print(f"{'batch of ' + str(len(batch)):>14} {before:>14.3e} {after:>18.3e}")
+
+
+def main():
+    """Run the seed.common micro-benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=1000000, help="Number of values for the is_fibonacci batch")
+    parser.add_argument(
+        "--max-recursive-n", type=int, default=30, help="Largest n to time with the recursive baseline (it is exponential)"
+    )
+    args = parser.parse_args()
+
+    bench_get_fibonacci(args.max_recursive_n)
+    print()
+    bench_next_fibonacci()
+    print()
+    bench_is_fibonacci(args.batch_size)
+    print()
+    bench_get_num_words()
+
+
+if __name__ == "__main__":
+    main()
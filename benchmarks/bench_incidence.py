@@ -0,0 +1,56 @@
+"""Export, incremental update and .npz save/load times of the incidence matrix of a generated world.
+
+    python -m benchmarks.bench_incidence --size 100000 --edits 1000
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+
+from benchmarks.generate import generate_seed_json
+from seed.incidence import IncidenceMatrix
+from seed.models.main_seed import MainSeed
+
+
+def timed(func, *args, **kwargs):
+    """The result of func(*args, **kwargs) and the seconds it took."""
+    gc.collect()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Run the incidence matrix benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100000, help="Assets and descriptors in the world")
+    parser.add_argument("--edits", type=int, default=1000, help="Descriptions added before the incremental update")
+    args = parser.parse_args()
+
+    main_seed = MainSeed.model_validate_json(generate_seed_json(args.size, args.size))
+    print(f"World of {args.size} assets and descriptors")
+
+    matrix, seconds = timed(IncidenceMatrix.from_main_seed, main_seed)
+    print(f"{'from_main_seed':>24} {seconds:>8.3f} s  {matrix.nnz} links")
+
+    asset_names, descriptor_names = list(main_seed.global_assets), list(main_seed.global_descriptors)
+    for index in range(args.edits):
+        asset_name = asset_names[index * 7919 % len(asset_names)]
+        descriptor_name = descriptor_names[index * 104729 % len(descriptor_names)]
+        main_seed.add_description_to_asset(asset_name, descriptor_name, f"edit {index}")
+    rows, seconds = timed(matrix.update, main_seed)
+    print(f"{'update':>24} {seconds:>8.3f} s  {rows} rows after {args.edits} edits")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "world.npz")
+        _, seconds = timed(matrix.save, path)
+        print(f"{'save':>24} {seconds:>8.3f} s  {os.path.getsize(path) / 2**20:.1f} MiB")
+        for mmap in (True, False):
+            _, seconds = timed(IncidenceMatrix.load, path, mmap=mmap)
+            print(f"{f'load (mmap={mmap})':>24} {seconds:>8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
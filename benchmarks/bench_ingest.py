@@ -0,0 +1,122 @@
+"""Ingest and load benchmarks: adding descriptions one call at a time, and loading the
+resulting world with and without validation.
+
+    python -m benchmarks.bench_ingest --descriptions 1000000
+"""
+
+import argparse
+import gc
+import random
+import time
+
+from benchmarks.generate import WORDS
+from seed.models.main_seed import MainSeed
+from seed.storage.columnar import ColumnarSeed
+from seed.storage.sqlite import SqliteSeed
+
+
+def ingest_rows(num_descriptions: int, num_assets: int, num_descriptors: int, seed=0):
+    """Deterministic (asset, descriptor, description) rows with unique two word descriptions."""
+    rng = random.Random(seed)
+    return [
+        (f"asset{rng.randrange(num_assets)}", f"desc{rng.randrange(num_descriptors)}", f"{rng.choice(WORDS)} note{index}")
+        for index in range(num_descriptions)
+    ]
+
+
+def timed(func, *args):
+    """Run func(*args) and return (result, seconds)."""
+    gc.collect()
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def ingest(rows):
+    """Add every row through the public single-description API."""
+    main_seed = MainSeed()
+    for asset_name, descriptor_name, description in rows:
+        main_seed.add_description_to_asset(asset_name, descriptor_name, description)
+    return main_seed
+
+
+def bulk_ingest(rows):
+    """Add every row with one bulk call."""
+    main_seed = MainSeed()
+    main_seed.bulk_add_descriptions(rows)
+    return main_seed
+
+
+def ingest_columnar(rows):
+    """Add every row to a ColumnarSeed one call at a time. Descriptions are hash indexed, linking
+    scans the asset's links, so this stays linear while assets hold few descriptors."""
+    columnar = ColumnarSeed()
+    for asset_name, descriptor_name, description in rows:
+        columnar.add_description_to_asset(asset_name, descriptor_name, description)
+    return columnar
+
+
+def ingest_sqlite(rows):
+    """Add every row to an in-memory database in batched transactions."""
+    seed_db = SqliteSeed()
+    seed_db.bulk_add_descriptions(rows)
+    return seed_db
+
+
+def query(seed, asset_names):
+    """Relations and exported descriptions of each asset."""
+    for asset_name in asset_names:
+        seed.asset_relations(asset_name)
+        seed.export_asset_descriptions(asset_name)
+
+
+def main():
+    """Run the ingest and load benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--descriptions", type=int, default=1000000, help="Descriptions to ingest")
+    parser.add_argument("--assets", type=int, default=100000, help="Distinct assets the rows are spread over")
+    parser.add_argument("--descriptors", type=int, default=100000, help="Distinct descriptors the rows are spread over")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each load, the best is reported")
+    args = parser.parse_args()
+
+    rows = ingest_rows(args.descriptions, args.assets, args.descriptors)
+    main_seed, seconds = timed(ingest, rows)
+    print(f"{'add_description_to_asset':>26} {seconds:>8.2f} s  {len(rows) / seconds:>10.0f} rows/s")
+
+    _, seconds = timed(bulk_ingest, rows)
+    print(f"{'bulk_add_descriptions':>26} {seconds:>8.2f} s  {len(rows) / seconds:>10.0f} rows/s")
+
+    _, seconds = timed(ingest_columnar, rows)
+    print(f"{'ColumnarSeed add':>26} {seconds:>8.2f} s  {len(rows) / seconds:>10.0f} rows/s")
+
+    seed_db, seconds = timed(ingest_sqlite, rows)
+    print(f"{'SqliteSeed bulk':>26} {seconds:>8.2f} s  {len(rows) / seconds:>10.0f} rows/s")
+
+    asset_names = [asset_name for asset_name, _, _ in rows[:10000]]
+    for label, seed in (("MainSeed queries", main_seed), ("SqliteSeed queries", seed_db)):
+        _, seconds = timed(query, seed, asset_names)
+        print(f"{label:>26} {seconds:>8.2f} s  {len(asset_names) / seconds:>10.0f} assets/s")
+    seed_db.close()
+
+    seed_json, seconds = timed(main_seed.model_dump_json)
+    print(f"{'model_dump_json':>26} {seconds:>8.2f} s  {len(seed_json) / 2**20:>10.1f} MiB")
+    del main_seed
+
+    # Best of a few alternating runs, so garbage from one load doesn't skew the other
+    modes = {
+        "load (validated)": {},
+        "load (trusted)": {"trusted": True},
+        "load (lazy)": {"lazy": True},
+        "load (lazy, trusted)": {"lazy": True, "trusted": True},
+    }
+    best = dict.fromkeys(modes, float("inf"))
+    for _ in range(args.repeat):
+        for label, kwargs in modes.items():
+            best[label] = min(best[label], timed(lambda kw=kwargs: MainSeed.load(seed_json, **kw))[1])
+
+    for label, seconds in best.items():
+        print(f"{label:>26} {seconds:>8.2f} s  {best['load (validated)'] / seconds:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
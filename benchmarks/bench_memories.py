@@ -0,0 +1,73 @@
+"""Memory (connected component) queries of a generated world, union-find against walking asset_relations.
+
+    python -m benchmarks.bench_memories --size 100000 --queries 10000
+"""
+
+import argparse
+import gc
+import random
+import time
+
+from benchmarks.generate import generate_seed_json
+from seed.models.main_seed import MainSeed
+
+
+def timed(func, *args):
+    """The result of func(*args) and the seconds it took."""
+    gc.collect()
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def walk_memory(main_seed: MainSeed, asset_name: str):
+    """The memory of an asset found by repeated asset_relations calls, as it was done before."""
+    memory, pending = set(), [asset_name]
+    while pending:
+        name = pending.pop()
+        if name not in memory:
+            memory.add(name)
+            for related in main_seed.asset_relations(name).values():
+                pending.extend(related - memory)
+    return memory
+
+
+def main():
+    """Run the memories benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100000, help="Assets and descriptors in the world")
+    parser.add_argument("--queries", type=int, default=10000, help="asset_memory and link_descriptor calls timed")
+    parser.add_argument("--walks", type=int, default=10, help="asset_relations walks timed, each can visit the world")
+    parser.add_argument("--descriptors-per-asset", type=int, default=1, help="Sparse worlds have many memories")
+    args = parser.parse_args()
+
+    seed_json = generate_seed_json(args.size, args.size, descriptors_per_asset=args.descriptors_per_asset)
+    main_seed = MainSeed.model_validate_json(seed_json)
+    rng = random.Random(0)
+    asset_names = rng.choices(list(main_seed.global_assets), k=args.queries)
+    descriptor_names = rng.choices(list(main_seed.global_descriptors), k=args.queries)
+    print(f"World of {args.size} assets and descriptors, {args.descriptors_per_asset} descriptors per asset")
+
+    _, seconds = timed(main_seed.rebuild_memories)
+    print(f"{'rebuild_memories':>24} {seconds:>10.3f} s")
+    sizes, seconds = timed(main_seed.memory_sizes)
+    print(f"{'memory_sizes':>24} {seconds:>10.3f} s  {len(sizes)} memories, largest {sizes[0]} assets")
+
+    _, seconds = timed(lambda: [main_seed.memory_size(name) for name in asset_names])
+    print(f"{'memory_size':>24} {seconds / args.queries * 1e6:>10.2f} us/call")
+    _, seconds = timed(lambda: [main_seed.asset_memory(name) for name in asset_names[:100]])
+    print(f"{'asset_memory':>24} {seconds / 100 * 1e6:>10.2f} us/call")
+    _, seconds = timed(lambda: [walk_memory(main_seed, name) for name in asset_names[: args.walks]])
+    print(f"{'walk asset_relations':>24} {seconds / args.walks * 1e6:>10.2f} us/call")
+
+    links = list(zip(asset_names, descriptor_names))
+    _, seconds = timed(lambda: [main_seed.link_descriptor(*link) for link in links])
+    print(f"{'link_descriptor':>24} {seconds / args.queries * 1e6:>10.2f} us/call, memories kept up to date")
+
+    unlinks = list(dict.fromkeys(links))[:100]
+    _, seconds = timed(lambda: [(main_seed.remove_descriptor(*link), main_seed.memory_size(link[0])) for link in unlinks])
+    print(f"{'remove_descriptor + query':>24} {seconds / len(unlinks) * 1e6:>10.2f} us/call, rebuilds the memory it split")
+
+
+if __name__ == "__main__":
+    main()
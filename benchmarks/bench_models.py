@@ -0,0 +1,125 @@
+"""Micro-benchmarks for per-operation cost of the models, and name string and per-entity memory of a loaded world"""
+
+import argparse
+import gc
+import sys
+import timeit
+import tracemalloc
+
+from benchmarks.generate import generate_seed_json
+from seed.models import Asset, Descriptor
+from seed.models.main_seed import MainSeed
+from seed.storage.columnar import ColumnarSeed
+
+
+def rebuild_remove_link(descriptor: Descriptor, asset_name: str):
+    """The original Descriptor.remove_link, which rebuilt the set and lowercased every link."""
+    descriptor.asset_links = {i for _, i in enumerate(descriptor.asset_links) if i.lower() != asset_name.lower()}
+
+
+def bench_operations(num_links: int, number: int):
+    """Print the cost of link/unlink operations on models holding num_links links."""
+    names = [f"asset{index}" for index in range(num_links)]
+    descriptor = Descriptor(name="shared", asset_links=set(names))
+    asset = Asset(name="asset", descriptors=set(names))
+
+    def unlink_relink(remove):
+        remove(names[0])
+        descriptor.link_asset(names[0])
+
+    timings = {
+        "remove_link (rebuild baseline)": lambda: unlink_relink(lambda name: rebuild_remove_link(descriptor, name)),
+        "remove_link": lambda: unlink_relink(descriptor.remove_link),
+        "link_asset": lambda: descriptor.link_asset(names[0]),
+        "add_descriptor": lambda: asset.add_descriptor(names[0]),
+        "remove_descriptor + add": lambda: (asset.remove_descriptor(names[0]), asset.add_descriptor(names[0])),
+    }
+    print(f"Model operations with {num_links} links, seconds per call")
+    for label, func in timings.items():
+        print(f"{label:>32} {timeit.timeit(func, number=number) / number:.3e}")
+
+
+def name_objects(main_seed: MainSeed):
+    """Count the distinct string objects used for names across keys, names, descriptors and links."""
+    objects = {}
+    for key, asset in main_seed.global_assets.items():
+        for name in (key, asset.name, *asset.descriptors):
+            objects[id(name)] = name
+    for key, desc in main_seed.global_descriptors.items():
+        for name in (key, desc.name, *desc.asset_links):
+            objects[id(name)] = name
+    unique_names = set(objects.values())
+    return len(objects), len(unique_names), sum(sys.getsizeof(i) for i in objects.values())
+
+
+def description_objects(main_seed: MainSeed):
+    """Count the descriptions held by all descriptors and the distinct string objects behind them."""
+    objects = {}
+    total = 0
+    for desc in main_seed.global_descriptors.values():
+        total += len(desc.descriptions)
+        for description in desc.descriptions:
+            objects[id(description)] = description
+    return total, len(objects), sum(sys.getsizeof(i) for i in objects.values())
+
+
+def bench_name_memory(size: int):
+    """Print the retained memory and name string objects of a loaded world."""
+    seed_json = generate_seed_json(size, size)
+    gc.collect()
+    tracemalloc.start()
+    main_seed = MainSeed.model_validate_json(seed_json)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    total_objects, unique_names, name_bytes = name_objects(main_seed)
+    print(f"World of {size} assets and descriptors")
+    print(f"{'retained MiB':>32} {retained / 2**20:.1f}")
+    print(f"{'name string objects':>32} {total_objects} for {unique_names} unique names")
+    print(f"{'name string MiB':>32} {name_bytes / 2**20:.1f}")
+
+    total_descriptions, description_strings, description_bytes = description_objects(main_seed)
+    print(f"{'description string objects':>32} {description_strings} for {total_descriptions} descriptions")
+    print(f"{'description string MiB':>32} {description_bytes / 2**20:.1f}")
+
+
+def bench_entity_memory(size: int):
+    """Print the retained memory per asset and descriptor of a MainSeed and of a ColumnarSeed."""
+    seed_json = generate_seed_json(size, size)
+
+    def retained(build):
+        gc.collect()
+        tracemalloc.start()
+        seed = build()
+        gc.collect()
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return current, seed
+
+    main_bytes, main_seed = retained(lambda: MainSeed.model_validate_json(seed_json))
+    entities = main_seed.num_assets + main_seed.num_descriptors
+    del main_seed
+    # The MainSeed is freed before measuring, so the columns don't share its strings
+    columnar_bytes, _ = retained(lambda: ColumnarSeed.from_main_seed(MainSeed.model_validate_json(seed_json)))
+
+    print(f"{'bytes per entity':>32} {'MainSeed':>10} {'ColumnarSeed':>13}")
+    print(f"{'':>32} {main_bytes / entities:>10.0f} {columnar_bytes / entities:>13.0f}")
+
+
+def main():
+    """Run the model micro-benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--links", type=int, default=1000, help="Links held by the benchmarked descriptor and asset")
+    parser.add_argument("--number", type=int, default=1000, help="Calls per timed operation")
+    parser.add_argument("--size", type=int, default=100000, help="Assets and descriptors in the loaded world")
+    args = parser.parse_args()
+
+    bench_operations(args.links, args.number)
+    print()
+    bench_name_memory(args.size)
+    print()
+    bench_entity_memory(args.size)
+
+
+if __name__ == "__main__":
+    main()
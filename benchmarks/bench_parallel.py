@@ -0,0 +1,42 @@
+"""Validated load time of a generated world with one process and with a pool of workers.
+
+    python -m benchmarks.bench_parallel --size 1000000 --workers 1 2 4 8
+"""
+
+import argparse
+import gc
+import os
+import time
+
+from benchmarks.generate import generate_seed_json
+from seed.models.main_seed import MainSeed
+from seed.storage import parallel
+
+
+def timed(func, *args, **kwargs):
+    """Seconds taken by func(*args, **kwargs)."""
+    gc.collect()
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the parallel load benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100000, help="Assets and descriptors in the world")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker counts to time")
+    args = parser.parse_args()
+
+    seed_json = generate_seed_json(args.size, args.size)
+    print(f"World of {args.size} assets and descriptors, {os.cpu_count()} CPUs")
+
+    baseline = timed(MainSeed.model_validate_json, seed_json)
+    print(f"{'model_validate_json':>24} {baseline:>8.2f} s")
+    for workers in args.workers:
+        seconds = timed(parallel.load, seed_json, workers=workers)
+        print(f"{f'parallel.load ({workers})':>24} {seconds:>8.2f} s  {baseline / seconds:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
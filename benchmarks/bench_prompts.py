@@ -0,0 +1,39 @@
+"""Prompt assembly throughput over a generated world, with a cold and a warm fragment cache.
+
+    python -m benchmarks.bench_prompts --size 100000 --prompts 100000 --budget 256
+"""
+
+import argparse
+import gc
+import time
+
+from benchmarks.generate import generate_seed_json
+from seed.models.main_seed import MainSeed
+from seed.prompts import PromptBuilder
+
+
+def main():
+    """Run the prompt assembly benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100000, help="Assets and descriptors in the world")
+    parser.add_argument("--prompts", type=int, default=100000, help="Prompts built per pass")
+    parser.add_argument("--budget", type=int, default=256, help="Estimated tokens per prompt")
+    args = parser.parse_args()
+
+    main_seed = MainSeed.model_validate_json(generate_seed_json(args.size, args.size))
+    asset_names = list(main_seed.global_assets)
+    asset_names = (asset_names * (args.prompts // len(asset_names) + 1))[: args.prompts]
+    builder = PromptBuilder(main_seed, budget=args.budget)
+    print(f"World of {args.size} assets and descriptors, {args.prompts} prompts of {args.budget} tokens")
+
+    for label in ("cold cache", "warm cache"):
+        gc.collect()
+        start = time.perf_counter()
+        built = builder.build_many(asset_names)
+        seconds = time.perf_counter() - start
+        average = sum(map(len, built)) / len(built)
+        print(f"{label:>12} {seconds:>8.2f} s {len(built) / seconds * 60:>12.0f} prompts/min {average:>8.0f} chars/prompt")
+
+
+if __name__ == "__main__":
+    main()
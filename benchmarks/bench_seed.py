@@ -0,0 +1,87 @@
+"""Scaling benchmarks for MainSeed at production sizes.
+
+Generates worlds with the requested number of assets and descriptors, times the main
+MainSeed operations and writes a JSON report that can be compared between commits
+with benchmarks.compare:
+
+    python -m benchmarks.bench_seed --sizes 1000 100000 --output before.json
+"""
+
+import argparse
+import gc
+import random
+
+from benchmarks import harness
+from benchmarks.generate import generate_seed_json
+from seed.models.main_seed import MainSeed
+
+DEFAULT_SIZES = [1000, 100000, 1000000]
+
+
+def bench_size(size: int, args):
+    """Run every operation against a generated world of the given size."""
+    results = []
+    rng = random.Random(args.seed)
+    seed_json = generate_seed_json(size, size, seed=args.seed)
+
+    def measure(operation, func, calls, items_per_call=1, memory_calls=None):
+        gc.collect()
+        latencies = harness.time_calls(func, calls)
+        peak = None
+        if args.memory:
+            gc.collect()
+            memory_calls = memory_calls if memory_calls is not None else calls
+            peak = harness.peak_memory(lambda: [func(*call) for call in memory_calls])
+        results.append(harness.summarize(operation, size, latencies, items_per_call, peak))
+
+    # Loading and dumping process the whole world per call
+    world_size = 2 * size
+    measure("model_validate_json", MainSeed.model_validate_json, [(seed_json,)] * args.repeat, world_size, [(seed_json,)])
+    main_seed = MainSeed.model_validate_json(seed_json)
+    measure("model_dump_json", main_seed.model_dump_json, [()] * args.repeat, world_size, [()])
+    del seed_json
+
+    asset_names = list(main_seed.global_assets)
+    descriptor_names = list(main_seed.global_descriptors)
+    sampled_assets = [(name,) for name in rng.choices(asset_names, k=args.calls)]
+    measure("asset_relations", main_seed.asset_relations, sampled_assets)
+    main_seed.clear_export_cache()
+    measure("export_asset_descriptions", main_seed.export_asset_descriptions, sampled_assets)
+    # Every sampled asset is cached now, and unchanged
+    measure("export_descriptions_cached", main_seed.export_asset_descriptions, sampled_assets)
+    main_seed.clear_export_cache()
+    measure("iter_asset_descriptions", lambda name: sum(1 for _ in main_seed.iter_asset_descriptions(name)), sampled_assets)
+
+    # Adding mutates the world, so the memory pass uses its own new descriptions
+    def add_calls(prefix):
+        return [
+            (rng.choice(asset_names), rng.choice(descriptor_names), f"{prefix} note{index}") for index in range(args.calls)
+        ]
+
+    measure("add_description_to_asset", main_seed.add_description_to_asset, add_calls("timed"), 1, add_calls("traced"))
+    return results
+
+
+def main():
+    """Run the MainSeed scaling benchmarks and write the JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Number of assets and descriptors")
+    parser.add_argument("--calls", type=int, default=1000, help="Calls per operation for the per-asset operations")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeats of the whole-world load and dump")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for world generation and sampling")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="Skip the tracemalloc peak memory pass")
+    parser.add_argument("--output", default="bench_seed.json", help="Path of the JSON report")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        results.extend(bench_size(size, args))
+        gc.collect()
+
+    harness.print_results(results)
+    harness.write_report(results, args.output, benchmark="bench_seed", sizes=args.sizes, calls=args.calls)
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""similar_assets against a brute force scan of every asset: build time, query time and recall@k.
+
+    python -m benchmarks.bench_similarity --size 500000 --queries 100 --k 10
+"""
+
+import argparse
+import gc
+import random
+import time
+
+from benchmarks.generate import generate_seed_json
+from seed.models.main_seed import MainSeed
+from seed.models.similarity import jaccard
+
+
+def timed(func, *args):
+    """The result of func(*args) and the seconds it took."""
+    gc.collect()
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def brute_force(main_seed: MainSeed, asset_name: str, k: int):
+    """The exact top k, by comparing the asset with every other asset."""
+    descriptors = main_seed.global_assets[asset_name].descriptors
+    scored = []
+    for name, asset in main_seed.global_assets.items():
+        if name != asset_name and not descriptors.isdisjoint(asset.descriptors):
+            scored.append((name, jaccard(descriptors, asset.descriptors)))
+    scored.sort(key=lambda item: (-item[1], item[0]))
+    return scored[:k]
+
+
+def recall(found, exact):
+    """The share of the exact top k found, where any asset tied with the k-th score counts as a hit."""
+    if not exact:
+        return 1.0
+    lowest = exact[-1][1]
+    return min(sum(1 for _, score in found if score >= lowest), len(exact)) / len(exact)
+
+
+def main():
+    """Run the similar assets benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100000, help="Assets in the world")
+    parser.add_argument("--descriptors", type=int, default=None, help="Descriptors in the world, size / 20 by default")
+    parser.add_argument("--descriptors-per-asset", type=int, default=5, help="Descriptors linked to each asset")
+    parser.add_argument("--queries", type=int, default=100, help="Assets queried")
+    parser.add_argument("--k", type=int, default=10, help="Similar assets per query")
+    args = parser.parse_args()
+
+    num_descriptors = args.descriptors or max(1, args.size // 20)
+    seed_json = generate_seed_json(args.size, num_descriptors, descriptors_per_asset=args.descriptors_per_asset)
+    main_seed = MainSeed.model_validate_json(seed_json)
+    del seed_json
+    queries = random.Random(0).sample(list(main_seed.global_assets), k=min(args.queries, args.size))
+    print(f"World of {args.size} assets, {num_descriptors} descriptors, {args.descriptors_per_asset} per asset")
+
+    _, seconds = timed(main_seed.rebuild_similarity_index)
+    print(f"{'build index':>16} {seconds:>10.2f} s")
+
+    found, seconds = timed(lambda: [main_seed.similar_assets(name, args.k) for name in queries])
+    print(f"{'similar_assets':>16} {seconds / len(queries) * 1e3:>10.2f} ms/query")
+    exact, seconds = timed(lambda: [brute_force(main_seed, name, args.k) for name in queries])
+    print(f"{'brute force':>16} {seconds / len(queries) * 1e3:>10.2f} ms/query")
+
+    recalls = [recall(approximate, expected) for approximate, expected in zip(found, exact)]
+    print(f"{f'recall@{args.k}':>16} {sum(recalls) / len(recalls):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Time and peak memory of saving and loading a world through each persistence path.
+
+    python -m benchmarks.bench_storage --size 100000
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+
+from benchmarks.generate import generate_seed_json
+from benchmarks.harness import peak_memory
+from seed.models.main_seed import MainSeed
+from seed.storage import json_stream, snapshot
+from seed.storage.journal import JournaledSeed
+
+
+def dump_whole(main_seed: MainSeed, path: str):
+    """Serialize the full document in memory, then write it."""
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write(main_seed.model_dump_json())
+
+
+def load_whole(path: str):
+    """Read the full document, then validate it."""
+    with open(path, "rb") as fp:
+        return MainSeed.model_validate_json(fp.read())
+
+
+def dump_stream(main_seed: MainSeed, path: str):
+    """Write one entry at a time."""
+    with open(path, "w", encoding="utf-8") as fp:
+        json_stream.dump(main_seed, fp)
+
+
+def load_stream(path: str):
+    """Read and insert one entry at a time."""
+    with open(path, "rb") as fp:
+        return json_stream.load(fp)
+
+
+def load_snapshot_lazy(path: str):
+    """Map the snapshot and read one asset, the rest stays undecoded."""
+    main_seed = snapshot.load(path)
+    return next(iter(main_seed.global_assets.values()))
+
+
+def load_snapshot(path: str):
+    """Map the snapshot and decode every record."""
+    return snapshot.load(path, lazy=False)
+
+
+def measure(func, *args):
+    """Return (seconds, peak traced MiB) of a single call, the timing is taken without tracing."""
+    gc.collect()
+    start = time.perf_counter()
+    func(*args)
+    seconds = time.perf_counter() - start
+    gc.collect()
+    return seconds, peak_memory(func, *args) / 2**20
+
+
+def bench_edits(main_seed: MainSeed, directory: str, edits: int):
+    """Print the cost per persisted edit of journaling against re-dumping the world."""
+    rows = [(f"asset{index}", f"desc{index}", f"edit{index}") for index in range(edits)]
+    snapshot.dump(main_seed, os.path.join(directory, "snapshot-00000000.snap"))
+
+    with JournaledSeed(directory) as journaled:
+        start = time.perf_counter()
+        for row in rows:
+            journaled.add_description_to_asset(*row)
+        journaled_seconds = (time.perf_counter() - start) / edits
+
+    path = os.path.join(directory, "redump.snap")
+    start = time.perf_counter()
+    for row in rows[:3]:
+        main_seed.add_description_to_asset(*row)
+        snapshot.dump(main_seed, path)
+    redump_seconds = (time.perf_counter() - start) / 3
+
+    print(f"{'edit + journal append':>30} {journaled_seconds * 1e6:>8.1f} us per edit")
+    print(f"{'edit + snapshot.dump':>30} {redump_seconds * 1e6:>8.1f} us per edit")
+
+
+def main():
+    """Run the persistence benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100000, help="Assets and descriptors in the world")
+    parser.add_argument("--edits", type=int, default=10000, help="Journaled edits to time")
+    args = parser.parse_args()
+
+    main_seed = MainSeed.model_validate_json(generate_seed_json(args.size, args.size))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "seed.json")
+        snapshot_path = os.path.join(directory, "seed.snap")
+        runs = {
+            "model_dump_json + write": (dump_whole, main_seed, path),
+            "json_stream.dump": (dump_stream, main_seed, path),
+            "read + model_validate_json": (load_whole, path),
+            "json_stream.load": (load_stream, path),
+            "snapshot.dump": (snapshot.dump, main_seed, snapshot_path),
+            "snapshot.load (lazy, 1 asset)": (load_snapshot_lazy, snapshot_path),
+            "snapshot.load": (load_snapshot, snapshot_path),
+        }
+        print(f"World of {args.size} assets and descriptors")
+        for label, (func, *func_args) in runs.items():
+            seconds, peak = measure(func, *func_args)
+            print(f"{label:>30} {seconds:>8.2f} s  {peak:>8.1f} MiB peak")
+        print(f"{'JSON size':>30} {os.path.getsize(path) / 2**20:>8.1f} MiB")
+        print(f"{'snapshot size':>30} {os.path.getsize(snapshot_path) / 2**20:>8.1f} MiB")
+
+    with tempfile.TemporaryDirectory() as directory:
+        bench_edits(main_seed, directory, args.edits)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Compare two benchmark JSON reports, for instance from two commits:
+
+    python -m benchmarks.compare before.json after.json
+"""
+
+import argparse
+import json
+
+
+def load_results(path: str):
+    """Map (operation, size) to the result entry of a report."""
+    with open(path, "r", encoding="utf-8") as file:
+        report = json.load(file)
+    return report["meta"], {(entry["operation"], entry["size"]): entry for entry in report["results"]}
+
+
+def ratio(before, after):
+    """after / before, or None if either side is missing."""
+    if not before or after is None:
+        return None
+    return after / before
+
+
+def main():
+    """Print p50 latency, throughput and peak memory ratios between two reports."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before", help="Baseline JSON report")
+    parser.add_argument("after", help="JSON report to compare against the baseline")
+    args = parser.parse_args()
+
+    before_meta, before = load_results(args.before)
+    after_meta, after = load_results(args.after)
+    print(f"before: {before_meta.get('revision')}  after: {after_meta.get('revision')}")
+    print(f"{'operation':<28} {'size':>9} {'p50 x':>8} {'ops/s x':>8} {'memory x':>9}")
+
+    for key in sorted(before.keys() & after.keys()):
+        old, new = before[key], after[key]
+        columns = [
+            ratio(old["latency_s"]["p50"], new["latency_s"]["p50"]),
+            ratio(old["throughput_per_s"], new["throughput_per_s"]),
+            ratio(old["peak_memory_bytes"], new["peak_memory_bytes"]),
+        ]
+        columns = [f"{value:.2f}" if value is not None else "-" for value in columns]
+        print(f"{key[0]:<28} {key[1]:>9} {columns[0]:>8} {columns[1]:>8} {columns[2]:>9}")
+
+
+if __name__ == "__main__":
+    main()
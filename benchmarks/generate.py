@@ -0,0 +1,71 @@
+"""Synthetic seed generation for the scaling benchmarks"""
+
+import json
+import random
+
+from seed import common
+
+# Fibonacci length descriptions, so every generated seed passes validation
+WORDS = ["blue", "haired", "woman", "in", "bar", "drinking", "a", "beer", "tall", "quiet", "old", "city", "river"]
+DESCRIPTION_LENGTHS = [1, 2, 3, 5, 8]
+
+
+def make_description(rng: random.Random):
+    """A random description with a Fibonacci word length."""
+    return " ".join(rng.choices(WORDS, k=rng.choice(DESCRIPTION_LENGTHS)))
+
+
+def generate_seed_dict(num_assets: int, num_descriptors: int, descriptors_per_asset=3, descriptions_per_descriptor=2, seed=0):
+    """Generate the dictionary form of a MainSeed with consistent links and levels.
+
+    Args:
+        num_assets (int): Number of assets.
+        num_descriptors (int): Number of descriptors, shared between assets at random.
+        descriptors_per_asset (int): Descriptors linked to each asset.
+        descriptions_per_descriptor (int): Descriptions on each descriptor.
+        seed (int): Random seed, the same arguments always generate the same world.
+
+    Returns:
+        dict: A dictionary that MainSeed.model_validate accepts.
+    """
+    rng = random.Random(seed)
+
+    descriptors = {}
+    for index in range(num_descriptors):
+        name = f"desc{index}"
+        descriptions = list(dict.fromkeys(make_description(rng) for _ in range(descriptions_per_descriptor)))
+        descriptors[name] = {
+            "name": name,
+            "next_fib": common.get_next_fibonacci(len(descriptions)),
+            "level_up": common.is_fibonacci(len(descriptions)),
+            "descriptions": descriptions,
+            "asset_links": [],
+        }
+
+    descriptor_names = list(descriptors)
+    assets = {}
+    for index in range(num_assets):
+        name = f"asset{index}"
+        linked = set(rng.sample(descriptor_names, k=min(descriptors_per_asset, num_descriptors)))
+        for descriptor_name in linked:
+            descriptors[descriptor_name]["asset_links"].append(name)
+        assets[name] = {
+            "name": name,
+            "next_fib": common.get_next_fibonacci(len(linked)),
+            "level_up": common.is_fibonacci(len(linked)),
+            "descriptors": sorted(linked),
+        }
+
+    return {
+        "global_descriptors": descriptors,
+        "global_desc_level_up": common.is_fibonacci(num_descriptors),
+        "global_desc_next_fib": common.get_next_fibonacci(num_descriptors),
+        "global_assets": assets,
+        "global_assets_level_up": common.is_fibonacci(num_assets),
+        "global_assets_next_fib": common.get_next_fibonacci(num_assets),
+    }
+
+
+def generate_seed_json(num_assets: int, num_descriptors: int, **kwargs):
+    """Generate the JSON form of a MainSeed, see generate_seed_dict."""
+    return json.dumps(generate_seed_dict(num_assets, num_descriptors, **kwargs))
@@ -0,0 +1,107 @@
+"""Timing, memory and reporting helpers shared by the scaling benchmarks"""
+
+import datetime
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from typing import Callable, Iterable, List, Optional
+
+
+def time_calls(func: Callable, calls: Iterable[tuple]):
+    """Call func once per argument tuple and return each call's latency in seconds."""
+    latencies = []
+    clock = time.perf_counter
+    for args in calls:
+        start = clock()
+        func(*args)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def peak_memory(func: Callable, *args):
+    """Run func(*args) under tracemalloc and return the peak traced bytes."""
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def percentile(sorted_values: List[float], q: float):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(operation: str, size: int, latencies: List[float], items_per_call=1, peak_bytes: Optional[int] = None):
+    """Build one machine-readable result entry.
+
+    Args:
+        operation (str): Name of the timed operation.
+        size (int): World size the operation ran against.
+        latencies (List[float]): Seconds per call.
+        items_per_call (int): Items processed per call, used for throughput.
+        peak_bytes (int): Peak traced memory of the operation, if measured.
+    """
+    ordered = sorted(latencies)
+    total = sum(ordered)
+    return {
+        "operation": operation,
+        "size": size,
+        "calls": len(ordered),
+        "total_s": total,
+        "throughput_per_s": (len(ordered) * items_per_call / total) if total else None,
+        "latency_s": {
+            "min": ordered[0] if ordered else None,
+            "p50": percentile(ordered, 50),
+            "p90": percentile(ordered, 90),
+            "p99": percentile(ordered, 99),
+            "max": ordered[-1] if ordered else None,
+        },
+        "peak_memory_bytes": peak_bytes,
+    }
+
+
+def git_revision():
+    """The current commit, so reports can be compared between commits."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def write_report(results: List[dict], path: str, **meta):
+    """Write the results and environment information as JSON."""
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            **meta,
+        },
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    return report
+
+
+def print_results(results: List[dict]):
+    """Human readable summary of the result entries."""
+    print(f"{'operation':<28} {'size':>9} {'calls':>7} {'ops/s':>12} {'p50 (s)':>10} {'p99 (s)':>10} {'peak MiB':>9}")
+    for entry in results:
+        peak = entry["peak_memory_bytes"]
+        peak = f"{peak / 2**20:.1f}" if peak is not None else "-"
+        throughput = entry["throughput_per_s"] or 0
+        latency = entry["latency_s"]
+        print(
+            f"{entry['operation']:<28} {entry['size']:>9} {entry['calls']:>7} {throughput:>12.1f} "
+            f"{latency['p50']:>10.3e} {latency['p99']:>10.3e} {peak:>9}"
+        )
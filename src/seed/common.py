@@ -1,19 +1,105 @@
 """This module is meant for helper functions"""
 
+import math
 import re
+import sys
+from bisect import bisect_left, bisect_right
+from typing import Iterable
+
+# Translation table mapping ASCII white space to b" " and everything else to b"x"
+_ASCII_WORD_TABLE = bytes(32 if chr(i).isspace() else 120 for i in range(256))
+_WORD_RE = re.compile(r"\S+")
+
+# Cached Fibonacci terms, F(0) through F(len - 1). The table is grown lazily by
+# value for next/prev lookups, and by index up to _FIB_TABLE_MAX_INDEX for
+# get_fibonacci. Anything past that index is served by fast-doubling instead.
+_FIB_TABLE = [0, 1]
+_FIB_TABLE_MAX_INDEX = 1024
+
+# Set view of the cached table for O(1) membership checks
+_FIB_SET = {0, 1}
+
+
+def _grow_fib_table_to_index(index: int):
+    """Extend the cached table until it holds F(index)."""
+    table = _FIB_TABLE
+    while len(table) <= index:
+        table.append(table[-1] + table[-2])
+        _FIB_SET.add(table[-1])
+
+
+def _grow_fib_table_past(value: int):
+    """Extend the cached table until its last term is greater than value."""
+    table = _FIB_TABLE
+    while table[-1] <= value:
+        table.append(table[-1] + table[-2])
+        _FIB_SET.add(table[-1])
+
+
+def _fast_doubling(n: int):
+    """Calculate (F(n), F(n+1)) in O(log n) using the fast-doubling identities
+    F(2k) = F(k) * (2F(k+1) - F(k)) and F(2k+1) = F(k)^2 + F(k+1)^2."""
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if bit == "1":
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a, b
+
+
+# Membership checks above this value use the integer square root test rather than
+# growing the cached table without bound.
+_FIB_TABLE_MAX_VALUE = _fast_doubling(_FIB_TABLE_MAX_INDEX)[0]
+
+
+def _is_perfect_square(n: int):
+    """Exact perfect square check using the integer square root."""
+    root = math.isqrt(n)
+    return root * root == n
+
+
+def normalize_name(name: str):
+    """Get the canonical key for an asset or descriptor name. Names are case insensitive, the
+    lowercased name is interned so every reference to it shares a single string object."""
+    return sys.intern(name.lower())
 
 
 def get_num_words(description: str):
-    """Get the number of words in a description. Words are separated by white space"""
+    """Get the number of words in a description. Words are separated by white space,
+    leading and trailing white space doesn't count as a word.
+
+    The token list is never built. ASCII descriptions are mapped in C to a word/space
+    byte pattern and the word starts are counted. Anything else falls back to counting
+    regex matches."""
+
+    if description.isascii():
+        pattern = description.encode("ascii").translate(_ASCII_WORD_TABLE)
+        return pattern.count(b" x") + (pattern[:1] == b"x")
+
+    return _WORD_RE.subn("", description)[1]
+
+
+def count_words_many(descriptions: Iterable[str]):
+    """Get the number of words for each description in a batch.
+
+    Args:
+        descriptions (Iterable[str]): The descriptions to count.
 
-    # Split by words
-    num_words = len(re.split(r"\s+", description))
-    return num_words
+    Returns:
+        List[int]: The word count of each description, in input order.
+    """
+    return list(map(get_num_words, descriptions))
 
 
 def get_fibonacci(n: int):
     """
-    Calculate the nth Fibonacci number using recursion.
+    Calculate the nth Fibonacci number.
+
+    Small positions are served from a lazily grown table, larger positions are
+    calculated with fast-doubling in O(log n).
 
     Args:
         n (int): The position of the Fibonacci number to calculate (0-indexed).
@@ -29,19 +115,23 @@ def get_fibonacci(n: int):
     if n < 0:
         raise ValueError("n must be a non-negative integer")
 
-    if n <= 1:
-        return n
+    if n < len(_FIB_TABLE):
+        return _FIB_TABLE[n]
+
+    if n <= _FIB_TABLE_MAX_INDEX:
+        _grow_fib_table_to_index(n)
+        return _FIB_TABLE[n]
 
-    # Recursive case: fib(n) = fib(n-1) + fib(n-2)
-    return get_fibonacci(n - 1) + get_fibonacci(n - 2)
+    return _fast_doubling(n)[0]
 
 
 def is_fibonacci(n: int):
     """
     Check if a given integer is a Fibonacci number.
 
-    This function uses the property that every Fibonacci number
-    (except 0) is of the form (5*m^2 + 4) or (5*n^2 - 4) for some integers m or n.
+    Values within the cached table are a set membership check. Anything larger uses
+    the property that n is a Fibonacci number if and only if (5*n^2 + 4) or
+    (5*n^2 - 4) is a perfect square, tested with exact integer math.
 
     Args:
         n (int): The number to check.
@@ -53,27 +143,41 @@ def is_fibonacci(n: int):
     if n < 0:
         return False
 
-    if n <= 1:
-        return True
+    if n <= _FIB_TABLE_MAX_VALUE:
+        if n >= _FIB_TABLE[-1]:
+            _grow_fib_table_past(n)
+        return n in _FIB_SET
 
-    # Calculate the discriminant
-    discriminant = 5 * n * n + 4
+    return _is_perfect_square(5 * n * n + 4) or _is_perfect_square(5 * n * n - 4)
 
-    # Check if discriminant is a perfect square
-    m = int(discriminant**0.5)
-    if m * m == discriminant:
-        return True
 
-    # Calculate the discriminant for the second form
-    discriminant = 5 * n * n - 4
+def is_fibonacci_many(values: Iterable[int]):
+    """
+    Check a batch of integers for Fibonacci membership.
+
+    The cached table is grown once for the largest value, after which every item is
+    a single set lookup.
+
+    Args:
+        values (Iterable[int]): The numbers to check.
 
-    # Check if this discriminant is a perfect square
-    m = int(discriminant**0.5)
-    if m * m == discriminant:
-        return True
+    Returns:
+        List[bool]: True for each value that is a Fibonacci number, in input order.
+    """
 
-    # If neither form results in a perfect square, n is not a Fibonacci number
-    return False
+    values = list(values)
+    if not values:
+        return []
+
+    largest = max(values)
+    if largest > _FIB_TABLE_MAX_VALUE:
+        return [is_fibonacci(n) for n in values]
+
+    if largest >= _FIB_TABLE[-1]:
+        _grow_fib_table_past(largest)
+
+    # Negative numbers are never in the set
+    return list(map(_FIB_SET.__contains__, values))
 
 
 def get_next_fibonacci(n: int):
@@ -88,38 +192,25 @@ def get_next_fibonacci(n: int):
     if n <= 0:
         return 1
 
-    if n == 1:
-        return 2
-
-    # Initialize the first two Fibonacci numbers
-    a, b = 0, 1
-
-    # Find the Fibonacci number closest to or just above n
-    while b < n:
-        a, b = b, a + b
-
-    # If b equals n, return the next Fibonacci number
-    if b == n:
-        return a + b
-    # If b is greater than n, b is the next Fibonacci number
-    return b
+    # The first term strictly greater than n, the duplicate 1 is skipped over
+    if n >= _FIB_TABLE[-1]:
+        _grow_fib_table_past(n)
+    return _FIB_TABLE[bisect_right(_FIB_TABLE, n)]
 
 
 def get_prev_fibonacci(n: int):
-    """Get the next number in the fibonacci sequence after n
+    """Get the previous number in the fibonacci sequence before n
     Args:
         n (int): The fibonacci number to start
 
     Returns:
-        n (int): The next number in the fibonacci sequence after n
+        n (int): The previous number in the fibonacci sequence before n
     """
     # Handle base cases
     if n <= 1:
         return 0
 
-    # Initialize the first two Fibonacci numbers
-    a, b = 0, 1
-    while b < n:
-        a, b = b, a + b
-
-    return a
+    # The last term strictly less than n
+    if n >= _FIB_TABLE[-1]:
+        _grow_fib_table_past(n)
+    return _FIB_TABLE[bisect_left(_FIB_TABLE, n) - 1]
@@ -21,3 +21,18 @@ class FailedDescriptionLength(SeedException):
 class LevelUpException(SeedException):
     """Occurs when hashtag number doesn't meet the minimum base requirement for an
     asset"""
+
+
+class SnapshotFormatError(SeedException):
+    """Occurs when a file is not a seed snapshot, or was written by an unsupported version"""
+
+
+class AggregatedValidationException(SeedValidationException):
+    """Occurs when several entities of a seed failed validation, errors holds a
+    (section, name, message) tuple for each of them"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        details = "; ".join(f"{section} {name!r}: {message}" for section, name, message in errors[:5])
+        more = f" (and {len(errors) - 5} more)" if len(errors) > 5 else ""
+        super().__init__(f"{len(errors)} entities failed validation: {details}{more}")
@@ -0,0 +1,312 @@
+"""Export a MainSeed as a sparse asset x descriptor incidence matrix, for NumPy or PyTorch.
+
+Row i of the matrix is the asset asset_names[i], and it has a 1 in column j for every descriptor
+descriptor_names[j] linked to it. The matrix is stored in CSR form, the same as
+scipy.sparse.csr_matrix and torch.sparse_csr_tensor take it: indices holds the sorted descriptor
+IDs of every row back to back, and row i is indices[indptr[i]:indptr[i + 1]]. All values are 1,
+so none are stored.
+
+The descriptions get the same layout per descriptor, with the word count of every description
+as a feature: description_word_counts[description_indptr[j]:description_indptr[j + 1]].
+
+IDs are stable, new assets and descriptors are appended to the vocabularies and nothing is ever
+renumbered, so an exported matrix can be updated in place as the seed changes:
+
+    matrix = IncidenceMatrix.from_main_seed(main_seed)
+    main_seed.add_description_to_asset("character1", "eyes", "blue")
+    matrix.update(main_seed)
+    matrix.save("world.npz")
+    matrix = IncidenceMatrix.load("world.npz")  # memory mapped
+
+Requires numpy, which is an optional dependency of this package."""
+
+import struct
+import zipfile
+from itertools import chain, repeat
+from typing import Dict, Iterable, List, Mapping, Optional
+
+try:
+    import numpy as np  # pylint: disable=import-error
+except ImportError as ex:  # pragma: no cover
+    raise ImportError("seed.incidence requires numpy, install it with: pip install seed[fast]") from ex
+
+from seed import common
+from seed.models.main_seed import MainSeed
+
+# The arrays saved to an .npz, besides the encoded vocabularies
+_ARRAYS = ("indptr", "indices", "description_indptr", "description_word_counts", "asset_versions", "descriptor_versions")
+
+# Zip local file header, up to the file name and extra field lengths
+_LOCAL_HEADER = struct.Struct("<4s22xHH")
+
+
+class IncidenceMatrix:
+    """The asset x descriptor incidence matrix of a MainSeed in CSR form, with its vocabularies.
+
+    Attributes:
+        asset_names (List[str]): Asset name by row ID.
+        descriptor_names (List[str]): Descriptor name by column ID.
+        indptr (np.ndarray): int64 row offsets into indices, one more than there are assets.
+        indices (np.ndarray): int32 descriptor IDs of every row, sorted within each row.
+        description_indptr (np.ndarray): int64 descriptor offsets into description_word_counts.
+        description_word_counts (np.ndarray): int32 word count of every description.
+        asset_versions (np.ndarray): int64 MainSeed.asset_version of every row when it was exported.
+        descriptor_versions (np.ndarray): int64 MainSeed.descriptor_version of every descriptor when
+            its descriptions were exported.
+        epoch (int): The MainSeed.epoch the versions belong to, 0 before the first export.
+    """
+
+    def __init__(self):
+        self.asset_names: List[str] = []
+        self.descriptor_names: List[str] = []
+        self.asset_ids: Dict[str, int] = {}
+        self.descriptor_ids: Dict[str, int] = {}
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.description_indptr = np.zeros(1, dtype=np.int64)
+        self.description_word_counts = np.zeros(0, dtype=np.int32)
+        self.asset_versions = np.zeros(0, dtype=np.int64)
+        self.descriptor_versions = np.zeros(0, dtype=np.int64)
+        self.epoch = 0
+
+    @classmethod
+    def from_main_seed(cls, main_seed: MainSeed):
+        """Export a whole seed. Asset descriptors that don't exist as descriptors are left out."""
+        matrix = cls()
+        matrix.update(main_seed)
+        return matrix
+
+    @property
+    def shape(self):
+        """(assets, descriptors)"""
+        return len(self.asset_names), len(self.descriptor_names)
+
+    @property
+    def nnz(self):
+        """The number of asset <-> descriptor links."""
+        return len(self.indices)
+
+    def row(self, asset_name: str):
+        """The descriptor IDs linked to an asset."""
+        asset_id = self.asset_ids[common.normalize_name(asset_name)]
+        return self.indices[self.indptr[asset_id] : self.indptr[asset_id + 1]]
+
+    def word_counts(self, descriptor_name: str):
+        """The word counts of the descriptions of a descriptor."""
+        desc_id = self.descriptor_ids[common.normalize_name(descriptor_name)]
+        return self.description_word_counts[self.description_indptr[desc_id] : self.description_indptr[desc_id + 1]]
+
+    def to_dense(self):
+        """The matrix as a dense uint8 array, only sensible for small seeds."""
+        dense = np.zeros(self.shape, dtype=np.uint8)
+        dense[np.repeat(np.arange(len(self.asset_names)), np.diff(self.indptr)), self.indices] = 1
+        return dense
+
+    def update(self, main_seed: MainSeed, asset_names: Optional[Iterable[str]] = None):
+        """Bring the matrix up to date with a seed. New assets and descriptors get the next free
+        IDs, and only the rows of changed assets and the descriptions of changed descriptors are
+        exported again. Versions are only comparable within one MainSeed.epoch, so the first
+        update from another seed object, ie: the same file loaded again, exports everything.
+
+        Args:
+            main_seed (MainSeed): The seed the matrix was exported from.
+            asset_names (Iterable[str]): The assets to export again. By default every asset whose
+                MainSeed.asset_version moved, and every new one. Descriptions are exported again
+                for every descriptor whose MainSeed.descriptor_version moved, and every new one.
+
+        Returns:
+            int: The number of rows exported.
+        """
+        first_new_descriptor = len(self.descriptor_names)
+        for name in main_seed.global_descriptors:
+            if name not in self.descriptor_ids:
+                self.descriptor_ids[name] = len(self.descriptor_names)
+                self.descriptor_names.append(name)
+
+        # Keys here are canonical already, so the versions are read without normalizing every name
+        asset_versions, descriptor_versions = main_seed.asset_versions, main_seed.descriptor_versions
+        if self.epoch != main_seed.epoch:
+            self.epoch = main_seed.epoch
+            asset_names = chain(self.asset_names, main_seed.global_assets)
+            desc_rows = np.arange(len(self.descriptor_names), dtype=np.int64)
+        else:
+            if asset_names is None:
+                asset_names = _stale(self.asset_names, self.asset_versions, asset_versions)
+                asset_names += [name for name in main_seed.global_assets if name not in self.asset_ids]
+            stale = _stale(self.descriptor_names[:first_new_descriptor], self.descriptor_versions, descriptor_versions)
+            desc_rows = np.fromiter(
+                chain(map(self.descriptor_ids.__getitem__, stale), range(first_new_descriptor, len(self.descriptor_names))),
+                dtype=np.int64,
+            )
+
+        asset_keys = list(dict.fromkeys(map(common.normalize_name, asset_names)))
+        num_rows = len(self.asset_names)
+        for name in asset_keys:
+            if name not in self.asset_ids:
+                self.asset_ids[name] = len(self.asset_names)
+                self.asset_names.append(name)
+
+        rows = np.fromiter(map(self.asset_ids.__getitem__, asset_keys), dtype=np.int64, count=len(asset_keys))
+        order = np.argsort(rows, kind="stable")
+        rows, asset_keys = rows[order], [asset_keys[i] for i in order.tolist()]
+
+        sub_indptr, sub_indices = self._link_rows(main_seed, asset_keys)
+        self.indptr, self.indices = _splice(self.indptr, self.indices, rows, sub_indptr, sub_indices, len(self.asset_names))
+        self.asset_versions = _with_versions(self.asset_versions, len(self.asset_names), rows, asset_keys, asset_versions)
+
+        desc_keys = [self.descriptor_names[i] for i in desc_rows.tolist()]
+        sub_indptr, sub_counts = self._description_rows(main_seed, desc_keys)
+        self.description_indptr, self.description_word_counts = _splice(
+            self.description_indptr,
+            self.description_word_counts,
+            desc_rows,
+            sub_indptr,
+            sub_counts,
+            len(self.descriptor_names),
+        )
+        self.descriptor_versions = _with_versions(
+            self.descriptor_versions, len(self.descriptor_names), desc_rows, desc_keys, descriptor_versions
+        )
+        return len(rows)
+
+    def _link_rows(self, main_seed: MainSeed, asset_keys: List[str]):
+        """The CSR rows of some assets, built in one vectorized pass over all their links."""
+        linked = [main_seed.global_assets[name].descriptors for name in asset_keys]
+        lengths = np.fromiter(map(len, linked), dtype=np.int64, count=len(linked))
+        ids = np.fromiter(
+            map(self.descriptor_ids.get, chain.from_iterable(linked), repeat(-1)), dtype=np.int64, count=int(lengths.sum())
+        )
+
+        row_of = np.repeat(np.arange(len(linked)), lengths)
+        known = ids >= 0
+        row_of, ids = row_of[known], ids[known]
+        order = np.lexsort((ids, row_of))
+        indptr = np.zeros(len(linked) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row_of, minlength=len(linked)), out=indptr[1:])
+        return indptr, ids[order].astype(np.int32)
+
+    @staticmethod
+    def _description_rows(main_seed: MainSeed, desc_keys: List[str]):
+        """The word counts of the descriptions of some descriptors, in CSR form."""
+        descriptions = [main_seed.global_descriptors[name].descriptions for name in desc_keys]
+        indptr = np.zeros(len(descriptions) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, descriptions), dtype=np.int64, count=len(descriptions)), out=indptr[1:])
+        counts = np.fromiter(
+            map(common.get_num_words, chain.from_iterable(descriptions)), dtype=np.int32, count=int(indptr[-1])
+        )
+        return indptr, counts
+
+    def save(self, path: str):
+        """Write an uncompressed .npz, which load can memory map array by array."""
+        arrays = {name: getattr(self, name) for name in _ARRAYS}
+        arrays["epoch"] = np.array([self.epoch], dtype=np.int64)
+        for kind in ("asset", "descriptor"):
+            arrays[f"{kind}_names"], arrays[f"{kind}_name_offsets"] = _encode_names(getattr(self, f"{kind}_names"))
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        """Read a matrix written by save.
+
+        Args:
+            path (str): The .npz file.
+            mmap (bool): Memory map the arrays read only instead of reading them, update still
+                works and replaces them with arrays in memory. The vocabularies are always read.
+
+        Raises:
+            ValueError: If mmap and an array in the file is compressed.
+        """
+        if mmap:
+            arrays = _memmap_npz(path)
+        else:
+            with np.load(path) as npz:
+                arrays = dict(npz)
+
+        matrix = cls()
+        for name in _ARRAYS:
+            setattr(matrix, name, arrays[name])
+        matrix.epoch = int(arrays["epoch"][0])
+        for kind in ("asset", "descriptor"):
+            names = _decode_names(arrays[f"{kind}_names"], arrays[f"{kind}_name_offsets"])
+            setattr(matrix, f"{kind}_names", names)
+            setattr(matrix, f"{kind}_ids", {name: i for i, name in enumerate(names)})
+        return matrix
+
+
+def _stale(names: List[str], exported, versions: Mapping[str, int]):
+    """The names whose version moved since they were exported."""
+    return [name for name, version in zip(names, exported.tolist()) if versions.get(name, 0) != version]
+
+
+def _with_versions(exported, num_rows: int, rows, keys: List[str], versions: Mapping[str, int]):
+    """The exported versions grown to num_rows, with the current version of every exported row."""
+    grown = np.zeros(num_rows, dtype=np.int64)
+    grown[: len(exported)] = exported
+    grown[rows] = [versions.get(name, 0) for name in keys]
+    return grown
+
+
+def _splice(indptr, values, rows, sub_indptr, sub_values, num_rows: int):
+    """Replace rows of a CSR array with new ones. rows must be sorted, and rows past the end are
+    appended, so every row from the current end up to num_rows has to be in them.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The new indptr and values.
+    """
+    old_rows = len(indptr) - 1
+    # Runs of consecutive rows are replaced with one slice each, ie: a whole export is one run
+    starts = np.flatnonzero(np.diff(rows, prepend=-2) != 1).tolist()
+    pieces, previous = [], 0
+    for start, end in zip(starts, starts[1:] + [len(rows)]):
+        first, last = int(rows[start]), int(rows[end - 1])
+        pieces.append(values[indptr[previous] : indptr[min(first, old_rows)]])
+        pieces.append(sub_values[sub_indptr[start] : sub_indptr[end]])
+        previous = min(last + 1, old_rows)
+    pieces.append(values[indptr[previous] : indptr[old_rows]])
+
+    lengths = np.zeros(num_rows, dtype=np.int64)
+    lengths[:old_rows] = np.diff(indptr)
+    lengths[rows] = np.diff(sub_indptr)
+    new_indptr = np.zeros(num_rows + 1, dtype=np.int64)
+    np.cumsum(lengths, out=new_indptr[1:])
+    return new_indptr, np.concatenate(pieces).astype(values.dtype, copy=False)
+
+
+def _encode_names(names: List[str]):
+    """A vocabulary as a UTF-8 byte array and the int64 offsets of each name in it."""
+    encoded = [name.encode() for name in names]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _decode_names(blob, offsets):
+    data = blob.tobytes()
+    bounds = offsets.tolist()
+    return [common.normalize_name(data[start:end].decode()) for start, end in zip(bounds, bounds[1:])]
+
+
+def _memmap_npz(path: str):
+    """Memory map every array of an uncompressed .npz, read only."""
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as fp:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{info.filename} in {path} is compressed and can't be memory mapped")
+            fp.seek(info.header_offset)
+            _, name_length, extra_length = _LOCAL_HEADER.unpack(fp.read(_LOCAL_HEADER.size))
+            fp.seek(info.header_offset + _LOCAL_HEADER.size + name_length + extra_length)
+
+            version = np.lib.format.read_magic(fp)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fp)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fp)
+
+            name = info.filename[: -len(".npy")]
+            if 0 in shape:
+                arrays[name] = np.zeros(shape, dtype=dtype)
+                continue
+            order = "F" if fortran_order else "C"
+            arrays[name] = np.memmap(fp, dtype=dtype, mode="r", offset=fp.tell(), shape=shape, order=order)
+    return arrays
@@ -1,12 +1,10 @@
-"""TODO: Abstract away the calculation aspect so others can modify
-the mechanism with how a particular asset is LeveledUp. The initial idea
-of this project was to use an organic growth model. Since fibonacci is
-the cornerstone of organic growth, it was natural, hehe, to use this as
-the base calculation. Another calculation could involve something like
-a mandelbrot set. Anything more advanced will need this type of abstraction.
-   - Abstract out calculation for the asset
-   - Abstract out calculation for a descriptor
-   - Rename all functions corresponding to the calculator
+"""The calculation of how a particular asset is LeveledUp is abstracted behind
+seed.sequences.LevelSequence. The initial idea of this project was to use an
+organic growth model. Since fibonacci is the cornerstone of organic growth, it
+was natural, hehe, to use this as the base calculation. Lucas numbers, powers of
+two or any user supplied generator can be swapped in per model class through the
+level_sequence class variable on StrictModel.
+   - TODO: Rename all functions corresponding to the calculator (next_fib, etc)
 
 KIS - Assets are related to assets only through descriptors. For instance,
       a brother relates to a sister through a shared sibling descriptor.
@@ -1,8 +1,9 @@
 """Contains a base Asset that is consumed by the MainSeed"""
 
-from typing import Set
+import sys
+from typing import Iterable, Optional, Set
 
-from pydantic import model_validator
+from pydantic import field_serializer, model_validator
 
 from seed import common, errors
 from seed.models.strict import StrictModel
@@ -26,37 +27,68 @@ class Asset(StrictModel):
     # weird...
     level_up: bool = False
 
+    @field_serializer("descriptors", when_used="json")
+    def _serialize_descriptors(self, descriptors):
+        """Sets have no order of their own, names are written sorted so a dump reloads to the same JSON."""
+        return sorted(descriptors)
+
     @model_validator(mode="after")
     def validate_and_sanitize(self):
         """Sanitize the descriptor next_fib and level_up."""
 
+        # Sanitize name and descriptors first, descriptors differing only by case collapse into one
+        # and levels are calculated on what remains.
+        # TODO: Can this be done at attribute level?
+        self.name = common.normalize_name(self.name)
+        self.descriptors = {common.normalize_name(i) for i in self.descriptors}
+
         # Sanitize next_fib if strict = False, fail if mismatch or invalid number
         try:
-            if self.next_fib != common.get_next_fibonacci(self.num_descriptors):
+            if self.next_fib != self.level_sequence.next_term(self.num_descriptors):
                 msg = f"Invalid next_fib: {self.next_fib} for {self.num_descriptors} descriptions"
                 raise errors.SeedValidationException(msg)
         except errors.SeedValidationException:
             if self.strict:
                 raise
-            self.next_fib = common.get_next_fibonacci(self.num_descriptors)
+            self.next_fib = self.level_sequence.next_term(self.num_descriptors)
 
         # Sanitize level_up if strict = False, fail if invalid
         try:
-            if self.level_up != (common.is_fibonacci(self.num_descriptors)):
+            if self.level_up != (self.level_sequence.contains(self.num_descriptors)):
                 msg = f"Invalid level_up: {self.level_up} for len(descriptions: {self.num_descriptors}"
                 raise errors.SeedValidationException(msg)
         except errors.SeedValidationException:
             if self.strict:
                 raise
-            self.level_up = common.is_fibonacci(self.num_descriptors)
-
-        # Sanitize name and descriptors
-        # TODO: Can this be done at attribute level?
-        self.name = self.name.lower()
-        self.descriptors = {i.lower() for i in self.descriptors}
+            self.level_up = self.level_sequence.contains(self.num_descriptors)
 
         return self
 
+    @classmethod
+    def construct_trusted(
+        cls,
+        name: str,
+        descriptors: Iterable[str] = (),
+        next_fib: Optional[int] = None,
+        level_up: Optional[bool] = None,
+        strict: bool = False,
+    ):
+        """Build an Asset without running the pydantic validators. Only for names MainSeed already
+        normalized, or files the application wrote itself. Levels are calculated if not given."""
+        descriptors = set(map(sys.intern, descriptors))
+        if next_fib is None or level_up is None:
+            next_fib = cls.level_sequence.next_term(len(descriptors))
+            level_up = cls.level_sequence.contains(len(descriptors))
+        return cls._construct_unchecked(
+            {
+                "strict": strict,
+                "name": sys.intern(name),
+                "next_fib": next_fib,
+                "descriptors": descriptors,
+                "level_up": level_up,
+            }
+        )
+
     @property
     def num_descriptors(self):
         """The number of active descriptors assocated with this asset."""
@@ -65,25 +97,35 @@ class Asset(StrictModel):
     # TODO: add/remove hashtags
     def add_descriptor(self, descriptor_name):
         """Add a descriptor to this asset.  When this occurs level up will always be False, unless the number of
-        descriptors matches that of a fibonacci number (1,2,3,5,8)."""
-        self.descriptors.add(descriptor_name.lower())
+        descriptors matches that of a fibonacci number (1,2,3,5,8).
+
+        The name must already be a canonical key, see common.normalize_name. MainSeed normalizes
+        names at its boundary."""
+        self.descriptors.add(descriptor_name)
         self.set_level()
 
     def remove_descriptor(self, descriptor_name):
         """Remove a descriptor from this asset. When this occurs level up will always be False, unless the number of
-        descriptors matches that of a fibonacci number (1,2,3,5,8,etc)."""
-        # self.level_up = False
-        self.descriptors.remove(descriptor_name.lower())
+        descriptors matches that of a fibonacci number (1,2,3,5,8,etc).
+
+        The name must already be a canonical key, see common.normalize_name."""
+        self.descriptors.remove(descriptor_name)
+        self.set_level()
+
+    def merge(self, other: "Asset"):
+        """Take over the descriptors of an asset with the same name, ie: one loaded under a key that
+        only matches once normalized, and relevel."""
+        self.descriptors |= other.descriptors
         self.set_level()
 
     def set_level(self):
-        """Re-establish the next_fib value. If the number of descriptors matches a fibonacci number, then
-        the next_fib is always the next literal fibonacci number."""
+        """Re-establish the next_fib value. If the number of descriptors matches a term of the level
+        sequence (fibonacci by default), then the next_fib is always the next literal term."""
         num_descriptors = len(self.descriptors)
 
-        # Level is basically the length of the descriptoers == a Fibonacci number
-        self.level_up = common.is_fibonacci(num_descriptors)
-        self.next_fib = common.get_next_fibonacci(num_descriptors)
+        # Level is basically the length of the descriptoers == a term in the level sequence
+        self.level_up = self.level_sequence.contains(num_descriptors)
+        self.next_fib = self.level_sequence.next_term(num_descriptors)
 
     # Only time this occurs is when a Fibonacci number in length occurs
     def is_uneven(self):
@@ -0,0 +1,55 @@
+"""Contains the reference counted pool that MainSeed shares description strings through"""
+
+from typing import Dict
+
+
+class DescriptionPool:
+    """One string object per distinct description, shared by every descriptor that holds it. A
+    handle is the pooled string itself, so descriptors keep working with plain strings, and the
+    pool only counts how many descriptors refer to each one. A description is dropped from the
+    pool when its last descriptor lets go of it.
+
+    Most descriptions are held by a single descriptor, so only the shared ones get a count. The
+    rest cost one entry in the handle index, which is what finds the shared string to begin with.
+    """
+
+    __slots__ = ("_handles", "_shared")
+
+    def __init__(self):
+        self._handles: Dict[str, str] = {}
+        # References beyond the first, only for descriptions held by more than one descriptor
+        self._shared: Dict[str, int] = {}
+
+    def __contains__(self, description):
+        return description in self._handles
+
+    def __len__(self):
+        return len(self._handles)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self)} descriptions)"
+
+    def acquire(self, description: str):
+        """Take a reference to a description and return its pooled handle."""
+        handle = self._handles.get(description)
+        if handle is None:
+            self._handles[description] = description
+            return description
+        self._shared[handle] = self._shared.get(handle, 0) + 1
+        return handle
+
+    def release(self, description: str):
+        """Drop a reference taken with acquire, removing the description once nothing refers to it."""
+        shared = self._shared.get(description)
+        if shared is None:
+            del self._handles[description]
+        elif shared > 1:
+            self._shared[description] = shared - 1
+        else:
+            del self._shared[description]
+
+    def refs(self, description: str):
+        """The number of descriptors holding a description, 0 if it isn't pooled."""
+        if description not in self._handles:
+            return 0
+        return 1 + self._shared.get(description, 0)
@@ -0,0 +1,126 @@
+"""Contains the insertion-ordered, hash-indexed store used for Descriptor descriptions"""
+
+import operator
+from itertools import islice
+from typing import Any, Dict, Iterable, Optional
+
+from pydantic_core import core_schema
+
+from seed.models.description_pool import DescriptionPool
+
+
+class DescriptionStore:
+    """An ordered set of descriptions. Membership checks, appends and removals are O(1)
+    dict operations, while iteration, equality and serialization keep insertion order and
+    behave like the list this replaces. Appending a description that already exists is a
+    no-op. Indexing and slicing work too, but positions aren't indexed, so they are O(n).
+
+    A store attached to a DescriptionPool holds the pooled handles instead of its own copies,
+    and keeps its references in the pool up to date as descriptions come and go.
+    """
+
+    __slots__ = ("_items", "_pool")
+
+    def __init__(self, descriptions: Iterable[str] = ()):
+        self._items: Dict[str, None] = dict.fromkeys(descriptions)
+        self._pool: Optional[DescriptionPool] = None
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler):
+        """Validate from a list of strings (or another store) and serialize back to a list."""
+        from_list = core_schema.no_info_after_validator_function(cls, core_schema.list_schema(core_schema.str_schema()))
+        return core_schema.json_or_python_schema(
+            json_schema=from_list,
+            python_schema=core_schema.union_schema([core_schema.is_instance_schema(cls), from_list]),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                list, return_schema=core_schema.list_schema(core_schema.str_schema())
+            ),
+        )
+
+    def __contains__(self, description):
+        return description in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __reversed__(self):
+        return reversed(self._items)
+
+    def __getitem__(self, index):
+        """Index or slice in insertion order, like a list. A slice returns a list."""
+        if isinstance(index, slice):
+            return list(self._items)[index]
+        index = operator.index(index)
+        # Walk from whichever end the index counts from
+        if index < 0:
+            descriptions, position = reversed(self._items), -index - 1
+        else:
+            descriptions, position = iter(self._items), index
+        try:
+            return next(islice(descriptions, position, None))
+        except StopIteration:
+            raise IndexError("description index out of range") from None
+
+    def __eq__(self, other):
+        if isinstance(other, DescriptionStore):
+            return list(self._items) == list(other._items)
+        if isinstance(other, list):
+            return list(self._items) == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self._items)!r})"
+
+    @property
+    def pool(self):
+        """The DescriptionPool this store is attached to, if any."""
+        return self._pool
+
+    def attach(self, pool: DescriptionPool):
+        """Share this store's descriptions through a pool, swapping each one for its pooled handle.
+        A store moves its references over if it was attached to another pool."""
+        if self._pool is pool:
+            return
+        self.detach()
+        self._items = dict.fromkeys(map(pool.acquire, self._items))
+        self._pool = pool
+
+    def detach(self):
+        """Release every reference held in the pool, the descriptions themselves are kept."""
+        if self._pool is not None:
+            for description in self._items:
+                self._pool.release(description)
+            self._pool = None
+
+    def append(self, description: str):
+        """Add a description to the end of the store. Returns False if it already existed."""
+        if description in self._items:
+            return False
+        if self._pool is not None:
+            description = self._pool.acquire(description)
+        self._items[description] = None
+        return True
+
+    def extend(self, descriptions: Iterable[str]):
+        """Append each description, skipping the ones that already exist."""
+        if self._pool is None:
+            self._items.update(dict.fromkeys(descriptions))
+            return
+        for description in descriptions:
+            self.append(description)
+
+    def remove(self, description: str):
+        """Remove a description.
+
+        Raises:
+            ValueError: If the description doesn't exist, the same as list.remove.
+        """
+        try:
+            del self._items[description]
+        except KeyError:
+            raise ValueError(f"{description!r} not in descriptions") from None
+        if self._pool is not None:
+            self._pool.release(description)
@@ -1,10 +1,12 @@
 """Contains a base Descriptor that is consumed by the MainSeed"""
 
-from typing import List, Set
+import sys
+from typing import Iterable, Optional, Set
 
-from pydantic import field_validator, model_validator, Field
+from pydantic import field_serializer, field_validator, model_validator, Field
 
 from seed import common, errors
+from seed.models.description_store import DescriptionStore
 from seed.models.strict import StrictModel
 
 
@@ -15,7 +17,8 @@ class Descriptor(StrictModel):
 
     name: str
     next_fib: int = 1
-    descriptions: List[str] = Field(default_factory=list)
+    # Ordered set of descriptions, serialized as a list
+    descriptions: DescriptionStore = Field(default_factory=DescriptionStore)
     # TODO: Should Level Up be something done at the descriptor level?
     level_up: bool = False
 
@@ -29,44 +32,79 @@ class Descriptor(StrictModel):
     @field_validator("descriptions")
     def validate_descriptions(cls, v):
         """Each description must be a Fibonacci number in length."""
-        for item in v:
-            if not common.is_fibonacci(common.get_num_words(item)):
-                raise errors.FailedDescriptionLength("Description length does not equal a Fibonacci number")
+        if not all(common.is_fibonacci_many(common.count_words_many(v))):
+            raise errors.FailedDescriptionLength("Description length does not equal a Fibonacci number")
         return v
 
     # pylint: enable=E0213
 
+    @field_serializer("asset_links", when_used="json")
+    def _serialize_asset_links(self, asset_links):
+        """Sets have no order of their own, names are written sorted so a dump reloads to the same JSON."""
+        return sorted(asset_links)
+
     @model_validator(mode="after")
     def validate_and_sanitize(self):
         """Sanitize the descriptor next_fib and level_up."""
 
+        # Sanitize name, links and descriptions first, descriptions differing only by case collapse
+        # into one and levels are calculated on what remains.
+        # TODO: Can this be done at attribute level?
+        self.name = common.normalize_name(self.name)
+        self.asset_links = {common.normalize_name(i) for i in self.asset_links}
+        # Descriptions are almost always lowercase already, only rebuild the store when one isn't
+        if not all(i == i.lower() for i in self.descriptions):
+            self.descriptions = DescriptionStore(i.lower() for i in self.descriptions)
+
         # Sanitize next_fib if strict = False, fail if mismatch or invalid number
         try:
-            if self.next_fib != common.get_next_fibonacci(self.num_descriptions):
+            if self.next_fib != self.level_sequence.next_term(self.num_descriptions):
                 msg = f"Invalid next_fib: {self.next_fib} for {self.num_descriptions} descriptions"
                 raise errors.SeedValidationException(msg)
         except errors.SeedValidationException:
             if self.strict:
                 raise
-            self.next_fib = common.get_next_fibonacci(self.num_descriptions)
+            self.next_fib = self.level_sequence.next_term(self.num_descriptions)
 
         # Sanitize level_up if strict = False, fail if invalid
         try:
-            if self.level_up != (common.is_fibonacci(self.num_descriptions)):
+            if self.level_up != (self.level_sequence.contains(self.num_descriptions)):
                 msg = f"Invalid level_up: {self.level_up} for len(descriptions: {self.num_descriptions}"
                 raise errors.SeedValidationException(msg)
         except errors.SeedValidationException:
             if self.strict:
                 raise
-            self.level_up = common.is_fibonacci(self.num_descriptions)
-
-        # Sanitize name and descriptors
-        # TODO: Can this be done at attribute level?
-        self.name = self.name.lower()
-        self.descriptions = [i.lower() for i in self.descriptions]
+            self.level_up = self.level_sequence.contains(self.num_descriptions)
 
         return self
 
+    @classmethod
+    def construct_trusted(
+        cls,
+        name: str,
+        next_fib: Optional[int] = None,
+        descriptions: Iterable[str] = (),
+        level_up: Optional[bool] = None,
+        asset_links: Iterable[str] = (),
+        strict: bool = False,
+    ):
+        """Build a Descriptor without running the pydantic validators. Only for names MainSeed already
+        normalized, or files the application wrote itself. Levels are calculated if not given."""
+        descriptions = DescriptionStore(descriptions)
+        if next_fib is None or level_up is None:
+            next_fib = cls.level_sequence.next_term(len(descriptions))
+            level_up = cls.level_sequence.contains(len(descriptions))
+        return cls._construct_unchecked(
+            {
+                "strict": strict,
+                "name": sys.intern(name),
+                "next_fib": next_fib,
+                "descriptions": descriptions,
+                "level_up": level_up,
+                "asset_links": set(map(sys.intern, asset_links)),
+            }
+        )
+
     @property
     def num_descriptions(self):
         """The number of descriptions in memory."""
@@ -90,22 +128,31 @@ class Descriptor(StrictModel):
             msg = "Required Fibonacci length for the description"
             raise errors.FailedDescriptionLength(msg)
 
-        self.descriptions.append(description.lower())  # pylint: disable=E1101
+        self.descriptions.append(description.lower())
         self.set_level()
 
     def remove_description(self, description):
         """Remove a description from the descriptor"""
-        self.descriptions.remove(description.lower())  # pylint: disable=E1101
+        self.descriptions.remove(description.lower())
+        self.set_level()
+
+    def merge(self, other: "Descriptor"):
+        """Take over the descriptions and asset links of a descriptor with the same name, ie: one
+        loaded under a key that only matches once normalized, and relevel. The other descriptor
+        lets go of its pooled descriptions."""
+        self.descriptions.extend(other.descriptions)
+        other.descriptions.detach()
+        self.asset_links |= other.asset_links
         self.set_level()
 
     def set_level(self):
-        """Re-establish the next_fib value. If the number of descriptors matches a fibonacci number, then
-        the next_fib is always the next literal fibonacci number."""
+        """Re-establish the next_fib value. If the number of descriptions matches a term of the level
+        sequence (fibonacci by default), then the next_fib is always the next literal term."""
         num_descriptions = len(self.descriptions)
 
-        # Level is basically the length of the descriptoers == a Fibonacci number
-        self.level_up = common.is_fibonacci(num_descriptions)
-        self.next_fib = common.get_next_fibonacci(num_descriptions)
+        # Level is basically the length of the descriptoers == a term in the level sequence
+        self.level_up = self.level_sequence.contains(num_descriptions)
+        self.next_fib = self.level_sequence.next_term(num_descriptions)
 
     def is_dangling(self):
         """Determines if this descriptor doesn't belong to an asset"""
@@ -116,12 +163,13 @@ class Descriptor(StrictModel):
         return len(self.asset_links) > 1
 
     def link_asset(self, asset_name):
-        """Link an asset to this descriptor"""
-        self.asset_links.add(asset_name.lower())
+        """Link an asset to this descriptor. The name must already be a canonical key, see
+        common.normalize_name. MainSeed normalizes names at its boundary."""
+        self.asset_links.add(asset_name)
 
     def remove_link(self, asset_name):
-        """Remove an asset link to this descriptor."""
-        self.asset_links = {i for _, i in enumerate(self.asset_links) if i.lower() != asset_name.lower()}
+        """Remove an asset link to this descriptor. The name must already be a canonical key."""
+        self.asset_links.discard(asset_name)
 
     def is_uneven(self):
         """Uneven is determined based on the number of descriptions matching a Fibonacci number."""
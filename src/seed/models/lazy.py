@@ -0,0 +1,77 @@
+"""Contains the lazily hydrated mapping used when loading a MainSeed with lazy=True, or from a
+binary snapshot"""
+
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator
+
+from seed.models.strict import StrictModel
+
+
+class LazyModels(MutableMapping):
+    """A name -> model mapping that keeps the raw entries of a loaded seed, and only turns an
+    entry into a model the first time it is accessed. Counting, membership and iterating over
+    names never hydrate anything, so a large world is usable right away.
+
+    Args:
+        raw_entries (Dict[str, Any]): Raw entries keyed by canonical name, ie: parsed JSON dicts
+            or snapshot record offsets. Anything that isn't a model yet counts as raw.
+        hydrate (Callable[[Any], StrictModel]): Builds a model from a raw entry, ie:
+            Asset.model_validate. Validation errors surface on first access.
+    """
+
+    __slots__ = ("_entries", "_hydrate")
+
+    def __init__(self, raw_entries: Dict[str, Any], hydrate: Callable[[Any], StrictModel]):
+        self._entries: Dict[str, Any] = raw_entries
+        self._hydrate = hydrate
+
+    def __getitem__(self, name: str):
+        entry = self._entries[name]
+        if not isinstance(entry, StrictModel):
+            # Replaced in place, so the original order is kept
+            entry = self._entries[name] = self._hydrate(entry)
+        return entry
+
+    def __setitem__(self, name: str, model: StrictModel):
+        self._entries[name] = model
+
+    def __delitem__(self, name: str):
+        del self._entries[name]
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.num_hydrated}/{len(self)} hydrated)"
+
+    @property
+    def num_hydrated(self):
+        """The number of entries that have been turned into models so far."""
+        return sum(1 for entry in self._entries.values() if isinstance(entry, StrictModel))
+
+    def is_hydrated(self, name: str):
+        """Check if an entry has already been turned into a model."""
+        return isinstance(self._entries[name], StrictModel)
+
+    def add_hydrate_hook(self, hook: Callable[[StrictModel], None]):
+        """Call hook(model) with every entry hydrated from now on, ie: to register it with its seed."""
+        hydrate = self._hydrate
+
+        def hydrate_and_hook(entry):
+            model = hydrate(entry)
+            hook(model)
+            return model
+
+        self._hydrate = hydrate_and_hook
+
+    def hydrate_all(self):
+        """Turn every remaining entry into a model and return them as a plain dict."""
+        for name in self._entries:
+            self.__getitem__(name)
+        return dict(self._entries)
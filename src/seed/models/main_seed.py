@@ -2,16 +2,140 @@
 assets and descriptors. These may included shared descriptors, which link the
 assets together."""
 
-from typing import Dict
+import secrets
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Iterator, KeysView, List, Optional, Set, Tuple, Union
 
-from pydantic import model_validator
+from pydantic import PrivateAttr, field_serializer, model_validator
+from pydantic_core import from_json
 
 from seed import common, errors
 from seed.models import Asset, Descriptor
+from seed.models.description_pool import DescriptionPool
+from seed.models.lazy import LazyModels
+from seed.models.memories import Memories
+from seed.models.similarity import SimilarityIndex, jaccard
 from seed.models.strict import StrictModel
+from seed.sequences import LevelSequence
 
 FIB_N_LEVEL = 1
 
+# Scopes reported to level listeners, see MainSeed.add_level_listener
+GLOBAL_ASSETS = "assets"
+GLOBAL_DESCRIPTORS = "descriptors"
+
+
+def validate_rows(indexed_rows: Iterable[Tuple[int, tuple]]):
+    """Sanitize (asset_name, descriptor_name, description) rows for a bulk insert. Names are
+    normalized, descriptions lowercased, and word counts are checked for the whole batch at once
+    the same as Descriptor.add_description.
+
+    Args:
+        indexed_rows (Iterable[Tuple[int, tuple]]): Each row with its index in the input.
+
+    Returns:
+        Tuple[list, list]: The valid (asset_key, descriptor_key, description) rows, and the
+            (index, error) of every invalid row, in input order.
+    """
+    normalized, failed = [], []
+    for index, row in indexed_rows:
+        try:
+            asset_name, descriptor_name, description = row
+            normalized.append(
+                (index, common.normalize_name(asset_name), common.normalize_name(descriptor_name), description.lower())
+            )
+        except (TypeError, ValueError, AttributeError) as exc:
+            failed.append((index, exc))
+
+    valid = []
+    num_words = common.count_words_many([description for _, _, _, description in normalized])
+    for (index, *row), count in zip(normalized, num_words):
+        if common.is_fibonacci(count):
+            valid.append(tuple(row))
+        else:
+            failed.append((index, errors.FailedDescriptionLength("Required Fibonacci length for the description")))
+
+    failed.sort(key=lambda i: i[0])
+    return valid, failed
+
+
+def key_by_name(models: Iterable[Union[Asset, Descriptor]], strict: bool = False):
+    """Key assets or descriptors by their canonical name. Models whose keys only matched once
+    normalized, ie: "Eyes" and "eyes", are merged into the first one, or fail if strict = True.
+
+    Raises:
+        errors.SeedValidationException: If strict and two models have the same name.
+    """
+    keyed = {}
+    for model in models:
+        first = keyed.setdefault(model.name, model)
+        if first is not model:
+            if strict:
+                raise errors.SeedValidationException(f"Duplicate {type(model).__name__} name: {model.name}")
+            first.merge(model)
+    return keyed
+
+
+def _group_raw_entries(raw_entries: Dict[str, dict], hydrate: Callable[[dict], Union[Asset, Descriptor]], strict: bool):
+    """Key the raw entries of a lazy load by canonical name. Entries whose keys only match once
+    normalized are kept together as a list, and hydrated and merged as one, see key_by_name.
+
+    Returns:
+        The entries and the hydrate function to build a LazyModels from.
+    """
+    grouped = {}
+    for name, entry in raw_entries.items():
+        key = common.normalize_name(name)
+        if key not in grouped:
+            grouped[key] = entry
+        elif isinstance(grouped[key], list):
+            grouped[key].append(entry)
+        else:
+            grouped[key] = [grouped[key], entry]
+
+    def hydrate_group(entry):
+        if isinstance(entry, list):
+            (model,) = key_by_name(map(hydrate, entry), strict).values()
+            return model
+        return hydrate(entry)
+
+    return grouped, hydrate_group
+
+
+# The next_fib and level_up fields of every global scope
+_GLOBAL_LEVEL_FIELDS = {
+    GLOBAL_ASSETS: ("global_assets_next_fib", "global_assets_level_up"),
+    GLOBAL_DESCRIPTORS: ("global_desc_next_fib", "global_desc_level_up"),
+}
+
+
+def advance_global_level(seed, scope: str, count: int, sequence: LevelSequence, listeners: List[Callable]):
+    """Level the global assets or descriptors of a seed after their count grew. The cached next_fib
+    is the threshold, so nothing is recalculated until the count actually reaches it. Every term
+    passed on the way is reported to the level listeners.
+
+    Args:
+        seed: A MainSeed or a storage backend with the same global level fields.
+        scope (str): GLOBAL_ASSETS or GLOBAL_DESCRIPTORS.
+        count (int): The new number of assets or descriptors.
+        sequence (LevelSequence): The level sequence of the seed.
+        listeners (List[Callable]): Called as listener(scope, count, next_fib), see
+            MainSeed.add_level_listener.
+    """
+    next_fib_field, level_up_field = _GLOBAL_LEVEL_FIELDS[scope]
+    next_fib = getattr(seed, next_fib_field)
+
+    level_up = False
+    while next_fib <= count:
+        reached = next_fib
+        next_fib = sequence.next_term(reached)
+        level_up = reached == count
+        for listener in list(listeners):
+            listener(scope, reached, next_fib)
+
+    setattr(seed, next_fib_field, next_fib)
+    setattr(seed, level_up_field, level_up)
+
 
 # This should be exportable into something consumable by an AI model / Pytorch
 class MainSeed(StrictModel):
@@ -28,45 +152,183 @@ class MainSeed(StrictModel):
     # Fix calculations if strict == False, else fail on invalid formatting
     strict: bool = False
 
+    # Called as listener(scope, count, next_fib) whenever a global count reaches a level term
+    _level_listeners: List[Callable[[str, int, int], None]] = PrivateAttr(default_factory=list)
+
+    # Every description string held by the descriptors, shared between them, see DescriptionPool
+    _description_pool: DescriptionPool = PrivateAttr(default_factory=DescriptionPool)
+
+    # Drawn for every seed object, versions are only comparable between the same epoch
+    _epoch: int = PrivateAttr(default_factory=lambda: secrets.randbits(63))
+    # Bumped whenever the descriptions an asset exports change, keyed by asset, 0 if never bumped
+    _asset_versions: Dict[str, int] = PrivateAttr(default_factory=dict)
+    # Bumped whenever the descriptions of a descriptor change, keyed by descriptor
+    _descriptor_versions: Dict[str, int] = PrivateAttr(default_factory=dict)
+    # (asset, unique) -> (version, descriptions) of the last export of an asset
+    _export_cache: Dict[Tuple[str, bool], Tuple[int, List[str]]] = PrivateAttr(default_factory=dict)
+
+    # Assets connected through shared descriptors, built on first use
+    _memories: Optional[Memories] = PrivateAttr(default=None)
+    # MinHash / LSH index of asset descriptors, built on first use
+    _similarity: Optional[SimilarityIndex] = PrivateAttr(default=None)
+
+    # Releases the file lazily loaded models are read from, ie: a memory mapped snapshot
+    _release: Optional[Callable[[], None]] = PrivateAttr(default=None)
+
+    def __eq__(self, other):
+        """Seeds are equal when their fields are. Private attributes are runtime state, ie: level
+        listeners, the description pool and the export cache, and are not compared."""
+        if not isinstance(other, MainSeed):
+            return NotImplemented
+        return type(self) is type(other) and self.__dict__ == other.__dict__
+
+    def model_post_init(self, context):
+        """Share the descriptions of every descriptor through the pool. Runs for model_construct as
+        well, so every loader is covered. Lazily loaded descriptors join as they are hydrated."""
+        pool = self._description_pool
+        descriptors = self.global_descriptors
+        if isinstance(descriptors, LazyModels):
+            descriptors.add_hydrate_hook(lambda desc: desc.descriptions.attach(pool))
+            names = [name for name in descriptors if descriptors.is_hydrated(name)]
+        else:
+            names = list(descriptors)
+        for name in names:
+            descriptors[name].descriptions.attach(pool)
+
     @model_validator(mode="after")
     def verify_and_sanitize(self):
         """Model Validation method, this will recalculate next_fib and level_up if they appear
         to be invalid.
         """
+        self._intern_keys()
+        self._sanitize_global_levels()
+        self._sync_asset_links()
+
+        return self
+
+    @field_serializer("global_descriptors", "global_assets", mode="wrap")
+    def _serialize_models(self, models, handler):
+        """Lazily loaded entries are hydrated before dumping, so the output is always the same."""
+        if isinstance(models, LazyModels):
+            models = models.hydrate_all()
+        return handler(models)
+
+    def _sanitize_global_levels(self):
+        """Recalculate the global next_fib and level_up if they appear to be invalid, or fail if
+        strict = True. Only the counts are needed, no model is touched."""
         # Sanitize next_fib if strict = False, fail if mismatch or invalid number
         try:
-            if self.global_desc_next_fib != common.get_next_fibonacci(self.num_descriptors):
+            if self.global_desc_next_fib != self.level_sequence.next_term(self.num_descriptors):
                 msg = f"Invalid global_desc_next_fib: {self.global_desc_next_fib} for {self.num_descriptors} descriptors"
                 raise errors.SeedValidationException(msg)
 
-            if self.global_assets_next_fib != common.get_next_fibonacci(self.num_assets):
+            if self.global_assets_next_fib != self.level_sequence.next_term(self.num_assets):
                 msg = f"Invalid global_assets_next_fib: {self.global_assets_next_fib} for {self.num_assets} assets"
                 raise errors.SeedValidationException(msg)
 
         except errors.SeedValidationException:
             if self.strict:
                 raise
-            self.global_desc_next_fib = common.get_next_fibonacci(self.num_descriptors)
-            self.global_assets_next_fib = common.get_next_fibonacci(self.num_assets)
+            self.global_desc_next_fib = self.level_sequence.next_term(self.num_descriptors)
+            self.global_assets_next_fib = self.level_sequence.next_term(self.num_assets)
 
         # Sanitize level_up if strict = False, fail if invalid
         try:
-            if self.global_desc_level_up != (common.is_fibonacci(self.num_descriptors)):
+            if self.global_desc_level_up != (self.level_sequence.contains(self.num_descriptors)):
                 msg = f"Invalid global_desc_level_up: {self.global_desc_level_up} for len(descriptors): {self.num_descriptors}"
                 raise errors.SeedValidationException(msg)
 
-            if self.global_assets_level_up != (common.is_fibonacci(self.num_assets)):
+            if self.global_assets_level_up != (self.level_sequence.contains(self.num_assets)):
                 msg = f"Invalid global_assets_level_up: {self.global_assets_level_up} for len(assets): {self.num_assets}"
                 raise errors.SeedValidationException(msg)
 
         except errors.SeedValidationException:
             if self.strict:
                 raise
-            self.global_desc_level_up = common.is_fibonacci(self.num_descriptors)
-            self.global_assets_level_up = common.is_fibonacci(self.num_assets)
+            self.global_desc_level_up = self.level_sequence.contains(self.num_descriptors)
+            self.global_assets_level_up = self.level_sequence.contains(self.num_assets)
+
+    def _intern_keys(self):
+        """Key the global dictionaries by each model's canonical name, so keys, names, descriptor
+        sets and asset_links all share one interned string per name. Runs before the global levels
+        are sanitized, since merging models with the same name changes the counts."""
+        self.global_descriptors = key_by_name(self.global_descriptors.values(), self.strict)
+        self.global_assets = key_by_name(self.global_assets.values(), self.strict)
+
+    def _sync_asset_links(self):
+        """Descriptor asset_links are the reverse index of Asset descriptors. Rebuild them from the
+        assets if they drifted apart, or fail if strict = True."""
+        links = {name: set() for name in self.global_descriptors}
+        for asset in self.global_assets.values():
+            for descriptor_name in asset.descriptors:
+                if descriptor_name in links:
+                    links[descriptor_name].add(asset.name)
+
+        for descriptor_name, descriptor in self.global_descriptors.items():
+            if descriptor.asset_links != links[descriptor_name]:
+                if self.strict:
+                    msg = f"Invalid asset_links: {descriptor.asset_links} for descriptor: {descriptor_name}"
+                    raise errors.SeedValidationException(msg)
+                descriptor.asset_links = links[descriptor_name]
+
+    @classmethod
+    def load(cls, data, trusted: bool = False, lazy: bool = False):
+        """Load a seed from JSON.
 
+        Args:
+            data (str | bytes): The JSON document, as written by model_dump_json.
+            trusted (bool): Skip validation and sanitation entirely. Only for files the application
+                wrote itself, levels, links and names are taken as they are.
+            lazy (bool): Keep the parsed asset and descriptor entries and only turn each one into a
+                model when it is first accessed, see LazyModels. Counts and the global levels are
+                available right away. Entry validation errors surface on first access, and
+                asset_links are not cross checked against the assets.
+        """
+        if not trusted and not lazy:
+            return cls.model_validate_json(data)
+
+        raw = from_json(data)
+        raw_descriptors = raw.pop("global_descriptors", {})
+        raw_assets = raw.pop("global_assets", {})
+
+        if lazy:
+            hydrate_descriptor, hydrate_asset = Descriptor.model_validate, Asset.model_validate
+            if trusted:
+                hydrate_descriptor = lambda i: Descriptor.construct_trusted(**i)
+                hydrate_asset = lambda i: Asset.construct_trusted(**i)
+
+            strict = raw.get("strict", False)
+            main_seed = cls.model_construct(
+                global_descriptors=LazyModels(*_group_raw_entries(raw_descriptors, hydrate_descriptor, strict)),
+                global_assets=LazyModels(*_group_raw_entries(raw_assets, hydrate_asset, strict)),
+                **raw,
+            )
+            if not trusted:
+                main_seed._sanitize_global_levels()
+            return main_seed
+
+        descriptors = (Descriptor.construct_trusted(**i) for i in raw_descriptors.values())
+        assets = (Asset.construct_trusted(**i) for i in raw_assets.values())
+        return cls.model_construct(
+            global_descriptors={desc.name: desc for desc in descriptors},
+            global_assets={asset.name: asset for asset in assets},
+            **raw,
+        )
+
+    def __enter__(self):
         return self
 
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the file that lazily loaded models are read from, ie: the memory map of
+        snapshot.load. Models that weren't accessed yet can't be read after, they raise
+        ValueError. Does nothing for a seed that isn't backed by a file."""
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
     @property
     def num_descriptors(self):
         """Retrieve the number of descriptors currently in memory"""
@@ -77,15 +339,62 @@ class MainSeed(StrictModel):
         """Retrieve the number of assets currently in memory"""
         return len(self.global_assets)
 
+    @property
+    def description_pool(self):
+        """The pool of distinct descriptions shared by the descriptors."""
+        return self._description_pool
+
+    def _pooled_descriptor(self, descriptor_key):
+        """The descriptor of a canonical key, with its descriptions shared through the pool."""
+        desc = self.global_descriptors[descriptor_key]
+        desc.descriptions.attach(self._description_pool)
+        return desc
+
     def link_descriptor(self, asset_name, descriptor_name):
         """Link a descriptor to an asset"""
-        self.global_assets[asset_name].add_descriptor(descriptor_name)
-        self.global_descriptors[descriptor_name].link_asset(asset_name)
+        self._link_descriptor(common.normalize_name(asset_name), common.normalize_name(descriptor_name))
+
+    def _link_descriptor(self, asset_key, descriptor_key):
+        """Link a descriptor to an asset using canonical keys."""
+        # Both are looked up first, so a missing key raises before anything changed
+        asset = self.global_assets[asset_key]
+        desc = self.global_descriptors[descriptor_key]
+        if descriptor_key not in asset.descriptors:
+            self._bump_asset_versions((asset_key,))
+        asset.add_descriptor(descriptor_key)
+        desc.link_asset(asset_key)
+        if self._memories is not None:
+            self._memories.link(asset_key, descriptor_key)
+        if self._similarity is not None:
+            self._similarity.add_descriptor(asset_key, descriptor_key)
+
+    def remove_descriptor(self, asset_name, descriptor_name):
+        """Unlink a descriptor from an asset, keeping the descriptor's asset_links in step"""
+        asset_key = common.normalize_name(asset_name)
+        descriptor_key = common.normalize_name(descriptor_name)
+        asset = self.global_assets[asset_key]
+        desc = self.global_descriptors[descriptor_key]
+        asset.remove_descriptor(descriptor_key)
+        desc.remove_link(asset_key)
+        self._bump_asset_versions((asset_key,))
+        if self._memories is not None:
+            # Unlinking may split the asset's memory, only that one is rebuilt on the next query
+            self._memories.unlink(asset_key, descriptor_key)
+        if self._similarity is not None:
+            self._similarity.set_descriptors(asset_key, self._linked_descriptors(asset_key))
 
     def add_description(self, descriptor_name, description):
         """Adds a description to a descriptor."""
+        self._add_description(common.normalize_name(descriptor_name), description)
+
+    def _add_description(self, descriptor_key, description):
+        """Adds a description to a descriptor using its canonical key."""
+        # Checked before the descriptor is created, a description of the wrong length changes nothing
+        if not common.is_fibonacci(common.get_num_words(description)):
+            raise errors.FailedDescriptionLength("Required Fibonacci length for the description")
+
         # Attempt adding the description
-        self._ensure_descriptor(descriptor_name=descriptor_name)
+        self._ensure_descriptor(descriptor_key)
 
         # Sanitize
         description = description.lower()
@@ -93,88 +402,366 @@ class MainSeed(StrictModel):
         # Make sure the description doesn't already exist
         # TODO: For anything more than 21 words, should there be a threshold? We don't
         # want multiple sentences that are the same. Does that even matter for AI Input? Likely not
-        desc = self.global_descriptors[descriptor_name]
+        # NOTE: descriptions is hash indexed, so this is O(1)
+        desc = self._pooled_descriptor(descriptor_key)
         if description not in desc.descriptions:
-            self.global_descriptors[descriptor_name].add_description(description)
+            desc.add_description(description)
+            self._bump_versions(self._descriptor_versions, (descriptor_key,))
+            self._bump_asset_versions(desc.asset_links)
         else:
             # TODO: Should be using a logger
-            print(f"Description: {description} has already been added to this descriptor: {descriptor_name}")
+            print(f"Description: {description} has already been added to this descriptor: {descriptor_key}")
+
+    def remove_description(self, descriptor_name, description):
+        """Removes a description from a descriptor."""
+        descriptor_key = common.normalize_name(descriptor_name)
+        desc = self._pooled_descriptor(descriptor_key)
+        desc.remove_description(description)
+        self._bump_versions(self._descriptor_versions, (descriptor_key,))
+        self._bump_asset_versions(desc.asset_links)
 
     def _ensure_asset(self, asset_name):
         """Helper method to make sure an asset name exists."""
-        if not self.global_assets.get(asset_name):
-            asset = Asset(name=asset_name)
+        # Built internally from a canonical key, so there is nothing to validate
+        if asset_name not in self.global_assets:
+            asset = Asset.construct_trusted(asset_name)
             self.global_assets[asset_name] = asset
-        self._set_global_asset_level()
+            if self._memories is not None:
+                self._memories.add_asset(asset_name)
+            self._advance_global_level(GLOBAL_ASSETS)
 
     def _ensure_descriptor(self, descriptor_name):
         """Helper method to make sure a desriptor name exists."""
-        if not self.global_descriptors.get(descriptor_name):
-            desc = Descriptor(name=descriptor_name)
+        if descriptor_name not in self.global_descriptors:
+            desc = Descriptor.construct_trusted(descriptor_name)
             self.global_descriptors[descriptor_name] = desc
-        self._set_global_descriptor_level()
+            self._advance_global_level(GLOBAL_DESCRIPTORS)
 
     def add_description_to_asset(self, asset_name, descriptor_name, description):
         """Adds a description to an asset."""
 
-        # Sanitize
-        asset_name = asset_name.lower()
-        descriptor_name = descriptor_name.lower()
+        # Sanitize, every helper below works on the canonical keys
+        asset_key = common.normalize_name(asset_name)
+        descriptor_key = common.normalize_name(descriptor_name)
 
-        # Create the asset and descriptor objects as necessary
-        self._ensure_descriptor(descriptor_name)
-        self._ensure_asset(asset_name)
+        # Add the description to the descriptor, created as necessary. The description is checked
+        # first, so nothing is created for one that fails.
+        self._add_description(descriptor_key, description)
 
-        # Add the description to the descriptor and link descriptor to the asset
+        # Create the asset as necessary and link the descriptor to it
         # NOTE: Asset descriptors is a set.
-        self.add_description(descriptor_name, description)
-        self.link_descriptor(asset_name, descriptor_name)
+        self._ensure_asset(asset_key)
+        self._link_descriptor(asset_key, descriptor_key)
+
+    def bulk_add_descriptions(self, rows: Iterable[Tuple[str, str, str]]):
+        """Add many (asset_name, descriptor_name, description) rows at once, the same as calling
+        add_description_to_asset for each. Rows are validated as a batch and grouped by descriptor
+        and asset, duplicates are dropped by the hash indexed stores, and every level, including
+        the globals, is calculated once at the end. Invalid rows are skipped, and unlike
+        add_description_to_asset nothing is created for them.
+
+        Returns:
+            List[Tuple[int, Exception]]: The index and error of every skipped row.
+        """
+        valid, failed = validate_rows(enumerate(rows))
+
+        # Group by descriptor and by asset, in order of first appearance
+        descriptions: Dict[str, List[str]] = {}
+        links: Dict[str, Dict[str, None]] = {}
+        for asset_key, descriptor_key, description in valid:
+            descriptions.setdefault(descriptor_key, []).append(description)
+            links.setdefault(asset_key, {})[descriptor_key] = None
+
+        num_descriptors, num_assets = self.num_descriptors, self.num_assets
+        # New models are built complete, so their level is only calculated once
+        for descriptor_key, new_descriptions in descriptions.items():
+            desc = self.global_descriptors.get(descriptor_key)
+            if desc is None:
+                desc = self.global_descriptors[descriptor_key] = Descriptor.construct_trusted(
+                    descriptor_key, descriptions=new_descriptions
+                )
+                desc.descriptions.attach(self._description_pool)
+            else:
+                desc.descriptions.attach(self._description_pool)
+                desc.descriptions.extend(new_descriptions)
+                desc.set_level()
+
+        for asset_key, descriptor_keys in links.items():
+            asset = self.global_assets.get(asset_key)
+            if asset is None:
+                self.global_assets[asset_key] = Asset.construct_trusted(asset_key, descriptors=descriptor_keys)
+            else:
+                asset.descriptors.update(descriptor_keys)
+                asset.set_level()
+            for descriptor_key in descriptor_keys:
+                self.global_descriptors[descriptor_key].asset_links.add(asset_key)
+            if self._memories is not None:
+                self._memories.add_asset(asset_key)
+                for descriptor_key in descriptor_keys:
+                    self._memories.link(asset_key, descriptor_key)
+            if self._similarity is not None:
+                for descriptor_key in descriptor_keys:
+                    self._similarity.add_descriptor(asset_key, descriptor_key)
+
+        # Links are complete now, so every asset exporting a changed descriptor is reached
+        self._bump_versions(self._descriptor_versions, descriptions)
+        self._bump_asset_versions(links)
+        for descriptor_key in descriptions:
+            self._bump_asset_versions(self.global_descriptors[descriptor_key].asset_links)
+
+        if self.num_descriptors != num_descriptors:
+            self._advance_global_level(GLOBAL_DESCRIPTORS)
+        if self.num_assets != num_assets:
+            self._advance_global_level(GLOBAL_ASSETS)
+        return failed
+
+    def add_level_listener(self, listener: Callable[[str, int, int], None]):
+        """Register a callback for global level ups. It is called as listener(scope, count, next_fib)
+        exactly when the number of assets (scope GLOBAL_ASSETS) or descriptors (scope
+        GLOBAL_DESCRIPTORS) reaches a term of the level sequence."""
+        self._level_listeners.append(listener)
+
+    def remove_level_listener(self, listener: Callable[[str, int, int], None]):
+        """Unregister a callback added with add_level_listener."""
+        self._level_listeners.remove(listener)
+
+    def _advance_global_level(self, scope: str):
+        """Level the global assets or descriptors after their count grew, see advance_global_level."""
+        count = len(self.global_assets if scope == GLOBAL_ASSETS else self.global_descriptors)
+        advance_global_level(self, scope, count, self.level_sequence, self._level_listeners)
 
     def _set_global_descriptor_level(self):
-        """Level the global descriptors by checking to see if the list is a Fibonacci number in length"""
+        """Level the global descriptors by checking to see if the list is a level sequence term in length"""
         # Calculate next fibs for descriptors
         num_descriptors = len(self.global_descriptors)
-        self.global_desc_next_fib = common.get_next_fibonacci(num_descriptors)
-        self.global_desc_level_up = common.is_fibonacci(num_descriptors)
+        self.global_desc_next_fib = self.level_sequence.next_term(num_descriptors)
+        self.global_desc_level_up = self.level_sequence.contains(num_descriptors)
 
     def _set_global_asset_level(self):
-        """Level the global assets by checking to see if the list is a Fibonacci number in length"""
+        """Level the global assets by checking to see if the list is a level sequence term in length"""
         # Calculate next fibs for descriptors
         num_assets = len(self.global_assets)
-        self.global_assets_next_fib = common.get_next_fibonacci(num_assets)
-        self.global_assets_level_up = common.is_fibonacci(num_assets)
+        self.global_assets_next_fib = self.level_sequence.next_term(num_assets)
+        self.global_assets_level_up = self.level_sequence.contains(num_assets)
+
+    def relevel_all(self):
+        """Recalculate level_up and next_fib for every asset, every descriptor and the globals.
+        Counts are gathered into arrays and leveled in one vectorized pass, which needs the
+        optional numpy dependency."""
+        # pylint: disable=import-outside-toplevel
+        import numpy as np  # pylint: disable=import-error
+
+        from seed import vectorized
+
+        # pylint: enable=import-outside-toplevel
+
+        for models, sequence, get_count in (
+            (list(self.global_assets.values()), Asset.level_sequence, lambda i: len(i.descriptors)),
+            (list(self.global_descriptors.values()), Descriptor.level_sequence, lambda i: len(i.descriptions)),
+        ):
+            counts = np.fromiter(map(get_count, models), dtype=np.int64, count=len(models))
+            level_ups = vectorized.level_contains(counts, sequence).tolist()
+            next_fibs = vectorized.level_next_term(counts, sequence).tolist()
+            for model, level_up, next_fib in zip(models, level_ups, next_fibs):
+                model.level_up = level_up
+                model.next_fib = next_fib
+
+        self._set_global_asset_level()
+        self._set_global_descriptor_level()
 
     def asset_relations(self, sibling_name: str):
-        """Determines if an asset relates to another asset via a shared descriptor.
+        """Determines if an asset relates to another asset via a shared descriptor. Descriptor
+        asset_links are the reverse index of asset descriptors, so this only visits the sibling's
+        own descriptors and their links.
         Args:
             sibling_asset: The asset looking for siblings
+
+        Returns:
+            Dict[str, Set[str]]: Every related asset name keyed by the shared descriptor name
         """
-        sibling_asset = self.global_assets.get(sibling_name)
+        sibling_asset = self.global_assets.get(common.normalize_name(sibling_name))
         if not sibling_asset:
             raise errors.AssetNotFound(f"Asset {sibling_name} doesn't exist.")
 
         relations = {}
-        for asset_name, asset_obj in self.global_assets.items():
-            # Skip the sibbling_asset that was passed in
-            if asset_name == sibling_asset.name:
+        for descriptor_name in sibling_asset.descriptors:
+            descriptor = self.global_descriptors.get(descriptor_name)
+            if descriptor is None or not descriptor.is_multi_asset_linked():
                 continue
 
-            # All descriptors for this asset, see if one of those is in the asset to find relations
-            for descriptor_name in asset_obj.descriptors:
-                if descriptor_name in sibling_asset.descriptors:
-                    relations[descriptor_name] = asset_obj.name
-                else:
-                    print(f"Descriptor name not found: {descriptor_name}")
+            # Skip the sibling_asset that was passed in
+            relations[descriptor_name] = descriptor.asset_links - {sibling_asset.name}
 
         return relations
 
-    def export_asset_descriptions(self, asset_name):
-        """Export all descriptions for a given asset in a single list."""
-        asset_obj = self.global_assets[asset_name]
+    @property
+    def epoch(self):
+        """A random token drawn for every seed object. Versions start over whenever a seed is
+        built or loaded, so they are only comparable between seeds of the same epoch."""
+        return self._epoch
+
+    @property
+    def asset_versions(self):
+        """Every asset_version that isn't 0, keyed by canonical asset name. Read only."""
+        return MappingProxyType(self._asset_versions)
 
-        all_descriptions = []
+    @property
+    def descriptor_versions(self):
+        """Every descriptor_version that isn't 0, keyed by canonical descriptor name. Read only."""
+        return MappingProxyType(self._descriptor_versions)
+
+    def asset_version(self, asset_name):
+        """A counter that changes whenever the descriptions an asset exports change, through
+        add_description, remove_description, link_descriptor, remove_descriptor or
+        bulk_add_descriptions. Editing the models directly bypasses it."""
+        return self._asset_versions.get(common.normalize_name(asset_name), 0)
+
+    def descriptor_version(self, descriptor_name):
+        """A counter that changes whenever the descriptions of a descriptor change, through
+        add_description, remove_description or bulk_add_descriptions."""
+        return self._descriptor_versions.get(common.normalize_name(descriptor_name), 0)
+
+    def _bump_asset_versions(self, asset_keys: Iterable[str]):
+        """Invalidate the cached exports of assets by bumping their versions."""
+        self._bump_versions(self._asset_versions, asset_keys)
+
+    @staticmethod
+    def _bump_versions(versions: Dict[str, int], keys: Iterable[str]):
+        for key in keys:
+            versions[key] = versions.get(key, 0) + 1
+
+    def iter_asset_descriptions(self, asset_name, unique: bool = False) -> Iterator[str]:
+        """Yield the descriptions of an asset one at a time, the same as export_asset_descriptions
+        but without building the list. The seed must not be edited while iterating.
+
+        Args:
+            asset_name (str): The asset to export.
+            unique (bool): Only yield the first of descriptions shared by several of the asset's
+                descriptors.
+        """
+        asset_key = common.normalize_name(asset_name)
+        asset_obj = self.global_assets[asset_key]
+
+        cached = self._export_cache.get((asset_key, unique))
+        if cached is not None and cached[0] == self._asset_versions.get(asset_key, 0):
+            yield from cached[1]
+            return
+
+        seen = set()
         for desc_name in asset_obj.descriptors:
-            desc = self.global_descriptors[desc_name]
-            all_descriptions.extend(desc.descriptions or [])
+            for description in self.global_descriptors[desc_name].descriptions:
+                if unique:
+                    if description in seen:
+                        continue
+                    seen.add(description)
+                yield description
+
+    def _get_memories(self):
+        """The memories of the seed, built on first use and refreshed after unlinking."""
+        if self._memories is None:
+            self.rebuild_memories()
+        else:
+            self._memories.refresh(self._linked_descriptors)
+        return self._memories
+
+    def _linked_descriptors(self, asset_key):
+        """The descriptors of an asset that exist as descriptors."""
+        descriptors = self.global_descriptors
+        return [name for name in self.global_assets[asset_key].descriptors if name in descriptors]
+
+    def rebuild_memories(self):
+        """Rebuild the memories from scratch. MainSeed keeps them current on its own, only edits
+        made to the models directly need it called."""
+        self._memories = Memories.build((asset_key, self._linked_descriptors(asset_key)) for asset_key in self.global_assets)
+
+    def rebuild_similarity_index(self, **kwargs):
+        """Rebuild the MinHash / LSH index of similar_assets from scratch, ie: after editing the
+        models directly. kwargs are passed to SimilarityIndex, ie: bands and rows."""
+        self._similarity = SimilarityIndex.build(
+            ((asset_key, self._linked_descriptors(asset_key)) for asset_key in self.global_assets), **kwargs
+        )
+
+    def similar_assets(self, asset_name, k: int = 10) -> List[Tuple[str, float]]:
+        """The k assets with the most similar descriptors, by Jaccard similarity. Candidates come
+        from the MinHash / LSH index, so assets that are only a little similar can be missed, and
+        are then ranked by their exact similarity. The index is built on the first call and kept
+        up to date by link_descriptor and remove_descriptor.
+
+        Returns:
+            List[Tuple[str, float]]: (asset name, similarity) pairs, most similar first, then by name.
+
+        Raises:
+            errors.AssetNotFound: If the asset doesn't exist.
+        """
+        asset_key = common.normalize_name(asset_name)
+        asset = self.global_assets.get(asset_key)
+        if asset is None:
+            raise errors.AssetNotFound(f"Asset {asset_name} doesn't exist.")
+        if self._similarity is None:
+            self.rebuild_similarity_index()
+
+        scored = []
+        for candidate in self._similarity.candidates(asset_key):
+            similarity = jaccard(asset.descriptors, self.global_assets[candidate].descriptors)
+            if similarity > 0:
+                scored.append((candidate, similarity))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:k]
+
+    def asset_memory(self, asset_name) -> KeysView[str]:
+        """The memory of an asset, every asset connected to it through shared descriptors, directly
+        or through other assets, itself included. Finding it takes near-constant time, the result
+        is a read-only set view that is only current until the seed is edited, copy it with set()
+        to keep it.
+
+        Raises:
+            errors.AssetNotFound: If the asset doesn't exist.
+        """
+        asset_key = common.normalize_name(asset_name)
+        memories = self._get_memories()
+        if asset_key not in memories:
+            raise errors.AssetNotFound(f"Asset {asset_name} doesn't exist.")
+        return memories.memory(asset_key)
 
-        return all_descriptions
+    def memory_size(self, asset_name):
+        """The number of assets in the memory of an asset, in near-constant time.
+
+        Raises:
+            errors.AssetNotFound: If the asset doesn't exist.
+        """
+        asset_key = common.normalize_name(asset_name)
+        memories = self._get_memories()
+        if asset_key not in memories:
+            raise errors.AssetNotFound(f"Asset {asset_name} doesn't exist.")
+        return memories.size(asset_key)
+
+    def memories(self) -> List[Set[str]]:
+        """Every memory of the seed, largest first. An asset without shared descriptors is a
+        memory of its own."""
+        return sorted((set(memory) for memory in self._get_memories()), key=len, reverse=True)
+
+    def memory_sizes(self) -> List[int]:
+        """The number of assets in every memory, largest first."""
+        return sorted(map(len, self._get_memories()), reverse=True)
+
+    def export_asset_descriptions(self, asset_name, unique: bool = False):
+        """Export all descriptions for a given asset in a single list. The export is cached per
+        asset until its asset_version changes, so re-exporting an unchanged asset only copies the
+        cached list.
+
+        Args:
+            asset_name (str): The asset to export.
+            unique (bool): Only keep the first of descriptions shared by several of the asset's
+                descriptors. Pooled descriptions are one string object each, so this is a single
+                pass of set lookups.
+        """
+        asset_key = common.normalize_name(asset_name)
+        version = self._asset_versions.get(asset_key, 0)
+        cached = self._export_cache.get((asset_key, unique))
+        if cached is None or cached[0] != version:
+            cached = self._export_cache[asset_key, unique] = (version, list(self.iter_asset_descriptions(asset_key, unique)))
+        return list(cached[1])
+
+    def clear_export_cache(self):
+        """Drop every cached export, ie: to free memory after a full export pass."""
+        self._export_cache.clear()
@@ -0,0 +1,133 @@
+"""Contains the union-find structure MainSeed keeps its memories in"""
+
+from typing import Callable, Dict, Iterable, Iterator, KeysView, List, Tuple
+
+
+class Memories:
+    """Connected components of assets, where two assets are connected if they share a descriptor.
+    Each component is a memory, the assets that fire together.
+
+    Only assets are nodes. The first asset linked to a descriptor becomes its anchor, and every
+    later asset linked to the descriptor is joined with the anchor. Joins are union by size with
+    path halving, so finding an asset's memory takes near-constant time. Unlinking can split a
+    memory, which union-find can't undo. unlink only marks the memory, and refresh takes apart
+    and joins again just the marked memories, so a run of unlinks costs a single rebuild of the
+    memories it touched. Once those hold most assets, everything is rebuilt instead.
+    """
+
+    __slots__ = ("_parent", "_members", "_anchors", "_stale")
+
+    def __init__(self):
+        self._parent: Dict[str, str] = {}
+        # The assets of every memory, keyed by its root asset. Dicts rather than sets, so memory
+        # can hand out a read-only keys view
+        self._members: Dict[str, Dict[str, None]] = {}
+        self._anchors: Dict[str, str] = {}
+        # The descriptors unlinked from every memory waiting for refresh, keyed by its root asset
+        self._stale: Dict[str, List[str]] = {}
+
+    @classmethod
+    def build(cls, links: Iterable[Tuple[str, Iterable[str]]]):
+        """Build the memories of (asset, descriptors) pairs."""
+        memories = cls()
+        for asset_name, descriptor_names in links:
+            memories.add_asset(asset_name)
+            for descriptor_name in descriptor_names:
+                memories.link(asset_name, descriptor_name)
+        return memories
+
+    def __len__(self):
+        return len(self._members)
+
+    def __iter__(self) -> Iterator[KeysView[str]]:
+        return (members.keys() for members in self._members.values())
+
+    def __contains__(self, asset_name):
+        return asset_name in self._parent
+
+    def add_asset(self, asset_name: str):
+        """Add an asset as a memory of its own, if it isn't in one yet."""
+        if asset_name not in self._parent:
+            self._parent[asset_name] = asset_name
+            self._members[asset_name] = {asset_name: None}
+
+    def link(self, asset_name: str, descriptor_name: str):
+        """Join the memory of an asset with every asset already linked to the descriptor."""
+        self.add_asset(asset_name)
+        anchor = self._anchors.setdefault(descriptor_name, asset_name)
+        if anchor != asset_name:
+            self._union(asset_name, anchor)
+
+    def unlink(self, asset_name: str, descriptor_name: str):
+        """Mark the memory of an asset for refresh after the asset was unlinked from a descriptor,
+        which may split it."""
+        self._stale.setdefault(self.find(asset_name), []).append(descriptor_name)
+
+    def refresh(self, links: Callable[[str], Iterable[str]]):
+        """Rebuild the memories marked by unlink, the others are untouched. Needed before querying
+        after an unlink.
+
+        Args:
+            links (Callable[[str], Iterable[str]]): The descriptors an asset is linked to now.
+        """
+        if sum(len(self._members[root]) for root in self._stale) * 2 > len(self._parent):
+            # Most assets are in stale memories, starting over is cheaper than taking them apart
+            assets = list(self._parent)
+            self._parent, self._members, self._anchors, self._stale = {}, {}, {}, {}
+            for asset_name in assets:
+                self.add_asset(asset_name)
+                for descriptor_name in links(asset_name):
+                    self.link(asset_name, descriptor_name)
+            return
+
+        while self._stale:
+            root, unlinked = self._stale.popitem()
+            members = self._members.pop(root)
+            linked = [(member, list(links(member))) for member in members]
+
+            # Every descriptor anchored in this memory only links assets of this memory
+            for name in unlinked:
+                self._anchors.pop(name, None)
+            for member, descriptor_names in linked:
+                self._parent[member] = member
+                self._members[member] = {member: None}
+                for name in descriptor_names:
+                    self._anchors.pop(name, None)
+            for member, descriptor_names in linked:
+                for name in descriptor_names:
+                    self.link(member, name)
+
+    def find(self, asset_name: str):
+        """The root asset of an asset's memory.
+
+        Raises:
+            KeyError: If the asset isn't in any memory.
+        """
+        parent = self._parent
+        while parent[asset_name] != asset_name:
+            # Path halving, every other asset on the way now points at its grandparent
+            parent[asset_name] = parent[parent[asset_name]]
+            asset_name = parent[asset_name]
+        return asset_name
+
+    def _union(self, first: str, second: str):
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return
+        if len(self._members[first]) < len(self._members[second]):
+            first, second = second, first
+        self._parent[second] = first
+        self._members[first] |= self._members.pop(second)
+        # A memory joined with a stale one has to be refreshed as a whole
+        unlinked = self._stale.pop(second, None)
+        if unlinked is not None:
+            self._stale.setdefault(first, []).extend(unlinked)
+
+    def memory(self, asset_name: str):
+        """A read-only view of the assets in the same memory as asset_name. It is only current
+        until the memories change, copy it to keep it."""
+        return self._members[self.find(asset_name)].keys()
+
+    def size(self, asset_name: str):
+        """The number of assets in the same memory as asset_name."""
+        return len(self.memory(asset_name))
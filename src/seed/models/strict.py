@@ -1,10 +1,32 @@
 """Contains the Strict BaseModel used for validating and sanitizing."""
 
+from typing import ClassVar
+
 from pydantic import BaseModel
 
+from seed.sequences import FIBONACCI, LevelSequence
+
 
 class StrictModel(BaseModel):
     """Provides a single variable to fascilitate validation and sanitation."""
 
     strict: bool = False
     # TODO: Move similar validations in here?
+
+    # The sequence used to calculate level_up and next_fib. Override per model class
+    # to level up on something other than Fibonacci, ie: Asset.level_sequence = LucasSequence()
+    level_sequence: ClassVar[LevelSequence] = FIBONACCI
+
+    @classmethod
+    def _construct_unchecked(cls, values: dict):
+        """A leaner model_construct for trusted data. values must hold every field, in field
+        order and already of the right type, nothing is validated or defaulted."""
+        if cls.__private_attributes__:
+            return cls.model_construct(**values)
+
+        model = cls.__new__(cls)
+        object.__setattr__(model, "__dict__", values)
+        object.__setattr__(model, "__pydantic_fields_set__", set(values))
+        object.__setattr__(model, "__pydantic_extra__", None)
+        object.__setattr__(model, "__pydantic_private__", None)
+        return model
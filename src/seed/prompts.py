@@ -0,0 +1,124 @@
+"""Token budgeted prompts built from a MainSeed.
+
+A prompt describes one asset, followed by the assets related to it through shared descriptors,
+most shared first, for as long as they fit the token budget. Every asset is serialized as one
+line, its fragment:
+
+    character1: blue hair; tall
+    setting1: green
+
+Tokens are estimated locally at CHARS_PER_TOKEN characters per token, which is close enough for
+English text to pack a budget without a tokenizer. Fragments are cached per asset and rebuilt
+only when MainSeed.asset_version changes, so a batch of prompts over the same world serializes
+every asset once.
+
+    builder = PromptBuilder(main_seed, budget=256)
+    prompts = builder.build_many(main_seed.global_assets)
+"""
+
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from seed import common
+from seed.models.main_seed import MainSeed
+
+CHARS_PER_TOKEN = 4
+DEFAULT_BUDGET = 512
+
+FRAGMENT_SEPARATOR = "; "
+LINE_SEPARATOR = "\n"
+
+
+def estimate_tokens(text: str):
+    """A cheap local estimate of the tokens in text, one per CHARS_PER_TOKEN characters."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+class PromptBuilder:
+    """Packs asset fragments into prompts of at most budget estimated tokens.
+
+    Args:
+        main_seed (MainSeed): The world prompts are built from. Edits made through MainSeed are
+            picked up by the next prompt.
+        budget (int): Estimated tokens per prompt, line separators included.
+        estimate (Callable[[str], int]): The token estimator, estimate_tokens by default.
+    """
+
+    def __init__(
+        self,
+        main_seed: MainSeed,
+        budget: int = DEFAULT_BUDGET,
+        estimate: Callable[[str], int] = estimate_tokens,
+    ):
+        if budget < 1:
+            raise ValueError(f"Invalid budget: {budget}, it must be at least 1 token")
+        self.main_seed = main_seed
+        self.budget = budget
+        self.estimate = estimate
+        # asset -> (asset_version, fragment, estimated tokens of fragment and its line separator)
+        self._fragments: Dict[str, Tuple[int, str, int]] = {}
+
+    def fragment(self, asset_name: str):
+        """The serialized line of an asset and its estimated tokens, from the cache if the asset
+        hasn't changed since.
+
+        Returns:
+            Tuple[str, int]: The fragment, and the tokens it takes up in a prompt.
+        """
+        asset_key = common.normalize_name(asset_name)
+        version = self.main_seed.asset_version(asset_key)
+        cached = self._fragments.get(asset_key)
+        if cached is None or cached[0] != version:
+            descriptions = self.main_seed.export_asset_descriptions(asset_key, unique=True)
+            text = f"{asset_key}: {FRAGMENT_SEPARATOR.join(descriptions)}" if descriptions else asset_key
+            cached = self._fragments[asset_key] = (version, text, self.estimate(text + LINE_SEPARATOR))
+        return cached[1], cached[2]
+
+    def related_assets(self, asset_name: str):
+        """Assets sharing a descriptor with asset_name, the most shared descriptors first, then by name."""
+        shared: Dict[str, int] = {}
+        for linked in self.main_seed.asset_relations(asset_name).values():
+            for related in linked:
+                shared[related] = shared.get(related, 0) + 1
+        return sorted(shared, key=lambda name: (-shared[name], name))
+
+    def build(self, asset_name: str):
+        """Build the prompt of one asset. The asset's own fragment always comes first, cut down to
+        its name and the descriptions that fit if it is over budget on its own. Related fragments
+        that don't fit are skipped, and smaller ones after them may still be packed.
+
+        Raises:
+            errors.AssetNotFound: If the asset doesn't exist.
+        """
+        related = self.related_assets(asset_name)
+        text, tokens = self.fragment(asset_name)
+        if tokens > self.budget:
+            return self._truncate(asset_name)
+
+        lines = [text]
+        remaining = self.budget - tokens
+        for related_name in related:
+            text, tokens = self.fragment(related_name)
+            if tokens <= remaining:
+                lines.append(text)
+                remaining -= tokens
+        return LINE_SEPARATOR.join(lines)
+
+    def build_many(self, asset_names: Iterable[str]) -> List[str]:
+        """Build the prompts of many assets in one pass, in order. Fragments shared between the
+        prompts are serialized once."""
+        return [self.build(asset_name) for asset_name in asset_names]
+
+    def _truncate(self, asset_name: str):
+        """The name of an asset and as many of its descriptions as fit the budget, in order."""
+        asset_key = common.normalize_name(asset_name)
+        text, separator = asset_key, ": "
+        for description in self.main_seed.export_asset_descriptions(asset_key, unique=True):
+            candidate = f"{text}{separator}{description}"
+            if self.estimate(candidate + LINE_SEPARATOR) > self.budget:
+                break
+            text, separator = candidate, FRAGMENT_SEPARATOR
+        return text
+
+    def clear_cache(self):
+        """Drop every cached fragment."""
+        self._fragments.clear()
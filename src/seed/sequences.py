@@ -0,0 +1,142 @@
+"""Level up sequences. A sequence decides at which counts an asset, descriptor or the
+global seed levels up, and what the next threshold is. Fibonacci is the default, any
+non-decreasing integer generator can be plugged in instead."""
+
+from bisect import bisect_left, bisect_right
+from itertools import count
+from typing import Iterable, Iterator, List
+
+from seed import common
+
+
+class LevelSequence:
+    """A level up strategy backed by a sorted, lazily extended table of terms.
+
+    Terms are pulled from the generator only as far as a lookup needs them, so
+    membership and next/prev thresholds are O(log n) bisect lookups into the table.
+
+    Args:
+        terms (Iterable[int]): Non-decreasing integers, consecutive duplicates are
+            collapsed. May be infinite.
+        name (str): Human readable name of the sequence.
+    """
+
+    name = "custom"
+
+    def __init__(self, terms: Iterable[int], name: str = ""):
+        self._iterator: Iterator[int] = iter(terms)
+        self._terms: List[int] = []
+        self._exhausted = False
+        if name:
+            self.name = name
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(name={self.name!r})"
+
+    def _grow_past(self, value: int):
+        """Pull terms from the generator until the last term is greater than value."""
+        terms = self._terms
+        while not self._exhausted and (not terms or terms[-1] <= value):
+            try:
+                term = next(self._iterator)
+            except StopIteration:
+                self._exhausted = True
+                break
+
+            if terms and term <= terms[-1]:
+                if term == terms[-1]:
+                    continue
+                raise ValueError(f"{self.name} sequence terms must be non-decreasing, got {term} after {terms[-1]}")
+            terms.append(term)
+
+    def contains(self, n: int):
+        """Check if n is a term of the sequence, meaning a count of n levels up."""
+        if not self._terms or n >= self._terms[-1]:
+            self._grow_past(n)
+        index = bisect_left(self._terms, n)
+        return index < len(self._terms) and self._terms[index] == n
+
+    def __contains__(self, n: int):
+        return self.contains(n)
+
+    def next_term(self, n: int):
+        """Get the first term strictly greater than n, the next level up threshold.
+
+        Raises:
+            ValueError: If the sequence is finite and has no term greater than n.
+        """
+        n = max(n, 0)
+        if not self._terms or n >= self._terms[-1]:
+            self._grow_past(n)
+        index = bisect_right(self._terms, n)
+        if index == len(self._terms):
+            raise ValueError(f"{self.name} sequence has no term greater than {n}")
+        return self._terms[index]
+
+    def prev_term(self, n: int):
+        """Get the last term strictly less than n, or 0 if there isn't one."""
+        if not self._terms or n > self._terms[-1]:
+            self._grow_past(n)
+        index = bisect_left(self._terms, n)
+        if index == 0:
+            return 0
+        return self._terms[index - 1]
+
+    def terms_through(self, value: int):
+        """All terms less than or equal to value, plus the first term past it."""
+        self._grow_past(value)
+        return list(self._terms[: bisect_right(self._terms, value) + 1])
+
+
+def _fibonacci_terms():
+    """0, 1, 1, 2, 3, 5, 8, ... served from the cached table in seed.common."""
+    for n in count():
+        yield common.get_fibonacci(n)
+
+
+def _lucas_terms():
+    """The Lucas numbers 2, 1, 3, 4, 7, 11, ... in sorted order."""
+    yield 1
+    yield 2
+    a, b = 2, 1
+    while True:
+        a, b = b, a + b
+        yield b
+
+
+def _powers_of_two_terms():
+    """1, 2, 4, 8, 16, ..."""
+    term = 1
+    while True:
+        yield term
+        term <<= 1
+
+
+class FibonacciSequence(LevelSequence):
+    """Level up on Fibonacci counts, the organic growth model this project started with."""
+
+    name = "fibonacci"
+
+    def __init__(self):
+        super().__init__(_fibonacci_terms())
+
+
+class LucasSequence(LevelSequence):
+    """Level up on Lucas numbers, Fibonacci's sibling sequence starting from 2, 1."""
+
+    name = "lucas"
+
+    def __init__(self):
+        super().__init__(_lucas_terms())
+
+
+class PowersOfTwoSequence(LevelSequence):
+    """Level up every time the count doubles."""
+
+    name = "powers_of_two"
+
+    def __init__(self):
+        super().__init__(_powers_of_two_terms())
+
+
+FIBONACCI = FibonacciSequence()
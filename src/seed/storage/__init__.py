@@ -0,0 +1 @@
+"""Persistence formats for a MainSeed that don't need the whole document in memory at once"""
@@ -0,0 +1,353 @@
+"""Struct-of-arrays in-memory backend for MainSeed.
+
+Every Asset and Descriptor of a MainSeed is a pydantic object with its own __dict__, a set of
+name strings and a strict flag, which costs far more than the data it holds. ColumnarSeed gives
+assets and descriptors integer IDs instead. Names are kept once per kind in a name table, and
+they are interned, so an asset and a descriptor with the same name share one string. Counts,
+level flags and next_fib values live in array columns indexed by ID, and links are integer
+adjacency arrays.
+
+Descriptions are hash indexed per descriptor, so adding one is O(1) like MainSeed. Links are kept
+as plain arrays to save memory instead: linking scans the asset's links, O(descriptors of the
+asset), and unlinking also scans the descriptor's, O(assets of the descriptor). Batches go through
+bulk_add_descriptions, which indexes the links it touches once per batch.
+
+The public MainSeed methods behave the same, and whole models can still be read with
+get_asset / get_descriptor or to_main_seed.
+"""
+
+import logging
+from array import array
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+from seed import common, errors
+from seed.models import Asset, Descriptor
+from seed.models.main_seed import GLOBAL_ASSETS, GLOBAL_DESCRIPTORS, MainSeed, advance_global_level, validate_rows
+from seed.sequences import LevelSequence
+
+logger = logging.getLogger(__name__)
+
+
+class _Table:
+    """The IDs, names and columns of one kind of entity. An entity's ID is its row."""
+
+    __slots__ = ("names", "ids", "links", "counts", "level_up", "next_fib", "sequence")
+
+    def __init__(self, sequence: LevelSequence):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        # Asset rows link descriptor IDs, descriptor rows link asset IDs
+        self.links: List[array] = []
+        # Descriptors per asset, descriptions per descriptor
+        self.counts = array("I")
+        self.level_up = array("b")
+        self.next_fib = array("q")
+        self.sequence = sequence
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name: str):
+        """Add a row for a canonical name and return its ID."""
+        entity_id = len(self.names)
+        self.names.append(name)
+        self.ids[name] = entity_id
+        self.links.append(array("I"))
+        self.counts.append(0)
+        self.level_up.append(self.sequence.contains(0))
+        self.next_fib.append(self.sequence.next_term(0))
+        return entity_id
+
+    def set_count(self, entity_id: int, count: int):
+        """Store a new count and level the row."""
+        self.counts[entity_id] = count
+        self.level_up[entity_id] = self.sequence.contains(count)
+        self.next_fib[entity_id] = self.sequence.next_term(count)
+
+
+class ColumnarSeed:
+    """A MainSeed kept as integer IDs, name tables and array columns."""
+
+    def __init__(self):
+        self._assets = _Table(Asset.level_sequence)
+        self._descriptors = _Table(Descriptor.level_sequence)
+        # Descriptions by descriptor ID, insertion ordered dicts as a hash indexed list
+        self._descriptions: List[Dict[str, None]] = []
+        self._level_listeners: List[Callable[[str, int, int], None]] = []
+
+        self.global_desc_level_up = MainSeed.level_sequence.contains(0)
+        self.global_desc_next_fib = MainSeed.level_sequence.next_term(0)
+        self.global_assets_level_up = MainSeed.level_sequence.contains(0)
+        self.global_assets_next_fib = MainSeed.level_sequence.next_term(0)
+
+    @classmethod
+    def from_main_seed(cls, main_seed: MainSeed):
+        """Copy an in-memory seed. Asset descriptors that don't exist as descriptors are not linked."""
+        seed = cls()
+        assets, descriptors = seed._assets, seed._descriptors
+        for desc in main_seed.global_descriptors.values():
+            desc_id = descriptors.add(desc.name)
+            seed._descriptions.append(dict.fromkeys(desc.descriptions))
+            descriptors.set_count(desc_id, len(desc.descriptions))
+
+        for asset in main_seed.global_assets.values():
+            asset_id = assets.add(asset.name)
+            for descriptor_name in asset.descriptors:
+                desc_id = descriptors.ids.get(descriptor_name)
+                if desc_id is not None:
+                    assets.links[asset_id].append(desc_id)
+                    descriptors.links[desc_id].append(asset_id)
+            assets.set_count(asset_id, len(assets.links[asset_id]))
+
+        seed._set_global_levels()
+        return seed
+
+    def to_main_seed(self):
+        """Build a MainSeed of full models, in ID order."""
+        main_seed = MainSeed.model_construct(
+            global_descriptors={name: self._descriptor_model(i) for i, name in enumerate(self._descriptors.names)},
+            global_assets={name: self._asset_model(i) for i, name in enumerate(self._assets.names)},
+        )
+        main_seed._set_global_descriptor_level()  # pylint: disable=protected-access
+        main_seed._set_global_asset_level()  # pylint: disable=protected-access
+        return main_seed
+
+    @property
+    def num_descriptors(self):
+        """Retrieve the number of descriptors currently in memory"""
+        return len(self._descriptors)
+
+    @property
+    def num_assets(self):
+        """Retrieve the number of assets currently in memory"""
+        return len(self._assets)
+
+    def get_asset(self, asset_name):
+        """Build the Asset model of a name.
+
+        Raises:
+            KeyError: If the asset doesn't exist, the same as MainSeed.global_assets.
+        """
+        return self._asset_model(self._assets.ids[common.normalize_name(asset_name)])
+
+    def get_descriptor(self, descriptor_name):
+        """Build the Descriptor model of a name.
+
+        Raises:
+            KeyError: If the descriptor doesn't exist, the same as MainSeed.global_descriptors.
+        """
+        return self._descriptor_model(self._descriptors.ids[common.normalize_name(descriptor_name)])
+
+    def _asset_model(self, asset_id: int):
+        assets = self._assets
+        return Asset.construct_trusted(
+            assets.names[asset_id],
+            descriptors=[self._descriptors.names[i] for i in assets.links[asset_id]],
+            next_fib=assets.next_fib[asset_id],
+            level_up=bool(assets.level_up[asset_id]),
+        )
+
+    def _descriptor_model(self, desc_id: int):
+        descriptors = self._descriptors
+        return Descriptor.construct_trusted(
+            descriptors.names[desc_id],
+            next_fib=descriptors.next_fib[desc_id],
+            descriptions=self._descriptions[desc_id],
+            level_up=bool(descriptors.level_up[desc_id]),
+            asset_links=[self._assets.names[i] for i in descriptors.links[desc_id]],
+        )
+
+    def link_descriptor(self, asset_name, descriptor_name):
+        """Link a descriptor to an asset
+
+        Raises:
+            KeyError: If either one doesn't exist, the same as MainSeed.
+        """
+        asset_id = self._assets.ids[common.normalize_name(asset_name)]
+        desc_id = self._descriptors.ids[common.normalize_name(descriptor_name)]
+        self._link_descriptor(asset_id, desc_id)
+
+    def _link_descriptor(self, asset_id: int, desc_id: int):
+        links = self._assets.links[asset_id]
+        if desc_id not in links:
+            links.append(desc_id)
+            self._descriptors.links[desc_id].append(asset_id)
+        self._assets.set_count(asset_id, len(links))
+
+    def remove_descriptor(self, asset_name, descriptor_name):
+        """Unlink a descriptor from an asset, keeping the descriptor's links in step
+
+        Raises:
+            KeyError: If either one doesn't exist, or they aren't linked, the same as MainSeed.
+        """
+        asset_id = self._assets.ids[common.normalize_name(asset_name)]
+        desc_id = self._descriptors.ids[common.normalize_name(descriptor_name)]
+        links = self._assets.links[asset_id]
+        try:
+            links.remove(desc_id)
+        except ValueError:
+            raise KeyError(descriptor_name) from None
+        self._descriptors.links[desc_id].remove(asset_id)
+        self._assets.set_count(asset_id, len(links))
+
+    def add_description(self, descriptor_name, description):
+        """Adds a description to a descriptor."""
+        self._add_description(self._ensure_descriptor(common.normalize_name(descriptor_name)), description)
+
+    def _add_description(self, desc_id: int, description: str):
+        """Adds a description to a descriptor by ID, the same checks as Descriptor.add_description."""
+        if not common.is_fibonacci(common.get_num_words(description)):
+            raise errors.FailedDescriptionLength("Required Fibonacci length for the description")
+
+        description = description.lower()
+        descriptions = self._descriptions[desc_id]
+        if description in descriptions:
+            name = self._descriptors.names[desc_id]
+            logger.info("Description: %s has already been added to this descriptor: %s", description, name)
+            return
+        descriptions[description] = None
+        self._descriptors.set_count(desc_id, len(descriptions))
+
+    def remove_description(self, descriptor_name, description):
+        """Removes a description from a descriptor.
+
+        Raises:
+            KeyError: If the descriptor doesn't exist.
+            ValueError: If the description doesn't exist, the same as Descriptor.remove_description.
+        """
+        desc_id = self._descriptors.ids[common.normalize_name(descriptor_name)]
+        descriptions = self._descriptions[desc_id]
+        try:
+            del descriptions[description.lower()]
+        except KeyError:
+            raise ValueError(f"{description!r} not in descriptions") from None
+        self._descriptors.set_count(desc_id, len(descriptions))
+
+    def add_description_to_asset(self, asset_name, descriptor_name, description):
+        """Adds a description to an asset."""
+        desc_id = self._ensure_descriptor(common.normalize_name(descriptor_name))
+        asset_id = self._ensure_asset(common.normalize_name(asset_name))
+        self._add_description(desc_id, description)
+        self._link_descriptor(asset_id, desc_id)
+
+    def bulk_add_descriptions(self, rows: Iterable[Tuple[str, str, str]]):
+        """Add many (asset_name, descriptor_name, description) rows at once, see
+        MainSeed.bulk_add_descriptions.
+
+        Returns:
+            List[Tuple[int, Exception]]: The index and error of every skipped row.
+        """
+        valid, failed = validate_rows(enumerate(rows))
+        assets, descriptors = self._assets, self._descriptors
+        num_assets, num_descriptors = len(assets), len(descriptors)
+        # The links of every touched asset as sets, so a batch that keeps linking the same assets
+        # doesn't scan their arrays for every row of the batch
+        linked: Dict[int, Set[int]] = {}
+        described: Set[int] = set()
+
+        for asset_key, descriptor_key, description in valid:
+            desc_id = descriptors.ids.get(descriptor_key)
+            if desc_id is None:
+                desc_id = descriptors.add(descriptor_key)
+                self._descriptions.append({})
+            asset_id = assets.ids.get(asset_key)
+            if asset_id is None:
+                asset_id = assets.add(asset_key)
+
+            self._descriptions[desc_id][description] = None
+            described.add(desc_id)
+            links = linked.get(asset_id)
+            if links is None:
+                links = linked[asset_id] = set(assets.links[asset_id])
+            if desc_id not in links:
+                links.add(desc_id)
+                assets.links[asset_id].append(desc_id)
+                descriptors.links[desc_id].append(asset_id)
+
+        # Every touched row is leveled once
+        for desc_id in described:
+            descriptors.set_count(desc_id, len(self._descriptions[desc_id]))
+        for asset_id in linked:
+            assets.set_count(asset_id, len(assets.links[asset_id]))
+
+        if len(descriptors) != num_descriptors:
+            self._advance_global_level(GLOBAL_DESCRIPTORS)
+        if len(assets) != num_assets:
+            self._advance_global_level(GLOBAL_ASSETS)
+        return failed
+
+    def _ensure_asset(self, asset_key: str):
+        """The ID of a canonical asset name, added if it doesn't exist."""
+        asset_id = self._assets.ids.get(asset_key)
+        if asset_id is None:
+            asset_id = self._assets.add(asset_key)
+            self._advance_global_level(GLOBAL_ASSETS)
+        return asset_id
+
+    def _ensure_descriptor(self, descriptor_key: str):
+        """The ID of a canonical descriptor name, added if it doesn't exist."""
+        desc_id = self._descriptors.ids.get(descriptor_key)
+        if desc_id is None:
+            desc_id = self._descriptors.add(descriptor_key)
+            self._descriptions.append({})
+            self._advance_global_level(GLOBAL_DESCRIPTORS)
+        return desc_id
+
+    def add_level_listener(self, listener: Callable[[str, int, int], None]):
+        """Register a callback for global level ups, see MainSeed.add_level_listener."""
+        self._level_listeners.append(listener)
+
+    def remove_level_listener(self, listener: Callable[[str, int, int], None]):
+        """Unregister a callback added with add_level_listener."""
+        self._level_listeners.remove(listener)
+
+    def _advance_global_level(self, scope: str):
+        """Level the global assets or descriptors after their count grew, see advance_global_level."""
+        count = len(self._assets if scope == GLOBAL_ASSETS else self._descriptors)
+        advance_global_level(self, scope, count, MainSeed.level_sequence, self._level_listeners)
+
+    def _set_global_levels(self):
+        """Level the global assets and descriptors from their counts."""
+        sequence = MainSeed.level_sequence
+        self.global_desc_next_fib = sequence.next_term(len(self._descriptors))
+        self.global_desc_level_up = sequence.contains(len(self._descriptors))
+        self.global_assets_next_fib = sequence.next_term(len(self._assets))
+        self.global_assets_level_up = sequence.contains(len(self._assets))
+
+    def relevel_all(self):
+        """Recalculate every level column in one vectorized pass. The count columns are read by
+        NumPy in place, which needs the optional numpy dependency."""
+        # pylint: disable=import-outside-toplevel
+        import numpy as np  # pylint: disable=import-error
+
+        from seed import vectorized
+
+        # pylint: enable=import-outside-toplevel
+
+        for table in (self._assets, self._descriptors):
+            counts = np.frombuffer(table.counts, dtype=np.dtype(table.counts.typecode))
+            table.level_up = array("b", vectorized.level_contains(counts, table.sequence).astype(np.int8).tobytes())
+            table.next_fib = array("q", vectorized.level_next_term(counts, table.sequence).tobytes())
+        self._set_global_levels()
+
+    def asset_relations(self, sibling_name: str):
+        """Determines if an asset relates to another asset via a shared descriptor.
+
+        Returns:
+            Dict[str, Set[str]]: Every related asset name keyed by the shared descriptor name
+        """
+        asset_id = self._assets.ids.get(common.normalize_name(sibling_name))
+        if asset_id is None:
+            raise errors.AssetNotFound(f"Asset {sibling_name} doesn't exist.")
+
+        relations: Dict[str, Set[str]] = {}
+        for desc_id in self._assets.links[asset_id]:
+            linked = self._descriptors.links[desc_id]
+            if len(linked) > 1:
+                relations[self._descriptors.names[desc_id]] = {self._assets.names[i] for i in linked if i != asset_id}
+        return relations
+
+    def export_asset_descriptions(self, asset_name):
+        """Export all descriptions for a given asset in a single list."""
+        asset_id = self._assets.ids[common.normalize_name(asset_name)]
+        return [description for i in self._assets.links[asset_id] for description in self._descriptions[i]]
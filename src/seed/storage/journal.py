@@ -0,0 +1,296 @@
+"""Append-only mutation journal for a MainSeed, with snapshot compaction.
+
+Every edit is appended to a journal as one compact record instead of re-dumping the world, so
+persisting a change costs O(record). A JournaledSeed keeps its files in one directory, by
+generation:
+
+    snapshot-<gen>.snap     the world as of the start of the generation, see storage.snapshot
+    journal-<gen>.log       every edit made after that snapshot
+
+Opening replays the journals on top of the newest complete snapshot. Once the live journal passes
+a size threshold it is rotated into a new generation, and a background thread folds the previous
+snapshot and journal into the next snapshot. The live seed is never touched by compaction, and a
+crash at any point leaves a set of files that still replays to the same world.
+
+Records are an operation code, the length of the arguments, the arguments as length prefixed
+UTF-8 strings, and a CRC32. A torn record at the end of a journal, ie: from a crash mid write, is
+dropped on open.
+"""
+
+import os
+import re
+import struct
+import threading
+import zlib
+from typing import IO, Iterator, Optional, Tuple
+
+from seed.models.main_seed import MainSeed
+from seed.storage import snapshot
+
+# Operation codes, each replayed by calling the MainSeed method of the same name
+ADD_DESCRIPTION_TO_ASSET = 1
+ADD_DESCRIPTION = 2
+LINK_DESCRIPTOR = 3
+REMOVE_DESCRIPTION = 4
+REMOVE_DESCRIPTOR = 5
+
+_OPERATIONS = {
+    ADD_DESCRIPTION_TO_ASSET: ("add_description_to_asset", 3),
+    ADD_DESCRIPTION: ("add_description", 2),
+    LINK_DESCRIPTOR: ("link_descriptor", 2),
+    REMOVE_DESCRIPTION: ("remove_description", 2),
+    REMOVE_DESCRIPTOR: ("remove_descriptor", 2),
+}
+
+COMPACT_THRESHOLD = 64 * 2**20
+
+_RECORD_HEAD = struct.Struct("<BI")
+_U32 = struct.Struct("<I")
+
+_GENERATION_FILE = re.compile(r"(snapshot|journal)-(\d+)\.(snap|log)$")
+
+
+def encode_record(operation: int, *args: str):
+    """Encode one journal record."""
+    payload = b"".join(_U32.pack(len(encoded)) + encoded for encoded in (arg.encode() for arg in args))
+    body = _RECORD_HEAD.pack(operation, len(payload)) + payload
+    return body + _U32.pack(zlib.crc32(body))
+
+
+def iter_records(fp: IO) -> Iterator[Tuple[int, Tuple[str, ...], int]]:
+    """Read records from a binary file object, stopping at the end or at the first torn record.
+
+    Yields:
+        (operation, args, end offset) for every complete record.
+    """
+    offset = 0
+    while True:
+        head = fp.read(_RECORD_HEAD.size)
+        if len(head) < _RECORD_HEAD.size:
+            return
+        operation, length = _RECORD_HEAD.unpack(head)
+        payload = fp.read(length)
+        checksum = fp.read(_U32.size)
+        if len(payload) < length or len(checksum) < _U32.size:
+            return
+        if _U32.unpack(checksum)[0] != zlib.crc32(head + payload) or operation not in _OPERATIONS:
+            return
+
+        args = []
+        position = 0
+        while position < length:
+            (size,) = _U32.unpack_from(payload, position)
+            position += _U32.size
+            args.append(payload[position : position + size].decode())
+            position += size
+        if len(args) != _OPERATIONS[operation][1]:
+            return
+
+        offset += _RECORD_HEAD.size + length + _U32.size
+        yield operation, tuple(args), offset
+
+
+def replay(main_seed: MainSeed, path: str):
+    """Apply every complete record of a journal file to a seed.
+
+    Returns:
+        int: The length of the valid part of the journal, in bytes.
+    """
+    valid_length = 0
+    with open(path, "rb") as fp:
+        for operation, args, valid_length in iter_records(fp):
+            getattr(main_seed, _OPERATIONS[operation][0])(*args)
+    return valid_length
+
+
+class Journal:
+    """An open journal file that records are appended to.
+
+    Args:
+        path (str): The journal file, created if needed. Anything after length is cut off.
+        length (int): The length of its valid part, see replay.
+        fsync (bool): Sync every record to disk, not just flush it to the OS.
+    """
+
+    def __init__(self, path: str, length: int = 0, fsync: bool = False):
+        self.path = path
+        self._fsync = fsync
+        self._fp = open(path, "ab")  # pylint: disable=consider-using-with
+        self._fp.truncate(length)
+        self._fp.seek(length)
+
+    @property
+    def size(self):
+        """The journal size in bytes."""
+        return self._fp.tell()
+
+    def append(self, operation: int, *args: str):
+        """Append one record and flush it."""
+        self._fp.write(encode_record(operation, *args))
+        self._fp.flush()
+        if self._fsync:
+            os.fsync(self._fp.fileno())
+
+    def close(self):
+        """Close the journal file."""
+        self._fp.close()
+
+
+class JournaledSeed:
+    """A MainSeed persisted as a snapshot plus an append-only journal of the edits made since.
+
+    The edit methods mirror MainSeed. Each one is applied to the in-memory seed first, and only
+    recorded once it succeeded. MainSeed checks an edit's arguments before changing anything, so
+    one that raises leaves the seed as it was, and the seed always matches what the journal
+    replays to. Reads go straight to the seed attribute.
+
+    Args:
+        directory (str): Where the snapshot and journal files live, created if needed.
+        compact_threshold (int): Journal size in bytes that triggers a background compaction.
+        fsync (bool): Sync every record to disk, see Journal.
+    """
+
+    def __init__(self, directory: str, compact_threshold: int = COMPACT_THRESHOLD, fsync: bool = False):
+        self.directory = directory
+        self.compact_threshold = compact_threshold
+        self._fsync = fsync
+        self._compaction: Optional[threading.Thread] = None
+        self._compaction_error: Optional[BaseException] = None
+        os.makedirs(directory, exist_ok=True)
+
+        snapshots, journals = self._list_generations()
+        self._snapshot_generation = max(snapshots, default=None)
+        if self._snapshot_generation is None:
+            self.seed = MainSeed()
+        else:
+            self.seed = snapshot.load(self._snapshot_path(self._snapshot_generation), trusted=True)
+
+        # Replay every journal from the snapshot's generation on, the newest one stays open
+        self.generation = self._snapshot_generation or 0
+        valid_length = 0
+        for generation in sorted(journals):
+            if generation >= self.generation:
+                self.generation = generation
+                valid_length = replay(self.seed, self._journal_path(generation))
+        self._journal = Journal(self._journal_path(self.generation), valid_length, fsync)
+        self._remove_stale_files()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Wait for a running compaction, close the journal and release the snapshot the seed was
+        loaded from."""
+        self.wait_for_compaction()
+        self._journal.close()
+        self.seed.close()
+
+    def add_description_to_asset(self, asset_name, descriptor_name, description):
+        """Adds a description to an asset, see MainSeed.add_description_to_asset"""
+        self._record(ADD_DESCRIPTION_TO_ASSET, asset_name, descriptor_name, description)
+
+    def add_description(self, descriptor_name, description):
+        """Adds a description to a descriptor, see MainSeed.add_description"""
+        self._record(ADD_DESCRIPTION, descriptor_name, description)
+
+    def link_descriptor(self, asset_name, descriptor_name):
+        """Link a descriptor to an asset, see MainSeed.link_descriptor"""
+        self._record(LINK_DESCRIPTOR, asset_name, descriptor_name)
+
+    def remove_description(self, descriptor_name, description):
+        """Removes a description from a descriptor, see MainSeed.remove_description"""
+        self._record(REMOVE_DESCRIPTION, descriptor_name, description)
+
+    def remove_descriptor(self, asset_name, descriptor_name):
+        """Unlink a descriptor from an asset, see MainSeed.remove_descriptor"""
+        self._record(REMOVE_DESCRIPTOR, asset_name, descriptor_name)
+
+    def _record(self, operation: int, *args: str):
+        getattr(self.seed, _OPERATIONS[operation][0])(*args)
+        self._journal.append(operation, *args)
+        if self._journal.size >= self.compact_threshold:
+            self.compact()
+
+    def compact(self, wait: bool = False):
+        """Start a new generation and fold the previous one into a snapshot in the background.
+        Does nothing if a compaction is already running.
+
+        Args:
+            wait (bool): Block until the compaction finished.
+        """
+        if self._compaction is None or not self._compaction.is_alive():
+            previous = self.generation
+            self.generation += 1
+            self._journal.close()
+            self._journal = Journal(self._journal_path(self.generation), fsync=self._fsync)
+
+            self._compaction = threading.Thread(target=self._compact, args=(previous,), name="seed-compaction")
+            self._compaction.start()
+
+        if wait:
+            self.wait_for_compaction()
+
+    def wait_for_compaction(self):
+        """Block until a running compaction finished, and raise anything it failed with. The
+        previous generation's files are left in place when it fails, so nothing is lost."""
+        if self._compaction is not None:
+            self._compaction.join()
+        if self._compaction_error is not None:
+            error, self._compaction_error = self._compaction_error, None
+            raise error
+
+    def _compact(self, previous: int):
+        """Run a compaction, keeping its error for wait_for_compaction."""
+        try:
+            self._fold(previous)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            self._compaction_error = exc
+
+    def _fold(self, previous: int):
+        """Build the snapshot of a new generation from the newest snapshot and every journal up to
+        the previous generation. The snapshot only appears under its final name once complete,
+        older files are removed after."""
+        start = self._snapshot_generation
+        main_seed = MainSeed() if start is None else snapshot.load(self._snapshot_path(start), trusted=True)
+        with main_seed:
+            for generation in sorted(self._list_generations()[1]):
+                if (start or 0) <= generation <= previous:
+                    replay(main_seed, self._journal_path(generation))
+
+            path = self._snapshot_path(previous + 1)
+            snapshot.dump(main_seed, f"{path}.tmp")
+        with open(f"{path}.tmp", "rb") as fp:
+            os.fsync(fp.fileno())
+        os.replace(f"{path}.tmp", path)
+
+        self._snapshot_generation = previous + 1
+        self._remove_stale_files()
+
+    def _remove_stale_files(self):
+        """Remove the snapshots and journals older than the newest snapshot."""
+        if self._snapshot_generation is None:
+            return
+        snapshots, journals = self._list_generations()
+        for generation in snapshots:
+            if generation < self._snapshot_generation:
+                os.remove(self._snapshot_path(generation))
+        for generation in journals:
+            if generation < self._snapshot_generation:
+                os.remove(self._journal_path(generation))
+
+    def _list_generations(self):
+        snapshots, journals = [], []
+        for name in os.listdir(self.directory):
+            match = _GENERATION_FILE.match(name)
+            if match:
+                (snapshots if match.group(1) == "snapshot" else journals).append(int(match.group(2)))
+        return snapshots, journals
+
+    def _snapshot_path(self, generation: int):
+        return os.path.join(self.directory, f"snapshot-{generation:08d}.snap")
+
+    def _journal_path(self, generation: int):
+        return os.path.join(self.directory, f"journal-{generation:08d}.log")
@@ -0,0 +1,224 @@
+"""Streaming JSON import and export of a MainSeed.
+
+The output is byte for byte what MainSeed.model_dump_json writes, but assets and descriptors
+are written and read one entry at a time, so neither side holds the whole document as a
+single string. Peak memory on top of the seed itself is one read chunk plus one entry.
+
+    with open("world.json", "w", encoding="utf-8") as fp:
+        json_stream.dump(main_seed, fp)
+
+    with open("world.json", "rb") as fp:
+        main_seed = json_stream.load(fp)
+"""
+
+import codecs
+import io
+import json
+import re
+from typing import IO, Iterator, Optional, Tuple
+
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from seed.models import Asset, Descriptor
+from seed.models.main_seed import MainSeed, key_by_name
+
+CHUNK_SIZE = 1 << 16
+
+# The MainSeed fields written and read one entry at a time
+_MODEL_FIELDS = {"global_descriptors": Descriptor, "global_assets": Asset}
+
+# Validators for the remaining top level values, ie: strict and the global levels
+_VALUE_ADAPTERS = {
+    name: TypeAdapter(info.annotation) for name, info in MainSeed.model_fields.items() if name not in _MODEL_FIELDS
+}
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def dump(main_seed: MainSeed, fp: IO):
+    """Write a seed to a text or binary file object, one asset or descriptor at a time.
+
+    Args:
+        main_seed (MainSeed): The seed to write. Lazily loaded entries are hydrated as they are
+            written, the same as model_dump_json.
+        fp (IO): Anything with a write method. Bytes are written unless it is a text stream.
+    """
+    write = fp.write
+    if not isinstance(fp, io.TextIOBase):
+        write = lambda text: fp.write(text.encode())
+
+    separator = "{"
+    for field in type(main_seed).model_fields:
+        write(f"{separator}{_to_json(field)}:")
+        separator = ","
+        if field not in _MODEL_FIELDS:
+            write(_to_json(getattr(main_seed, field)))
+            continue
+
+        entry_separator = "{"
+        for name, model in getattr(main_seed, field).items():
+            write(f"{entry_separator}{_to_json(name)}:{model.model_dump_json()}")
+            entry_separator = ","
+        write("{}" if entry_separator == "{" else "}")
+    write("}")
+
+
+def load(fp: IO, trusted: bool = False, chunk_size: int = CHUNK_SIZE):
+    """Read a seed written by dump or model_dump_json, inserting each entry as it is parsed.
+
+    Args:
+        fp (IO): A text or binary file object, bytes are decoded as UTF-8.
+        trusted (bool): Build entries with construct_trusted and skip all validation and
+            sanitation, see MainSeed.load.
+        chunk_size (int): Characters or bytes read at a time.
+
+    Raises:
+        json.JSONDecodeError: If the document is malformed or truncated.
+    """
+    models = {field: [] for field in _MODEL_FIELDS}
+    values = {}
+    for field, name, value in iter_document(fp, chunk_size):
+        if name is None:
+            if field in _VALUE_ADAPTERS:
+                values[field] = value if trusted else validate_value(field, value)
+            continue
+
+        model_cls = _MODEL_FIELDS[field]
+        model = model_cls.construct_trusted(**value) if trusted else model_cls.model_validate(value)
+        models[field].append(model)
+
+    # Keyed once strict is known, it may come after the entries
+    strict = values.get("strict", False)
+    main_seed = MainSeed.model_construct(**{field: key_by_name(i, strict) for field, i in models.items()}, **values)
+    if not trusted:
+        # Keys are already canonical, only the cross model checks of verify_and_sanitize remain
+        main_seed._sanitize_global_levels()  # pylint: disable=protected-access
+        main_seed._sync_asset_links()  # pylint: disable=protected-access
+    return main_seed
+
+
+def validate_value(field: str, value):
+    """Validate one of the top level MainSeed values that aren't assets or descriptors, ie: strict."""
+    return _VALUE_ADAPTERS[field].validate_python(value)
+
+
+def iter_document(fp: IO, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, Optional[str], object]]:
+    """Parse a seed document incrementally.
+
+    Yields:
+        (field, name, entry) for every asset and descriptor, with entry as the parsed dict, and
+        (field, None, value) for every other top level value.
+    """
+    reader = _ChunkReader(fp, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.expect("}")
+        return
+
+    while True:
+        field = reader.string()
+        reader.expect(":")
+        if field in _MODEL_FIELDS:
+            yield from _iter_entries(reader, field)
+        else:
+            yield field, None, reader.value()
+        if reader.expect(",}") == "}":
+            break
+
+    if reader.peek():
+        reader.error("Extra data")
+
+
+def _iter_entries(reader: "_ChunkReader", field: str):
+    """Yield the entries of one name -> model object."""
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.expect("}")
+        return
+
+    while True:
+        name = reader.string()
+        reader.expect(":")
+        yield field, name, reader.value()
+        if reader.expect(",}") == "}":
+            return
+
+
+def _to_json(value):
+    return to_json(value).decode()
+
+
+class _ChunkReader:
+    """A cursor over a file object that only keeps the unparsed tail of what has been read."""
+
+    def __init__(self, fp: IO, chunk_size: int):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = None
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._scan = json.JSONDecoder().raw_decode
+
+    def _fill(self):
+        """Drop the parsed part of the buffer and read another chunk. False once exhausted."""
+        if self._eof:
+            return False
+
+        # Read at least as much as is buffered, so retrying a large entry stays linear
+        raw = self._fp.read(max(self._chunk_size, len(self._buffer) - self._pos))
+        if isinstance(raw, bytes):
+            if self._decoder is None:
+                self._decoder = codecs.getincrementaldecoder("utf-8")()
+            chunk = self._decoder.decode(raw, final=not raw)
+        else:
+            chunk = raw
+        self._eof = not raw
+
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def error(self, msg: str):
+        """Raise a decode error at the current position."""
+        raise json.JSONDecodeError(msg, self._buffer, self._pos)
+
+    def peek(self):
+        """Skip whitespace and return the next character, or an empty string at the end."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, characters: str):
+        """Consume one of the given characters and return it."""
+        character = self.peek()
+        if not character or character not in characters:
+            self.error(f"Expecting one of {characters!r}")
+        self._pos += 1
+        return character
+
+    def string(self):
+        """Consume a string, ie: a key."""
+        if self.peek() != '"':
+            self.error("Expecting property name enclosed in double quotes")
+        return self.value()
+
+    def value(self):
+        """Consume one complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._scan(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+
+            # A number at the very end of the buffer may continue in the next chunk
+            if end < len(self._buffer) or not self._fill():
+                self._pos = end
+                return value
@@ -0,0 +1,223 @@
+"""Multi-process validated loading of large seed files.
+
+Validating a seed is dominated by the Asset and Descriptor validators, which are independent of
+each other. load finds the entries of global_descriptors and global_assets in the raw bytes and
+cuts them into shards without parsing them, so parsing and validating both happen in a
+ProcessPoolExecutor. Workers send back the sanitized field values of every model, which only
+have to be wrapped into models in the calling process. Only the checks that span the whole world,
+the global levels and asset_links, run there as well.
+
+    main_seed = parallel.load(seed_json, workers=8)
+
+Requires numpy, which is an optional dependency of this package. The shards are found with a
+vectorized scan for quotes and braces."""
+
+import gc
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np  # pylint: disable=import-error
+except ImportError as ex:  # pragma: no cover
+    raise ImportError("seed.storage.parallel requires numpy, install it with: pip install seed[fast]") from ex
+
+from pydantic import ValidationError
+from pydantic_core import from_json
+
+from seed import errors
+from seed.models import Asset, Descriptor
+from seed.models.main_seed import MainSeed
+from seed.storage import json_stream
+
+SHARDS_PER_WORKER = 4
+
+_MODEL_FIELDS = {"global_descriptors": Descriptor, "global_assets": Asset}
+
+# The name set of every model, interned along with its name when the model is rebuilt
+_NAME_SETS = {"global_descriptors": "asset_links", "global_assets": "descriptors"}
+
+_QUOTE, _BACKSLASH, _OPEN, _CLOSE = b'"\\{}'
+
+# What separates one entry from the next, stripped from the start of a shard
+_SEPARATORS = b", \t\n\r"
+
+
+def load(data, workers: Optional[int] = None, shards_per_worker: int = SHARDS_PER_WORKER):
+    """Load and validate a seed from JSON across several processes. The result is the same as
+    MainSeed.model_validate_json, but every invalid entity is reported at once.
+
+    Args:
+        data (str | bytes): The JSON document, as written by model_dump_json.
+        workers (int): Worker processes, defaults to the number of CPUs. With 1 the shards are
+            validated in the calling process, without a pool.
+        shards_per_worker (int): Shards each section is split into per worker. More shards
+            balance uneven entries better, fewer have less overhead.
+
+    Raises:
+        errors.AggregatedValidationException: With the section, name and message of every
+            asset and descriptor that failed validation.
+        errors.SeedValidationException: If strict and the global levels or asset_links are invalid.
+        ValueError: If the document is not valid JSON.
+    """
+    workers = workers or os.cpu_count() or 1
+    if isinstance(data, str):
+        data = data.encode()
+
+    rest, sections = _split_sections(data)
+    raw = from_json(rest)
+    values = {
+        field: json_stream.validate_value(field, value)
+        for field, value in raw.items()
+        if field in MainSeed.model_fields and field not in _MODEL_FIELDS
+    }
+
+    num_shards = workers * shards_per_worker
+    shards = [(field, shard) for field, boundaries in sections.items() for shard in _shards(data, boundaries, num_shards)]
+    models: Dict[str, dict] = {field: {} for field in _MODEL_FIELDS}
+    failed: List[tuple] = []
+    with _gc_paused():
+        _validate_all(shards, workers, models, failed, values.get("strict", False))
+
+    if failed:
+        raise errors.AggregatedValidationException(failed)
+
+    main_seed = MainSeed.model_construct(**models, **values)
+    main_seed._sanitize_global_levels()  # pylint: disable=protected-access
+    main_seed._sync_asset_links()  # pylint: disable=protected-access
+    return main_seed
+
+
+def _validate_all(shards: List[Tuple[str, bytes]], workers: int, models: Dict[str, dict], failed: List[tuple], strict: bool):
+    """Validate every shard, in the calling process if there is a single worker, and merge them."""
+    if workers == 1:
+        _merge(((field, _validate_shard(field, shard)) for field, shard in shards), models, failed, strict)
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        jobs = [(field, executor.submit(_validate_shard, field, shard)) for field, shard in shards]
+        shards.clear()
+        # Merged in submission order while later shards are still being validated
+        _merge(((field, job.result()) for field, job in jobs), models, failed, strict)
+
+
+@contextmanager
+def _gc_paused():
+    """Pause the cyclic garbage collector. The models built here hold no cycles, but collections
+    keep being triggered as they pile up and scan the whole growing seed every time."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _merge(results: Iterator[Tuple[str, tuple]], models: Dict[str, dict], failed: List[tuple], strict: bool):
+    """Wrap the field values sent back for every shard into models, interning the names the same
+    as construct_trusted. Entries whose keys only matched once normalized are merged the same as
+    key_by_name, or reported as failed if strict."""
+    intern = sys.intern
+    for field, (states, shard_failed) in results:
+        failed.extend(shard_failed)
+        model_cls, name_set, section = _MODEL_FIELDS[field], _NAME_SETS[field], models[field]
+        for state in states:
+            state["name"] = name = intern(state["name"])
+            state[name_set] = set(map(intern, state[name_set]))
+            model = model_cls._construct_unchecked(state)  # pylint: disable=protected-access
+            first = section.setdefault(name, model)
+            if first is model:
+                continue
+            if strict:
+                failed.append((field, name, f"Duplicate {model_cls.__name__} name: {name}"))
+            else:
+                first.merge(model)
+
+
+def _validate_shard(field: str, shard: bytes):
+    """Parse and validate a run of "name": entry pairs, normally in a worker process.
+
+    Returns:
+        Tuple[list, list]: The field values of every valid entry, ready for
+            StrictModel._construct_unchecked, and the (section, name, message) of every invalid one.
+    """
+    model_cls = _MODEL_FIELDS[field]
+    states, failed = [], []
+    for name, entry in from_json(b"{" + shard.lstrip(_SEPARATORS) + b"}").items():
+        try:
+            model = model_cls.model_validate(entry)
+        except (ValidationError, errors.SeedException, errors.SeedValidationException) as exc:
+            failed.append((field, name, str(exc)))
+            continue
+        states.append(model.__dict__)
+    return states, failed
+
+
+def _split_sections(data: bytes):
+    """Find the assets and descriptors in a document without parsing it.
+
+    Every quote that isn't escaped starts or ends a string, so a brace is structural when an even
+    number of them come before it. The structural braces give the nesting depth, the document is
+    depth 1, its global_descriptors and global_assets depth 2 and their entries depth 3.
+
+    Returns:
+        Tuple[bytes, dict]: The document with both sections emptied, and the shard boundaries of
+            each section: the offset of its opening brace, of the closing brace of every entry but
+            the last, and the offset before its own closing brace.
+
+    Raises:
+        ValueError: If the braces of the document don't balance.
+    """
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    quotes = np.flatnonzero(buffer == _QUOTE)
+
+    # A quote is escaped if an odd run of backslashes comes before it, which only happens in the
+    # rare strings holding a quote or a backslash
+    escaped = []
+    backslashes = np.flatnonzero(buffer[:-1] == _BACKSLASH)
+    for offset in (backslashes[buffer[backslashes + 1] == _QUOTE] + 1).tolist():
+        start = offset - 1
+        while start >= 0 and data[start] == _BACKSLASH:
+            start -= 1
+        if (offset - start) % 2 == 0:
+            escaped.append(offset)
+    if escaped:
+        quotes = np.setdiff1d(quotes, escaped, assume_unique=True)
+
+    braces = np.flatnonzero((buffer == _OPEN) | (buffer == _CLOSE))
+    braces = braces[np.searchsorted(quotes, braces) % 2 == 0]
+    opening = buffer[braces] == _OPEN
+    depth = np.cumsum(np.where(opening, 1, -1))
+    if len(depth) and (depth[-1] != 0 or depth.min() < 0):
+        raise ValueError("Unbalanced braces in the seed document")
+
+    sections, rest, copied = {}, [], 0
+    for start, end in zip(braces[opening & (depth == 2)].tolist(), braces[~opening & (depth == 1)].tolist()):
+        # The key of a section is the last string before its opening brace
+        key = np.searchsorted(quotes, start)
+        field = from_json(data[quotes[key - 2] : quotes[key - 1] + 1]) if key >= 2 else None
+        if field not in _MODEL_FIELDS:
+            continue
+        first, last = np.searchsorted(braces, [start, end])
+        inside = braces[first:last]
+        entry_ends = inside[(buffer[inside] == _CLOSE) & (depth[first:last] == 2)].tolist()
+        # The last shard runs up to the closing brace of the section, so nothing after the last
+        # entry is left out
+        sections[field] = [start, *entry_ends[:-1], end - 1]
+        rest.append(data[copied : start + 1])
+        copied = end
+    rest.append(data[copied:])
+    return b"".join(rest), sections
+
+
+def _shards(data: bytes, boundaries: List[int], num_shards: int):
+    """Cut the entries of a section into about num_shards runs of whole entries."""
+    num_entries = len(boundaries) - 1
+    size = max(1, math.ceil(num_entries / num_shards))
+    for first in range(0, num_entries, size):
+        last = min(first + size, num_entries)
+        yield data[boundaries[first] + 1 : boundaries[last] + 1]
@@ -0,0 +1,316 @@
+"""Compact binary snapshots of a MainSeed.
+
+Every asset and descriptor name is stored once in a string table and referenced by its integer
+ID everywhere else, as the record name, in Asset descriptors and in Descriptor asset_links.
+Descriptions are stored as length prefixed UTF-8 blobs inside their descriptor's record.
+Loading memory maps the file, reads the indexes and string table, and only decodes a record
+the first time its model is accessed, see LazyModels.
+
+Layout, all integers little endian:
+
+    header          magic, version, flags, both global next_fib values, the string,
+                    descriptor and asset counts, and the offsets of the three indexes below
+    records         descriptor records followed by asset records
+    descriptor idx  record offset (u64) per descriptor, then name ID (u32) per descriptor
+    asset idx       record offset (u64) per asset, then name ID (u32) per asset
+    string idx      num_strings + 1 start offsets (u64) into the blob, then the UTF-8 blob
+
+    descriptor      name ID, next_fib, flags, description count, each description as a
+                    u32 length and its bytes, link count, asset name IDs
+    asset           name ID, next_fib, flags, descriptor count, descriptor name IDs
+"""
+
+import mmap
+import struct
+import sys
+from contextlib import contextmanager
+from typing import IO, Dict, List
+
+from seed import errors
+from seed.models import Asset, Descriptor
+from seed.models.lazy import LazyModels
+from seed.models.main_seed import MainSeed
+from seed.storage import json_stream
+
+MAGIC = b"SEEDSNAP"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sHHQQIIIQQQ")
+_RECORD_HEAD = struct.Struct("<IQBI")
+_U32 = struct.Struct("<I")
+
+# Flag bits, the header uses all three and records only use strict and level_up
+_STRICT = 1
+_LEVEL_UP = 2
+_ASSETS_LEVEL_UP = 4
+
+
+def dump(main_seed: MainSeed, path: str):
+    """Write a seed to a snapshot file. Records are written as they are encoded, so only the
+    string table and indexes are kept in memory."""
+    writer = _SnapshotWriter()
+    with open(path, "wb") as fp:
+        fp.write(bytes(_HEADER.size))
+
+        descriptor_index = [writer.write_descriptor(fp, desc) for desc in main_seed.global_descriptors.values()]
+        asset_index = [writer.write_asset(fp, asset) for asset in main_seed.global_assets.values()]
+
+        descriptors_offset = _write_index(fp, descriptor_index)
+        assets_offset = _write_index(fp, asset_index)
+        strings_offset = fp.tell()
+        writer.write_strings(fp)
+
+        flags = (
+            _STRICT * main_seed.strict
+            | _LEVEL_UP * main_seed.global_desc_level_up
+            | _ASSETS_LEVEL_UP * main_seed.global_assets_level_up
+        )
+        fp.seek(0)
+        fp.write(
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                flags,
+                main_seed.global_desc_next_fib,
+                main_seed.global_assets_next_fib,
+                len(writer.names),
+                len(descriptor_index),
+                len(asset_index),
+                strings_offset,
+                descriptors_offset,
+                assets_offset,
+            )
+        )
+
+
+def load(path: str, lazy: bool = True, trusted: bool = False):
+    """Load a seed from a snapshot file.
+
+    Args:
+        path (str): The snapshot written by dump.
+        lazy (bool): Keep the file memory mapped and only decode a record when its model is first
+            accessed, until the seed is closed:
+
+                with snapshot.load(path) as main_seed:
+                    ...
+
+            Otherwise every record is decoded and the file is closed right away.
+        trusted (bool): Skip validation and sanitation entirely, see MainSeed.load.
+
+    Raises:
+        errors.SnapshotFormatError: If the file is not a snapshot this version can read, or is
+            truncated. With lazy, a damaged record only raises when its model is accessed.
+    """
+    with open(path, "rb") as fp:
+        try:
+            buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise errors.SnapshotFormatError("Empty file is not a snapshot") from None
+
+    try:
+        reader = _SnapshotReader(buffer)
+    except errors.SnapshotFormatError:
+        buffer.close()
+        raise
+    hydrate_descriptor, hydrate_asset = Descriptor.model_validate, Asset.model_validate
+    if trusted:
+        hydrate_descriptor = lambda i: Descriptor.construct_trusted(**i)
+        hydrate_asset = lambda i: Asset.construct_trusted(**i)
+
+    main_seed = MainSeed.model_construct(
+        strict=reader.strict,
+        global_descriptors=LazyModels(
+            reader.descriptor_offsets, lambda offset: hydrate_descriptor(reader.read_descriptor(offset))
+        ),
+        global_desc_level_up=reader.global_desc_level_up,
+        global_desc_next_fib=reader.global_desc_next_fib,
+        global_assets=LazyModels(reader.asset_offsets, lambda offset: hydrate_asset(reader.read_asset(offset))),
+        global_assets_level_up=reader.global_assets_level_up,
+        global_assets_next_fib=reader.global_assets_next_fib,
+    )
+
+    if lazy:
+        # The map stays open for the records that aren't decoded yet, until main_seed.close()
+        main_seed._release = buffer.close  # pylint: disable=protected-access
+        if not trusted:
+            main_seed._sanitize_global_levels()  # pylint: disable=protected-access
+        return main_seed
+
+    main_seed.global_descriptors = main_seed.global_descriptors.hydrate_all()
+    main_seed.global_assets = main_seed.global_assets.hydrate_all()
+    buffer.close()
+    if not trusted:
+        main_seed._sanitize_global_levels()  # pylint: disable=protected-access
+        main_seed._sync_asset_links()  # pylint: disable=protected-access
+    return main_seed
+
+
+def json_to_snapshot(json_fp: IO, path: str, trusted: bool = False):
+    """Convert a JSON seed, as written by model_dump_json or json_stream.dump, to a snapshot."""
+    dump(json_stream.load(json_fp, trusted=trusted), path)
+
+
+def snapshot_to_json(path: str, json_fp: IO):
+    """Convert a snapshot back to the JSON written by model_dump_json."""
+    json_stream.dump(load(path, trusted=True), json_fp)
+
+
+def _write_index(fp: IO, index: List[tuple]):
+    """Write the record offsets followed by the name IDs, and return where the index starts."""
+    start = fp.tell()
+    fp.write(struct.pack(f"<{len(index)}Q", *(offset for offset, _ in index)))
+    fp.write(struct.pack(f"<{len(index)}I", *(name_id for _, name_id in index)))
+    return start
+
+
+class _SnapshotWriter:
+    """Encodes records and assigns string IDs in order of first use."""
+
+    def __init__(self):
+        self.names: Dict[str, int] = {}
+
+    def name_id(self, name: str):
+        """The string table ID of a name, added on first use."""
+        return self.names.setdefault(name, len(self.names))
+
+    def write_descriptor(self, fp: IO, desc: Descriptor):
+        """Write one descriptor record and return (offset, name ID)."""
+        offset, name_id = fp.tell(), self.name_id(desc.name)
+        flags = _STRICT * desc.strict | _LEVEL_UP * desc.level_up
+        parts = [_RECORD_HEAD.pack(name_id, desc.next_fib, flags, len(desc.descriptions))]
+        for description in desc.descriptions:
+            encoded = description.encode()
+            parts.append(_U32.pack(len(encoded)))
+            parts.append(encoded)
+        links = [self.name_id(i) for i in desc.asset_links]
+        parts.append(struct.pack(f"<I{len(links)}I", len(links), *links))
+        fp.write(b"".join(parts))
+        return offset, name_id
+
+    def write_asset(self, fp: IO, asset: Asset):
+        """Write one asset record and return (offset, name ID)."""
+        offset, name_id = fp.tell(), self.name_id(asset.name)
+        descriptors = [self.name_id(i) for i in asset.descriptors]
+        flags = _STRICT * asset.strict | _LEVEL_UP * asset.level_up
+        fp.write(_RECORD_HEAD.pack(name_id, asset.next_fib, flags, len(descriptors)))
+        fp.write(struct.pack(f"<{len(descriptors)}I", *descriptors))
+        return offset, name_id
+
+    def write_strings(self, fp: IO):
+        """Write the string index and blob."""
+        encoded = [name.encode() for name in self.names]
+        starts = [0]
+        for blob in encoded:
+            starts.append(starts[-1] + len(blob))
+        fp.write(struct.pack(f"<{len(starts)}Q", *starts))
+        fp.write(b"".join(encoded))
+
+
+@contextmanager
+def _format_errors():
+    """Raise SnapshotFormatError for data that doesn't decode, ie: a truncated file or an offset
+    or count pointing past the end of the file."""
+    try:
+        yield
+    except (struct.error, UnicodeDecodeError, IndexError) as exc:
+        raise errors.SnapshotFormatError(f"Damaged snapshot: {exc}") from exc
+
+
+class _SnapshotReader:
+    """Reads the header, indexes and string table of a mapped snapshot, and decodes records."""
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        if len(buffer) < _HEADER.size:
+            raise errors.SnapshotFormatError("File is too small to be a snapshot")
+        with _format_errors():
+            self._read_header()
+
+    def _read_header(self):
+        """Read the header, the string table and both indexes."""
+        buffer = self._buffer
+        (
+            magic,
+            version,
+            flags,
+            self.global_desc_next_fib,
+            self.global_assets_next_fib,
+            num_strings,
+            num_descriptors,
+            num_assets,
+            strings_offset,
+            descriptors_offset,
+            assets_offset,
+        ) = _HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise errors.SnapshotFormatError("Not a seed snapshot")
+        if version != VERSION:
+            raise errors.SnapshotFormatError(f"Unsupported snapshot version: {version}")
+
+        self.strict = bool(flags & _STRICT)
+        self.global_desc_level_up = bool(flags & _LEVEL_UP)
+        self.global_assets_level_up = bool(flags & _ASSETS_LEVEL_UP)
+
+        starts = struct.unpack_from(f"<{num_strings + 1}Q", buffer, strings_offset)
+        blob = strings_offset + len(starts) * 8
+        # The blob ends the file, slicing past the end of the map would silently cut names short
+        if blob + starts[-1] > len(buffer):
+            raise errors.SnapshotFormatError("Damaged snapshot: the string table is truncated")
+        self.strings = [sys.intern(buffer[blob + start : blob + end].decode()) for start, end in zip(starts, starts[1:])]
+
+        self.descriptor_offsets = self._read_index(descriptors_offset, num_descriptors)
+        self.asset_offsets = self._read_index(assets_offset, num_assets)
+
+    def _read_index(self, offset: int, count: int):
+        """Map each record's name to its offset, in record order."""
+        offsets = struct.unpack_from(f"<{count}Q", self._buffer, offset)
+        name_ids = struct.unpack_from(f"<{count}I", self._buffer, offset + count * 8)
+        strings = self.strings
+        return {strings[name_id]: record for name_id, record in zip(name_ids, offsets)}
+
+    def _read_names(self, offset: int):
+        """Read a u32 count followed by that many name IDs, and return (names, end offset)."""
+        (count,) = _U32.unpack_from(self._buffer, offset)
+        name_ids = struct.unpack_from(f"<{count}I", self._buffer, offset + 4)
+        return [self.strings[i] for i in name_ids], offset + 4 + count * 4
+
+    def read_descriptor(self, offset: int):
+        """Decode the descriptor record at offset into its fields."""
+        with _format_errors():
+            return self._read_descriptor(offset)
+
+    def _read_descriptor(self, offset: int):
+        buffer = self._buffer
+        name_id, next_fib, flags, count = _RECORD_HEAD.unpack_from(buffer, offset)
+        offset += _RECORD_HEAD.size
+        descriptions = []
+        for _ in range(count):
+            (length,) = _U32.unpack_from(buffer, offset)
+            offset += 4
+            descriptions.append(buffer[offset : offset + length].decode())
+            offset += length
+        asset_links, _ = self._read_names(offset)
+        return {
+            "name": self.strings[name_id],
+            "next_fib": next_fib,
+            "descriptions": descriptions,
+            "level_up": bool(flags & _LEVEL_UP),
+            "asset_links": asset_links,
+            "strict": bool(flags & _STRICT),
+        }
+
+    def read_asset(self, offset: int):
+        """Decode the asset record at offset into its fields."""
+        with _format_errors():
+            return self._read_asset(offset)
+
+    def _read_asset(self, offset: int):
+        name_id, next_fib, flags, _ = _RECORD_HEAD.unpack_from(self._buffer, offset)
+        descriptors, _ = self._read_names(offset + _RECORD_HEAD.size - 4)
+        return {
+            "name": self.strings[name_id],
+            "descriptors": descriptors,
+            "next_fib": next_fib,
+            "level_up": bool(flags & _LEVEL_UP),
+            "strict": bool(flags & _STRICT),
+        }
@@ -0,0 +1,404 @@
+"""SQLite storage backend for worlds larger than memory.
+
+Assets, descriptors, descriptions and asset <-> descriptor links live in their own tables, with
+the links indexed from both sides. Nothing is loaded up front, every operation is an indexed
+query, and levels are calculated from the counts when a model is read, since they are a pure
+function of them.
+
+    with SqliteSeed("world.db") as seed_db:
+        failed = seed_db.bulk_add_descriptions(rows)
+        seed_db.asset_relations("character1")
+"""
+
+import logging
+import sqlite3
+from itertools import groupby
+from typing import Dict, Iterable, List, Set, Tuple
+
+from seed import common, errors
+from seed.models import Asset, Descriptor
+from seed.models.main_seed import MainSeed, validate_rows
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 10000
+
+# Bound parameters per IN (...) query, well under SQLITE_MAX_VARIABLE_NUMBER of older builds
+_MAX_VARIABLES = 900
+
+_ASSETS = "assets"
+_DESCRIPTORS = "descriptors"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS descriptors (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS descriptions (
+    id INTEGER PRIMARY KEY,
+    descriptor_id INTEGER NOT NULL REFERENCES descriptors (id),
+    description TEXT NOT NULL,
+    UNIQUE (descriptor_id, description)
+);
+CREATE TABLE IF NOT EXISTS links (
+    asset_id INTEGER NOT NULL REFERENCES assets (id),
+    descriptor_id INTEGER NOT NULL REFERENCES descriptors (id),
+    PRIMARY KEY (asset_id, descriptor_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS links_by_descriptor ON links (descriptor_id, asset_id);
+"""
+
+_INSERT_DESCRIPTION = (
+    "INSERT OR IGNORE INTO descriptions (descriptor_id, description) SELECT id, ? FROM descriptors WHERE name = ?"
+)
+_INSERT_LINK = (
+    "INSERT OR IGNORE INTO links (asset_id, descriptor_id) "
+    "SELECT assets.id, descriptors.id FROM assets, descriptors WHERE assets.name = ? AND descriptors.name = ?"
+)
+
+
+class SqliteSeed:
+    """A MainSeed kept in an SQLite database. Names are normalized the same way as MainSeed, and
+    the write methods behave the same, each one running in its own transaction.
+
+    Args:
+        path (str): The database file, created if needed. Defaults to an in-memory database.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+
+        # Kept in step with every insert, so the global levels never need a COUNT(*) scan
+        self._num_assets = self._scalar("SELECT count(*) FROM assets")
+        self._num_descriptors = self._scalar("SELECT count(*) FROM descriptors")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the database connection."""
+        self._connection.close()
+
+    @classmethod
+    def from_main_seed(cls, main_seed: MainSeed, path: str = ":memory:"):
+        """Copy an in-memory seed into a new database in a single transaction. Asset descriptors
+        that don't exist as descriptors are not linked."""
+        seed_db = cls(path)
+        descriptors = main_seed.global_descriptors.values()
+        assets = main_seed.global_assets.values()
+        with seed_db._connection as connection:
+            connection.executemany("INSERT OR IGNORE INTO descriptors (name) VALUES (?)", ((i.name,) for i in descriptors))
+            connection.executemany("INSERT OR IGNORE INTO assets (name) VALUES (?)", ((i.name,) for i in assets))
+            connection.executemany(
+                _INSERT_DESCRIPTION, ((description, desc.name) for desc in descriptors for description in desc.descriptions)
+            )
+            connection.executemany(_INSERT_LINK, ((asset.name, name) for asset in assets for name in asset.descriptors))
+        seed_db._num_descriptors = seed_db._scalar("SELECT count(*) FROM descriptors")
+        seed_db._num_assets = seed_db._scalar("SELECT count(*) FROM assets")
+        return seed_db
+
+    def to_main_seed(self):
+        """Load the whole database into a MainSeed, in insertion order."""
+        connection = self._connection
+        descriptors = {
+            desc_id: {"name": name, "descriptions": [], "asset_links": []}
+            for desc_id, name in connection.execute("SELECT id, name FROM descriptors ORDER BY id")
+        }
+        assets = {
+            asset_id: {"name": name, "descriptors": []}
+            for asset_id, name in connection.execute("SELECT id, name FROM assets ORDER BY id")
+        }
+
+        rows = connection.execute("SELECT descriptor_id, description FROM descriptions ORDER BY descriptor_id, id")
+        for desc_id, group in groupby(rows, key=lambda row: row[0]):
+            descriptors[desc_id]["descriptions"] = [description for _, description in group]
+        for asset_id, desc_id in connection.execute("SELECT asset_id, descriptor_id FROM links"):
+            assets[asset_id]["descriptors"].append(descriptors[desc_id]["name"])
+            descriptors[desc_id]["asset_links"].append(assets[asset_id]["name"])
+
+        main_seed = MainSeed.model_construct(
+            global_descriptors={i["name"]: Descriptor.construct_trusted(**i) for i in descriptors.values()},
+            global_assets={i["name"]: Asset.construct_trusted(**i) for i in assets.values()},
+        )
+        main_seed._set_global_descriptor_level()  # pylint: disable=protected-access
+        main_seed._set_global_asset_level()  # pylint: disable=protected-access
+        return main_seed
+
+    @property
+    def num_descriptors(self):
+        """Retrieve the number of descriptors in the database"""
+        return self._num_descriptors
+
+    @property
+    def num_assets(self):
+        """Retrieve the number of assets in the database"""
+        return self._num_assets
+
+    @property
+    def global_desc_level_up(self):
+        """True if the number of descriptors is a term of the level sequence"""
+        return MainSeed.level_sequence.contains(self._num_descriptors)
+
+    @property
+    def global_desc_next_fib(self):
+        """The next level term for the number of descriptors"""
+        return MainSeed.level_sequence.next_term(self._num_descriptors)
+
+    @property
+    def global_assets_level_up(self):
+        """True if the number of assets is a term of the level sequence"""
+        return MainSeed.level_sequence.contains(self._num_assets)
+
+    @property
+    def global_assets_next_fib(self):
+        """The next level term for the number of assets"""
+        return MainSeed.level_sequence.next_term(self._num_assets)
+
+    def get_asset(self, asset_name):
+        """Read one asset, with its level calculated from its descriptors.
+
+        Raises:
+            KeyError: If the asset doesn't exist, the same as MainSeed.global_assets.
+        """
+        asset_key = common.normalize_name(asset_name)
+        asset_id = self._get_id(_ASSETS, asset_key)
+        rows = self._connection.execute(
+            "SELECT descriptors.name FROM links JOIN descriptors ON descriptors.id = links.descriptor_id "
+            "WHERE links.asset_id = ?",
+            (asset_id,),
+        )
+        return Asset.construct_trusted(asset_key, [name for (name,) in rows])
+
+    def get_descriptor(self, descriptor_name):
+        """Read one descriptor, with its level calculated from its descriptions.
+
+        Raises:
+            KeyError: If the descriptor doesn't exist, the same as MainSeed.global_descriptors.
+        """
+        descriptor_key = common.normalize_name(descriptor_name)
+        desc_id = self._get_id(_DESCRIPTORS, descriptor_key)
+        descriptions = self._connection.execute(
+            "SELECT description FROM descriptions WHERE descriptor_id = ? ORDER BY id", (desc_id,)
+        )
+        asset_links = self._connection.execute(
+            "SELECT assets.name FROM links JOIN assets ON assets.id = links.asset_id WHERE links.descriptor_id = ?",
+            (desc_id,),
+        )
+        return Descriptor.construct_trusted(
+            descriptor_key,
+            descriptions=[description for (description,) in descriptions],
+            asset_links=[name for (name,) in asset_links],
+        )
+
+    def link_descriptor(self, asset_name, descriptor_name):
+        """Link a descriptor to an asset
+
+        Raises:
+            KeyError: If either one doesn't exist, the same as MainSeed.
+        """
+        asset_id = self._get_id(_ASSETS, common.normalize_name(asset_name))
+        desc_id = self._get_id(_DESCRIPTORS, common.normalize_name(descriptor_name))
+        with self._connection as connection:
+            connection.execute("INSERT OR IGNORE INTO links (asset_id, descriptor_id) VALUES (?, ?)", (asset_id, desc_id))
+
+    def remove_descriptor(self, asset_name, descriptor_name):
+        """Unlink a descriptor from an asset
+
+        Raises:
+            KeyError: If either one doesn't exist, or they aren't linked.
+        """
+        asset_id = self._get_id(_ASSETS, common.normalize_name(asset_name))
+        desc_id = self._get_id(_DESCRIPTORS, common.normalize_name(descriptor_name))
+        with self._connection as connection:
+            cursor = connection.execute("DELETE FROM links WHERE asset_id = ? AND descriptor_id = ?", (asset_id, desc_id))
+        if not cursor.rowcount:
+            raise KeyError(descriptor_name)
+
+    def add_description(self, descriptor_name, description):
+        """Adds a description to a descriptor, creating the descriptor if needed."""
+        descriptor_key = common.normalize_name(descriptor_name)
+        description = self._check_description(description)
+        with self._connection:
+            desc_id, new_descriptor = self._ensure(_DESCRIPTORS, descriptor_key)
+            self._add_description(desc_id, descriptor_key, description)
+        self._num_descriptors += new_descriptor
+
+    def remove_description(self, descriptor_name, description):
+        """Removes a description from a descriptor.
+
+        Raises:
+            KeyError: If the descriptor doesn't exist.
+            ValueError: If the description doesn't exist, the same as Descriptor.remove_description.
+        """
+        desc_id = self._get_id(_DESCRIPTORS, common.normalize_name(descriptor_name))
+        with self._connection as connection:
+            cursor = connection.execute(
+                "DELETE FROM descriptions WHERE descriptor_id = ? AND description = ?", (desc_id, description.lower())
+            )
+        if not cursor.rowcount:
+            raise ValueError(f"{description.lower()!r} not in descriptions")
+
+    def add_description_to_asset(self, asset_name, descriptor_name, description):
+        """Adds a description to an asset, creating the asset and descriptor as needed."""
+        asset_key = common.normalize_name(asset_name)
+        descriptor_key = common.normalize_name(descriptor_name)
+        description = self._check_description(description)
+
+        with self._connection as connection:
+            desc_id, new_descriptor = self._ensure(_DESCRIPTORS, descriptor_key)
+            asset_id, new_asset = self._ensure(_ASSETS, asset_key)
+            self._add_description(desc_id, descriptor_key, description)
+            connection.execute("INSERT OR IGNORE INTO links (asset_id, descriptor_id) VALUES (?, ?)", (asset_id, desc_id))
+        # Counted once the transaction committed, a rollback leaves the counts as they were
+        self._num_descriptors += new_descriptor
+        self._num_assets += new_asset
+
+    def bulk_add_descriptions(self, rows: Iterable[Tuple[str, str, str]], batch_size: int = BATCH_SIZE):
+        """Add (asset_name, descriptor_name, description) rows, the same as add_description_to_asset
+        but with one transaction and a handful of executemany calls per batch. Invalid rows are
+        skipped without aborting the batch.
+
+        Returns:
+            List[Tuple[int, Exception]]: The index and error of every skipped row.
+        """
+        failed = []
+        batch = []
+        for index, row in enumerate(rows):
+            batch.append((index, row))
+            if len(batch) >= batch_size:
+                self._add_batch(batch, failed)
+                batch = []
+        if batch:
+            self._add_batch(batch, failed)
+        return failed
+
+    def asset_relations(self, sibling_name: str):
+        """Determines if an asset relates to another asset via a shared descriptor, with one join
+        over both link indexes.
+
+        Returns:
+            Dict[str, Set[str]]: Every related asset name keyed by the shared descriptor name
+        """
+        try:
+            asset_id = self._get_id(_ASSETS, common.normalize_name(sibling_name))
+        except KeyError:
+            raise errors.AssetNotFound(f"Asset {sibling_name} doesn't exist.") from None
+
+        rows = self._connection.execute(
+            "SELECT descriptors.name, assets.name FROM links AS own "
+            "JOIN links AS other ON other.descriptor_id = own.descriptor_id AND other.asset_id != own.asset_id "
+            "JOIN descriptors ON descriptors.id = own.descriptor_id "
+            "JOIN assets ON assets.id = other.asset_id "
+            "WHERE own.asset_id = ?",
+            (asset_id,),
+        )
+        relations: Dict[str, Set[str]] = {}
+        for descriptor_name, related_name in rows:
+            relations.setdefault(descriptor_name, set()).add(related_name)
+        return relations
+
+    def export_asset_descriptions(self, asset_name) -> List[str]:
+        """Export all descriptions for a given asset in a single list.
+
+        Raises:
+            KeyError: If the asset doesn't exist, the same as MainSeed.
+        """
+        asset_id = self._get_id(_ASSETS, common.normalize_name(asset_name))
+        rows = self._connection.execute(
+            "SELECT descriptions.description FROM links "
+            "JOIN descriptions ON descriptions.descriptor_id = links.descriptor_id "
+            "WHERE links.asset_id = ? ORDER BY links.descriptor_id, descriptions.id",
+            (asset_id,),
+        )
+        return [description for (description,) in rows]
+
+    def _scalar(self, query: str, parameters=()):
+        return self._connection.execute(query, parameters).fetchone()[0]
+
+    def _get_id(self, table: str, name: str):
+        """The row ID of a canonical name, or KeyError."""
+        row = self._connection.execute(f"SELECT id FROM {table} WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return row[0]
+
+    def _get_ids(self, table: str, names: Iterable[str]):
+        """Map canonical names to their row IDs, a chunk of names per query."""
+        names = list(names)
+        ids = {}
+        for start in range(0, len(names), _MAX_VARIABLES):
+            chunk = names[start : start + _MAX_VARIABLES]
+            placeholders = ",".join("?" * len(chunk))
+            ids.update(
+                (name, row_id)
+                for row_id, name in self._connection.execute(
+                    f"SELECT id, name FROM {table} WHERE name IN ({placeholders})", chunk
+                )
+            )
+        return ids
+
+    def _ensure(self, table: str, name: str):
+        """The row ID of a canonical name, inserted if it doesn't exist yet.
+
+        Returns:
+            Tuple[int, int]: The row ID, and 1 if it was inserted or 0 if it existed. The caller
+                adds the second to its count once the transaction has committed.
+        """
+        cursor = self._connection.execute(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", (name,))
+        if not cursor.rowcount:
+            return self._get_id(table, name), 0
+        return cursor.lastrowid, 1
+
+    @staticmethod
+    def _check_description(description: str):
+        """Lowercase a description, checking its word count the same as Descriptor.add_description."""
+        if not common.is_fibonacci(common.get_num_words(description)):
+            raise errors.FailedDescriptionLength("Required Fibonacci length for the description")
+        return description.lower()
+
+    def _add_description(self, desc_id: int, descriptor_key: str, description: str):
+        cursor = self._connection.execute(
+            "INSERT OR IGNORE INTO descriptions (descriptor_id, description) VALUES (?, ?)", (desc_id, description)
+        )
+        if not cursor.rowcount:
+            logger.info("Description: %s has already been added to this descriptor: %s", description, descriptor_key)
+
+    def _add_batch(self, batch: List[tuple], failed: List[tuple]):
+        """Validate and insert one batch of indexed rows, appending skipped rows to failed."""
+        valid, batch_failed = validate_rows(batch)
+        failed.extend(batch_failed)
+
+        asset_names = dict.fromkeys(asset_key for asset_key, _, _ in valid)
+        descriptor_names = dict.fromkeys(descriptor_key for _, descriptor_key, _ in valid)
+        with self._connection as connection:
+            new_descriptors = connection.executemany(
+                "INSERT OR IGNORE INTO descriptors (name) VALUES (?)", ((i,) for i in descriptor_names)
+            ).rowcount
+            new_assets = connection.executemany(
+                "INSERT OR IGNORE INTO assets (name) VALUES (?)", ((i,) for i in asset_names)
+            ).rowcount
+
+            # Resolve every name of the batch once, rather than once per inserted row
+            asset_ids = self._get_ids(_ASSETS, asset_names)
+            desc_ids = self._get_ids(_DESCRIPTORS, descriptor_names)
+            connection.executemany(
+                "INSERT OR IGNORE INTO descriptions (descriptor_id, description) VALUES (?, ?)",
+                ((desc_ids[desc], description) for _, desc, description in valid),
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO links (asset_id, descriptor_id) VALUES (?, ?)",
+                dict.fromkeys((asset_ids[asset], desc_ids[desc]) for asset, desc, _ in valid),
+            )
+
+        self._num_descriptors += new_descriptors
+        self._num_assets += new_assets
@@ -0,0 +1,79 @@
+"""NumPy versions of the level sequence helpers, for validating or re-leveling whole
+worlds in one pass instead of one Python int at a time.
+
+Requires numpy, which is an optional dependency of this package."""
+
+from typing import Dict
+
+try:
+    import numpy as np  # pylint: disable=import-error
+except ImportError as ex:  # pragma: no cover
+    raise ImportError("seed.vectorized requires numpy, install it with: pip install seed[fast]") from ex
+
+from seed.sequences import FIBONACCI, LevelSequence
+
+# Precomputed term arrays per sequence, regrown when a larger count shows up
+_TERM_ARRAYS: Dict[LevelSequence, np.ndarray] = {}
+
+
+def _term_array(sequence: LevelSequence, largest: int):
+    """Get the sorted terms of sequence as an int64 array, reaching past largest."""
+    terms = _TERM_ARRAYS.get(sequence)
+    if terms is None or terms[-1] <= largest:
+        terms = np.asarray(sequence.terms_through(largest), dtype=np.int64)
+        _TERM_ARRAYS[sequence] = terms
+    return terms
+
+
+def level_contains(counts, sequence: LevelSequence = FIBONACCI):
+    """Vectorized LevelSequence.contains.
+
+    Args:
+        counts (array_like): Integer counts to check.
+        sequence (LevelSequence): The sequence to check against.
+
+    Returns:
+        np.ndarray: Boolean array, True where the count is a term of the sequence.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    if counts.size == 0:
+        return np.zeros(counts.shape, dtype=bool)
+
+    terms = _term_array(sequence, int(counts.max()))
+    index = np.searchsorted(terms, counts, side="left")
+    np.minimum(index, len(terms) - 1, out=index)
+    return terms[index] == counts
+
+
+def level_next_term(counts, sequence: LevelSequence = FIBONACCI):
+    """Vectorized LevelSequence.next_term.
+
+    Args:
+        counts (array_like): Integer counts to find thresholds for.
+        sequence (LevelSequence): The sequence to look up.
+
+    Returns:
+        np.ndarray: int64 array of the first term strictly greater than each count.
+
+    Raises:
+        ValueError: If a finite sequence has no term greater than one of the counts.
+    """
+    counts = np.maximum(np.asarray(counts, dtype=np.int64), 0)
+    if counts.size == 0:
+        return np.zeros(counts.shape, dtype=np.int64)
+
+    largest = int(counts.max())
+    terms = _term_array(sequence, largest)
+    if terms[-1] <= largest:
+        raise ValueError(f"{sequence.name} sequence has no term greater than {largest}")
+    return terms[np.searchsorted(terms, counts, side="right")]
+
+
+def is_fibonacci(counts):
+    """Vectorized seed.common.is_fibonacci for non-negative integer arrays."""
+    return level_contains(counts, FIBONACCI)
+
+
+def get_next_fibonacci(counts):
+    """Vectorized seed.common.get_next_fibonacci for integer arrays."""
+    return level_next_term(counts, FIBONACCI)
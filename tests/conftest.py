@@ -59,3 +59,11 @@ def invalid_assets_level_up_json():
     # Load JSON data from file
     with open(json_file_path, 'r') as file:
         yield file.read()
+
+@pytest.fixture(scope="session")
+def duplicate_names_json():
+    json_file_path = f"{test_folder}/data/duplicate_names.json"
+
+    # Load JSON data from file
+    with open(json_file_path, 'r') as file:
+        yield file.read()
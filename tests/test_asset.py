@@ -112,4 +112,12 @@ def test_invalid_basic_asset():
     assert not model_to_validate.level_up
     assert model_to_validate.num_descriptors == 4
     assert model_to_validate.name == name.lower()
-    assert len([i for i in descriptors if i.lower() in model_to_validate.descriptors]) == len(descriptors)
\ No newline at end of file
+    assert len([i for i in descriptors if i.lower() in model_to_validate.descriptors]) == len(descriptors)
+
+def test_descriptors_collapse_before_levels():
+    """ Descriptors differing only by case are one descriptor, and levels count them once. """
+    asset = Asset(name="X", descriptors={"A", "a"})
+    assert asset.name == "x"
+    assert asset.descriptors == {"a"}
+    assert asset.next_fib == 2
+    assert asset.level_up == True
@@ -44,3 +44,66 @@ def test_get_fibonacci():
 
     with pytest.raises(ValueError):
         common.get_fibonacci(-1)
+
+def test_get_fibonacci_large():
+    # Known values, both sides of the cached table limit
+    assert common.get_fibonacci(50) == 12586269025
+    assert common.get_fibonacci(100) == 354224848179261915075
+
+    # Fast-doubling must agree with the table past its limit
+    a, b = 0, 1
+    for _ in range(1500):
+        a, b = b, a + b
+    assert common.get_fibonacci(1500) == a
+    assert common.get_fibonacci(1501) == b
+
+def test_next_and_prev_fibonacci_large():
+    f50 = common.get_fibonacci(50)
+    f51 = common.get_fibonacci(51)
+
+    assert common.get_next_fibonacci(f50) == f51
+    assert common.get_next_fibonacci(f50 + 1) == f51
+    assert common.get_prev_fibonacci(f51) == f50
+    assert common.get_prev_fibonacci(f50 + 1) == f50
+
+def test_is_fibonacci_large():
+    # 5*n*n+4 is well past 2**53 here, where a float square root loses precision
+    for index in [80, 100, 500, 1024, 1025, 2000]:
+        fib = common.get_fibonacci(index)
+        assert common.is_fibonacci(fib)
+        assert not common.is_fibonacci(fib + 1)
+        assert not common.is_fibonacci(fib - 1)
+
+def test_is_fibonacci_many():
+    values = [-1, 0, 1, 2, 4, 13, 20, 34, 100, common.get_fibonacci(90)]
+    expected = [common.is_fibonacci(n) for n in values]
+
+    assert common.is_fibonacci_many(values) == expected
+    assert common.is_fibonacci_many(iter(values)) == expected
+    assert common.is_fibonacci_many([]) == []
+
+    # Values past the cached table fall back to the exact square root test
+    huge = common.get_fibonacci(3000)
+    assert common.is_fibonacci_many([huge, huge + 1, 3]) == [True, False, True]
+
+def test_get_num_words():
+    assert common.get_num_words("blue") == 1
+    assert common.get_num_words("blue haired woman in bar") == 5
+
+    # Leading, trailing and repeated white space are not words
+    assert common.get_num_words("  blue \t haired\nwoman  ") == 3
+    assert common.get_num_words("") == 0
+    assert common.get_num_words(" \t\n") == 0
+
+    # Non-ASCII descriptions count the same way
+    assert common.get_num_words(" café crème brûlée ") == 3
+    assert common.get_num_words("naïve") == 1
+
+    long_description = "lorem ipsum dolor sit amet " * 500
+    assert common.get_num_words(long_description) == len(long_description.split())
+
+def test_count_words_many():
+    descriptions = ["blue", " blue hair ", "", "blue haired woman", "crème brûlée"]
+    assert common.count_words_many(descriptions) == [1, 2, 0, 3, 2]
+    assert common.count_words_many(iter(descriptions)) == [1, 2, 0, 3, 2]
+    assert common.count_words_many([]) == []
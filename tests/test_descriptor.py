@@ -154,3 +154,47 @@ def test_non_strict():
     assert model_to_validate.num_descriptions == 4
     assert model_to_validate.name == name.lower()
     assert len([i for i in descriptions if i.lower() in model_to_validate.descriptions]) == len(descriptions)
+
+def test_descriptions_round_trip():
+    descriptions = ["zebra", "apple", "blue hair", "middle aged man"]
+    descriptor = Descriptor(name="ordered", descriptions=descriptions)
+
+    # Insertion order survives dumping and loading
+    dumped = descriptor.model_dump_json()
+    assert json.loads(dumped)["descriptions"] == ["zebra", "apple", "blue hair"] + ["middle aged man"]
+    assert Descriptor.model_validate_json(dumped).model_dump_json() == dumped
+    assert descriptor.model_dump()["descriptions"] == descriptions
+    assert descriptor.descriptions == descriptions
+    assert Descriptor.model_validate(descriptor.model_dump()) == descriptor
+    assert list(descriptor.descriptions) == descriptions
+    assert repr(descriptor.descriptions) == f"DescriptionStore({descriptions!r})"
+
+    # Indexing, slicing and reversing behave like the list
+    for index in range(-len(descriptions), len(descriptions)):
+        assert descriptor.descriptions[index] == descriptions[index]
+    assert descriptor.descriptions[1:3] == descriptions[1:3]
+    assert descriptor.descriptions[::-1] == descriptions[::-1]
+    assert list(reversed(descriptor.descriptions)) == descriptions[::-1]
+    for index in (len(descriptions), -len(descriptions) - 1):
+        with pytest.raises(IndexError):
+            descriptor.descriptions[index]
+    with pytest.raises(TypeError):
+        descriptor.descriptions["zebra"]
+
+def test_description_store_dedup():
+    descriptor = Descriptor(name="dedup", descriptions=["red", "Red", "blue"])
+    assert descriptor.descriptions == ["red", "blue"]
+    assert descriptor.next_fib == 3
+
+    # Duplicates are ignored, levels only follow unique descriptions
+    descriptor.add_description("RED")
+    assert descriptor.num_descriptions == 2
+    descriptor.descriptions.extend(["blue", "green", "red"])
+    assert descriptor.descriptions == ["red", "blue", "green"]
+
+    # Removal keeps the order of everything else
+    descriptor.remove_description("blue")
+    assert descriptor.descriptions == ["red", "green"]
+    assert descriptor.descriptions != ("red", "green")
+    with pytest.raises(ValueError):
+        descriptor.remove_description("blue")
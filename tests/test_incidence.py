@@ -0,0 +1,125 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from seed.incidence import IncidenceMatrix
+from seed.models.main_seed import MainSeed
+
+
+@pytest.fixture(scope="function")
+def test_seed(basic_json):
+    main_seed = MainSeed.model_validate_json(basic_json)
+    main_seed.add_description_to_asset("character1", "eyes", "bright blue eyes")
+    yield main_seed
+
+
+def expected_dense(main_seed, matrix):
+    dense = np.zeros(matrix.shape, dtype=np.uint8)
+    for asset_name, asset in main_seed.global_assets.items():
+        for descriptor_name in asset.descriptors:
+            if descriptor_name in matrix.descriptor_ids:
+                dense[matrix.asset_ids[asset_name], matrix.descriptor_ids[descriptor_name]] = 1
+    return dense
+
+
+def assert_matches(main_seed, matrix):
+    assert matrix.shape == (main_seed.num_assets, main_seed.num_descriptors)
+    assert (matrix.to_dense() == expected_dense(main_seed, matrix)).all()
+    for name, desc in main_seed.global_descriptors.items():
+        assert matrix.word_counts(name).tolist() == [len(i.split()) for i in desc.descriptions]
+    for row in range(len(matrix.asset_names)):
+        indices = matrix.indices[matrix.indptr[row] : matrix.indptr[row + 1]]
+        assert (np.diff(indices) > 0).all()
+
+
+def test_from_main_seed(test_seed):
+    matrix = IncidenceMatrix.from_main_seed(test_seed)
+    assert_matches(test_seed, matrix)
+    assert matrix.indptr.dtype == np.int64
+    assert matrix.indices.dtype == np.int32
+    assert matrix.nnz == sum(len(i.descriptors) for i in test_seed.global_assets.values())
+    assert [matrix.descriptor_names[i] for i in matrix.row("Character1")] == sorted(
+        test_seed.global_assets["character1"].descriptors, key=matrix.descriptor_ids.get
+    )
+    assert matrix.word_counts("eyes").tolist() == [3]
+
+    empty = IncidenceMatrix.from_main_seed(MainSeed())
+    assert empty.shape == (0, 0)
+    assert empty.to_dense().shape == (0, 0)
+
+
+def test_update(test_seed):
+    matrix = IncidenceMatrix.from_main_seed(test_seed)
+    asset_names, descriptor_names = list(matrix.asset_names), list(matrix.descriptor_names)
+    assert matrix.update(test_seed) == 0
+
+    test_seed.add_description_to_asset("new asset", "new descriptor", "one two three")
+    test_seed.add_description("eyes", "green")
+    test_seed.remove_descriptor("character1", "eyes")
+    test_seed.add_description("unlinked", "red")
+    assert matrix.update(test_seed) >= 2
+    assert_matches(test_seed, matrix)
+
+    # IDs never move, new names are appended
+    assert matrix.asset_names[: len(asset_names)] == asset_names
+    assert matrix.descriptor_names[: len(descriptor_names)] == descriptor_names
+    assert matrix.asset_names[-1] == "new asset"
+    assert matrix.update(test_seed) == 0
+
+
+def test_save_load(test_seed, tmp_path):
+    matrix = IncidenceMatrix.from_main_seed(test_seed)
+    path = str(tmp_path / "world.npz")
+    matrix.save(path)
+
+    for mmap in (True, False):
+        loaded = IncidenceMatrix.load(path, mmap=mmap)
+        assert isinstance(loaded.indices, np.memmap) == mmap
+        assert loaded.asset_names == matrix.asset_names
+        assert loaded.descriptor_ids == matrix.descriptor_ids
+        assert loaded.epoch == test_seed.epoch
+        for name in ("indptr", "indices", "description_indptr", "description_word_counts", "asset_versions", "descriptor_versions"):
+            assert np.array_equal(getattr(loaded, name), getattr(matrix, name))
+
+        # A memory mapped matrix is read only, update replaces the arrays
+        test_seed.add_description_to_asset("character1", "hair", "long")
+        loaded.update(test_seed)
+        assert_matches(test_seed, loaded)
+
+    np.savez_compressed(path, **{name: getattr(matrix, name) for name in ("indptr",)})
+    with pytest.raises(ValueError):
+        IncidenceMatrix.load(path)
+
+
+def test_update_after_reload():
+    main_seed = MainSeed()
+    main_seed.add_description_to_asset("a", "eyes", "blue")
+    main_seed.add_description("hair", "long")
+    matrix = IncidenceMatrix.from_main_seed(main_seed)
+    assert matrix.epoch == main_seed.epoch
+    assert main_seed.asset_version("a") == 1
+
+    # Versions start over on a reload, the new epoch still exports the changed row
+    reloaded = MainSeed.model_validate_json(main_seed.model_dump_json())
+    assert reloaded.epoch != main_seed.epoch
+    reloaded.link_descriptor("a", "hair")
+    assert reloaded.asset_version("a") == 1
+    matrix.update(reloaded)
+    assert_matches(reloaded, matrix)
+    assert sorted(matrix.row("a").tolist()) == [matrix.descriptor_ids["eyes"], matrix.descriptor_ids["hair"]]
+
+
+def test_update_unlinked_descriptions(test_seed):
+    test_seed.add_description("lonely", "one")
+    matrix = IncidenceMatrix.from_main_seed(test_seed)
+    assert matrix.update(test_seed) == 0
+
+    # Descriptors without assets are refreshed through their own versions
+    test_seed.add_description("lonely", "one two")
+    test_seed.bulk_add_descriptions([("character1", "eyes", "green")])
+    assert matrix.update(test_seed) == 1
+    assert matrix.word_counts("lonely").tolist() == [1, 2]
+    assert_matches(test_seed, matrix)
+    test_seed.remove_description("lonely", "one")
+    matrix.update(test_seed)
+    assert matrix.word_counts("lonely").tolist() == [2]
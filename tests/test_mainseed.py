@@ -3,7 +3,9 @@ import pytest
 import random
 
 from pydantic_core import from_json
+from seed.models import Asset, Descriptor
 from seed.models.main_seed import MainSeed
+from seed.models.memories import Memories
 from seed import common, errors
 
 pytestmark = pytest.mark.asset
@@ -102,8 +104,8 @@ def test_adding_description(test_seed: MainSeed, test_seed_dict: dict):
 
     # Add a description with a new descriptor keeping global_desc_next_fib == 5
     test_seed.add_description(missing_desc_name, "test2 test2")
-    assert test_seed.global_descriptors[missing_desc_name].level_up
-    assert test_seed.global_descriptors[missing_desc_name].next_fib == 2
+    assert test_seed.global_descriptors[missing_desc_name.lower()].level_up
+    assert test_seed.global_descriptors[missing_desc_name.lower()].next_fib == 2
     assert len(test_seed.global_descriptors) == 4
     assert test_seed.global_desc_next_fib == 5
 
@@ -216,8 +218,11 @@ def test_asset_relation(test_seed: MainSeed, test_seed_dict: dict):
     a2_relations = test_seed.asset_relations(asset_two_name)
 
     # Validate relationship via desc_one_name
-    assert a1_relations[desc_one_name] == asset_two_name
-    assert a2_relations[desc_one_name] == asset_one_name
+    assert a1_relations[desc_one_name] == {asset_two_name}
+    assert a2_relations[desc_one_name] == {asset_one_name}
+
+    # desc_two_name is only linked to asset_two so it isn't a relation
+    assert desc_two_name not in a2_relations
 
     # The descriptor should have mutiple links now and continue to not be dangling
     assert not test_seed.global_descriptors[desc_one_name].is_dangling()
@@ -347,3 +352,466 @@ def test_invalid_assets(invalid_assets_next_fib_json, invalid_assets_level_up_js
 
     # Test Assets level up
     MainSeed.model_validate_json(invalid_assets_level_up_json)
+
+
+def test_asset_relations_all_related_assets():
+    test_seed = MainSeed()
+    for asset_name in ["brother", "sister", "cousin"]:
+        test_seed.add_description_to_asset(asset_name, "sibling", f"{asset_name} of mine")
+    test_seed.add_description_to_asset("cousin", "family", "distant")
+    test_seed.add_description_to_asset("brother", "family", "close")
+
+    # Every related asset is returned per shared descriptor
+    assert test_seed.asset_relations("brother") == {"sibling": {"sister", "cousin"}, "family": {"cousin"}}
+    assert test_seed.asset_relations("sister") == {"sibling": {"brother", "cousin"}}
+
+    # Unlinking keeps the reverse index in step
+    test_seed.remove_descriptor("cousin", "sibling")
+    assert "cousin" not in test_seed.global_descriptors["sibling"].asset_links
+    assert "sibling" not in test_seed.global_assets["cousin"].descriptors
+    assert test_seed.asset_relations("brother") == {"sibling": {"sister"}, "family": {"cousin"}}
+    assert test_seed.asset_relations("cousin") == {"family": {"brother"}}
+
+
+def test_asset_links_sanitized(test_seed_dict: dict):
+    # Asset descriptors are the source of truth for descriptor asset_links
+    test_seed_dict["global_assets"]["character1"]["descriptors"] = ["desc1", "desc2"]
+    test_seed_dict["global_assets"]["setting1"]["descriptors"] = ["desc1"]
+    test_seed_dict["global_descriptors"]["desc3"]["asset_links"] = ["setting1"]
+
+    test_seed = MainSeed.model_validate(test_seed_dict)
+    assert test_seed.global_descriptors["desc1"].asset_links == {"character1", "setting1"}
+    assert test_seed.global_descriptors["desc2"].asset_links == {"character1"}
+    assert test_seed.global_descriptors["desc3"].asset_links == set()
+    assert test_seed.asset_relations("setting1") == {"desc1": {"character1"}}
+
+    test_seed_dict["strict"] = True
+    with pytest.raises(errors.SeedValidationException):
+        MainSeed.model_validate(test_seed_dict)
+
+
+def test_remove_description():
+    test_seed = MainSeed()
+    test_seed.add_description_to_asset("billy", "soldier", "middle-aged")
+    test_seed.add_description_to_asset("billy", "soldier", "tired eyes")
+    assert test_seed.global_descriptors["soldier"].next_fib == 3
+
+    test_seed.remove_description("soldier", "Middle-Aged")
+    assert test_seed.global_descriptors["soldier"].descriptions == ["tired eyes"]
+    assert test_seed.global_descriptors["soldier"].next_fib == 2
+    assert test_seed.export_asset_descriptions("billy") == ["tired eyes"]
+
+
+def test_level_listener():
+    test_seed = MainSeed()
+    events = []
+    test_seed.add_level_listener(lambda *event: events.append(event))
+
+    for index in range(9):
+        test_seed._ensure_asset(f"asset{index}")
+        # Re-ensuring an existing asset never fires or changes the level
+        test_seed._ensure_asset(f"asset{index}")
+        assert test_seed.global_assets_level_up == common.is_fibonacci(index + 1)
+        assert test_seed.global_assets_next_fib == common.get_next_fibonacci(index + 1)
+
+    assert events == [("assets", 1, 2), ("assets", 2, 3), ("assets", 3, 5), ("assets", 5, 8), ("assets", 8, 13)]
+
+    # Descriptors report their own scope
+    events.clear()
+    test_seed.add_description_to_asset("asset0", "desc0", "blue")
+    test_seed.add_description_to_asset("asset0", "desc0", "red")
+    assert events == [("descriptors", 1, 2)]
+
+    # No more events once removed
+    events.clear()
+    test_seed.remove_level_listener(test_seed._level_listeners[0])
+    test_seed._ensure_descriptor("desc1")
+    assert events == []
+    assert test_seed.global_desc_level_up
+    assert test_seed.global_desc_next_fib == 3
+
+
+def test_names_normalized_and_interned():
+    test_seed = MainSeed()
+    test_seed.add_description_to_asset("BiLLy", "SoLDier", "tired eyes")
+    test_seed.link_descriptor("billy", "SOLDIER")
+    test_seed.add_description("Soldier", "old")
+
+    assert list(test_seed.global_assets) == ["billy"]
+    assert list(test_seed.global_descriptors) == ["soldier"]
+    assert test_seed.export_asset_descriptions("BILLY") == ["tired eyes", "old"]
+    assert test_seed.asset_relations("Billy") == {}
+
+    # Keys, names and links share a single string object per name
+    key = next(iter(test_seed.global_assets))
+    descriptor = test_seed.global_descriptors["soldier"]
+    assert test_seed.global_assets["billy"].name is key
+    assert next(iter(descriptor.asset_links)) is key
+    assert next(iter(test_seed.global_assets["billy"].descriptors)) is descriptor.name
+
+    test_seed.remove_descriptor("BILLY", "Soldier")
+    assert descriptor.is_dangling()
+
+    # Loaded files are keyed by canonical names, links included
+    loaded = MainSeed.model_validate(
+        {
+            "global_descriptors": {"Sibling": {"name": "Sibling", "asset_links": ["Brother"]}},
+            "global_assets": {"BROTHER": {"name": "Brother", "descriptors": ["SIBLING"]}},
+        }
+    )
+    assert list(loaded.global_assets) == ["brother"]
+    assert loaded.global_descriptors["sibling"].asset_links == {"brother"}
+    assert loaded.global_descriptors["sibling"].name is loaded.global_assets["brother"].descriptors.copy().pop()
+
+
+
+def test_duplicate_names_merged(duplicate_names_json):
+    # Keys that only match once normalized are merged, not dropped, and the levels follow
+    loaded = MainSeed.model_validate_json(duplicate_names_json)
+    assert list(loaded.global_descriptors) == ["eyes", "hair"]
+    assert loaded.global_descriptors["eyes"].descriptions == ["blue", "grey", "green"]
+    assert loaded.global_descriptors["eyes"].level_up and loaded.global_descriptors["eyes"].next_fib == 5
+    assert loaded.global_assets == {"billy": Asset(name="billy", descriptors={"eyes", "hair"})}
+    assert loaded.global_descriptors["hair"].asset_links == {"billy"}
+    assert (loaded.global_desc_next_fib, loaded.global_desc_level_up) == (3, True)
+    assert (loaded.global_assets_next_fib, loaded.global_assets_level_up) == (2, True)
+    assert loaded.description_pool.refs("blue") == 1
+
+    strict_json = json.loads(duplicate_names_json)
+    strict_json["strict"] = True
+    with pytest.raises(errors.SeedValidationException):
+        MainSeed.model_validate(strict_json)
+
+def test_trusted_load(test_seed: MainSeed):
+    test_seed.add_description_to_asset("billy", "soldier", "tired eyes")
+    test_seed.add_description_to_asset("billy", "desc1", "old")
+    test_seed.add_description_to_asset("character1", "desc1", "young")
+    dumped = test_seed.model_dump_json()
+
+    trusted = MainSeed.load(dumped, trusted=True)
+    assert trusted == MainSeed.load(dumped)
+    assert trusted.model_dump_json() == dumped
+    assert isinstance(trusted.global_descriptors["desc1"].descriptions, type(test_seed.global_descriptors["desc1"].descriptions))
+    assert trusted.asset_relations("billy") == {"desc1": {"character1"}}
+
+    # Trusted seeds keep working as usual afterwards
+    events = []
+    trusted.add_level_listener(lambda *event: events.append(event))
+    trusted.add_description_to_asset("setting2", "desc4", "dark")
+    assert events == [("descriptors", 5, 8)]
+    assert trusted.global_assets["setting2"] == Asset(name="setting2", descriptors={"desc4"})
+    assert trusted.global_descriptors["desc4"] == Descriptor(name="desc4", descriptions=["dark"], asset_links={"setting2"})
+
+
+def test_construct_trusted():
+    # Levels are calculated when not given
+    assert Asset.construct_trusted("billy") == Asset(name="billy")
+    assert Asset.construct_trusted("billy", ["a", "b"]) == Asset(name="billy", descriptors={"a", "b"})
+    assert Descriptor.construct_trusted("soldier", descriptions=["blue"]) == Descriptor(name="soldier", descriptions=["blue"])
+
+    # Given levels are trusted as they are
+    assert Asset.construct_trusted("billy", ["a", "b"], next_fib=8, level_up=False).next_fib == 8
+
+
+def test_lazy_load(test_seed: MainSeed):
+    test_seed.add_description_to_asset("billy", "soldier", "tired eyes")
+    test_seed.add_description_to_asset("character1", "soldier", "young")
+    dumped = test_seed.model_dump_json()
+
+    for trusted in (False, True):
+        lazy = MainSeed.load(dumped, trusted=trusted, lazy=True)
+
+        # Counts, names and levels are there before anything is hydrated
+        assert lazy.num_assets == 3
+        assert lazy.num_descriptors == 4
+        assert list(lazy.global_assets) == list(test_seed.global_assets)
+        assert "billy" in lazy.global_assets
+        assert lazy.global_desc_next_fib == test_seed.global_desc_next_fib
+        assert lazy.global_assets_level_up == test_seed.global_assets_level_up
+        assert lazy.global_assets.num_hydrated == 0
+        assert repr(lazy.global_assets) == "LazyModels(0/3 hydrated)"
+
+        # Entries are hydrated on first access only
+        assert lazy.asset_relations("billy") == {"soldier": {"character1"}}
+        assert lazy.global_assets.is_hydrated("billy")
+        assert not lazy.global_assets.is_hydrated("setting1")
+        assert lazy.global_descriptors["soldier"] is lazy.global_descriptors["soldier"]
+
+        # Mutations work on the lazy mappings, dumping hydrates the rest
+        lazy.add_description_to_asset("setting1", "desc4", "dark")
+        assert lazy.num_descriptors == 5
+        assert MainSeed.load(lazy.model_dump_json()) == lazy
+        assert lazy == MainSeed.load(lazy.model_dump_json())
+        del lazy.global_assets["setting1"]
+        assert lazy.num_assets == 2
+
+
+def test_lazy_load_validation(test_seed_dict: dict):
+    test_seed_dict["global_descriptors"]["desc2"]["descriptions"] = ["four words long here"]
+    test_seed_dict["global_assets_next_fib"] = 8
+
+    # Global levels are sanitized immediately, entries only when accessed
+    lazy = MainSeed.load(json.dumps(test_seed_dict), lazy=True)
+    assert lazy.global_assets_next_fib == 3
+    assert lazy.global_descriptors["desc1"].next_fib == 1
+    with pytest.raises(errors.FailedDescriptionLength):
+        lazy.global_descriptors["desc2"]
+
+    test_seed_dict["strict"] = True
+    with pytest.raises(errors.SeedValidationException):
+        MainSeed.load(json.dumps(test_seed_dict), lazy=True)
+
+
+def test_bulk_add_descriptions(test_seed: MainSeed):
+    rows = [
+        ("Character1", "Eyes", "Blue"),
+        ("character1", "eyes", "blue"),
+        ("setting1", "EYES", "green"),
+        ("setting1", "desc1", "one two three four"),
+        ("new asset", None, "red"),
+        ("new asset", "hair", "long hair"),
+        "not a row",
+    ]
+    expected = test_seed.model_copy(deep=True)
+    for index in (0, 1, 2, 5):
+        expected.add_description_to_asset(*rows[index])
+
+    events = []
+    test_seed.add_level_listener(lambda *event: events.append(event))
+    failed = test_seed.bulk_add_descriptions(rows)
+
+    assert [index for index, _ in failed] == [3, 4, 6]
+    assert isinstance(failed[0][1], errors.FailedDescriptionLength)
+    assert test_seed.model_dump() == expected.model_dump()
+    assert test_seed.global_descriptors["eyes"].descriptions == ["blue", "green"]
+    assert test_seed.global_descriptors["eyes"].asset_links == {"character1", "setting1"}
+
+    # Every global level term passed is still reported, once
+    assert [event[0] for event in events] == ["descriptors", "assets"]
+    assert test_seed.bulk_add_descriptions([]) == []
+
+
+def test_description_pool(test_seed: MainSeed):
+    test_seed.add_description_to_asset("character1", "eyes", "blue hair")
+    test_seed.add_description_to_asset("character1", "hair", "Blue Hair")
+    test_seed.add_description_to_asset("setting1", "hair", "long")
+
+    # Both descriptors hold the same string object
+    pool = test_seed.description_pool
+    eyes, hair = test_seed.global_descriptors["eyes"], test_seed.global_descriptors["hair"]
+    assert next(iter(eyes.descriptions)) is next(iter(hair.descriptions))
+    assert pool.refs("blue hair") == 2
+
+    exported = test_seed.export_asset_descriptions("character1")
+    unique = test_seed.export_asset_descriptions("character1", unique=True)
+    assert exported.count("blue hair") == 2
+    assert unique.count("blue hair") == 1
+    assert sorted(set(exported)) == sorted(unique)
+
+    # The last reference drops the description from the pool
+    test_seed.remove_description("hair", "blue hair")
+    test_seed.remove_description("eyes", "BLUE HAIR")
+    assert "blue hair" not in pool
+    assert pool.refs("long") == 1
+
+    # Acquiring the pooled string itself is another reference as well
+    handle = pool.acquire("long")
+    assert pool.refs("long") == 2
+    # The pool is runtime state, seeds compare by their fields only
+    assert test_seed == MainSeed.model_validate_json(test_seed.model_dump_json())
+    pool.release(handle)
+    assert pool.refs("long") == 1
+
+    # Loaders share descriptions the same way, lazily loaded descriptors as they are hydrated
+    loaded = MainSeed.model_validate_json(test_seed.model_dump_json())
+    assert loaded.description_pool.refs("long") == 1
+    lazy = MainSeed.load(test_seed.model_dump_json(), lazy=True)
+    assert "long" not in lazy.description_pool
+    lazy.global_descriptors["hair"]
+    assert lazy.description_pool.refs("long") == 1
+
+
+def test_export_cache(test_seed: MainSeed):
+    test_seed.add_description_to_asset("character1", "eyes", "blue")
+    test_seed.add_description_to_asset("setting1", "eyes", "green")
+    exported = test_seed.export_asset_descriptions("character1")
+    assert list(test_seed.iter_asset_descriptions("Character1")) == exported
+
+    # Unchanged assets are served from the cache, a copy each time
+    version = test_seed.asset_version("character1")
+    exported.append("mutated")
+    assert test_seed.export_asset_descriptions("character1") == exported[:-1]
+
+    # Every edit that changes an export bumps the version of each asset exporting it
+    for edit in (
+        lambda: test_seed.add_description("eyes", "brown"),
+        lambda: test_seed.remove_description("eyes", "brown"),
+        lambda: test_seed.link_descriptor("character1", "desc2"),
+        lambda: test_seed.remove_descriptor("character1", "desc2"),
+        lambda: test_seed.bulk_add_descriptions([("setting1", "eyes", "grey")]),
+    ):
+        versions = test_seed.asset_version("character1"), test_seed.asset_version("setting1")
+        edit()
+        assert test_seed.asset_version("character1") > versions[0]
+        assert test_seed.export_asset_descriptions("character1") == list(test_seed.iter_asset_descriptions("character1"))
+    assert "grey" in test_seed.export_asset_descriptions("character1")
+    assert test_seed.asset_version("character1") > version
+
+    # Duplicates and unrelated edits don't invalidate anything
+    version = test_seed.asset_version("character1")
+    test_seed.add_description("eyes", "BLUE")
+    test_seed.link_descriptor("character1", "eyes")
+    test_seed.add_description("desc2", "red")
+    assert test_seed.asset_version("character1") == version
+
+    # Descriptors have versions of their own, changed only by their descriptions
+    version = test_seed.descriptor_version("Eyes")
+    test_seed.add_description("eyes", "hazel")
+    test_seed.link_descriptor("setting1", "desc2")
+    assert test_seed.descriptor_version("eyes") > version
+    assert test_seed.descriptor_versions["eyes"] == test_seed.descriptor_version("eyes")
+    assert test_seed.asset_versions["character1"] == test_seed.asset_version("character1")
+    with pytest.raises(TypeError):
+        test_seed.asset_versions["character1"] = 0
+
+    test_seed.clear_export_cache()
+    assert test_seed.export_asset_descriptions("character1", unique=True) == list(test_seed.iter_asset_descriptions("character1"))
+    assert test_seed == MainSeed.model_validate_json(test_seed.model_dump_json())
+
+
+def relation_memories(main_seed: MainSeed):
+    """Memories found by walking asset_relations, the slow way."""
+    memories, seen = [], set()
+    for start in main_seed.global_assets:
+        if start in seen:
+            continue
+        memory, pending = set(), [start]
+        while pending:
+            asset_name = pending.pop()
+            if asset_name not in memory:
+                memory.add(asset_name)
+                pending.extend(set().union(*main_seed.asset_relations(asset_name).values()))
+        seen |= memory
+        memories.append(memory)
+    return sorted(memories, key=lambda memory: (-len(memory), sorted(memory)))
+
+
+def test_memories(test_seed: MainSeed):
+    def assert_memories():
+        memories = test_seed.memories()
+        assert sorted(memories, key=lambda memory: (-len(memory), sorted(memory))) == relation_memories(test_seed)
+        assert test_seed.memory_sizes() == [len(memory) for memory in memories]
+        for memory in memories:
+            for asset_name in memory:
+                assert test_seed.asset_memory(asset_name) == memory
+                assert test_seed.memory_size(asset_name) == len(memory)
+
+    assert_memories()
+    test_seed.add_description_to_asset("loner", "unshared", "alone")
+    test_seed.add_description_to_asset("friend", "eyes", "blue")
+    test_seed.add_description_to_asset("Character1", "eyes", "green")
+    assert_memories()
+    assert test_seed.asset_memory("friend") == test_seed.asset_memory("character1")
+    assert test_seed.asset_memory("LONER") == {"loner"}
+
+    test_seed.bulk_add_descriptions([("loner", "eyes", "brown"), ("new", "hat", "red")])
+    assert_memories()
+    assert "loner" in test_seed.asset_memory("friend")
+
+    # Unlinking splits the memory, and only that memory is rebuilt
+    hat_memory = test_seed.asset_memory("new")
+    test_seed.remove_descriptor("loner", "eyes")
+    assert_memories()
+    assert test_seed.asset_memory("loner") == {"loner"}
+    assert hat_memory == {"new"}
+
+    # Unlinking the asset a descriptor was anchored on, later links still join through it
+    test_seed.remove_descriptor("friend", "eyes")
+    assert_memories()
+    test_seed.link_descriptor("loner", "eyes")
+    assert_memories()
+    assert test_seed.asset_memory("loner") == test_seed.asset_memory("character1")
+
+    # Joining a memory before it was rebuilt, the joined memory is rebuilt as well
+    test_seed.remove_descriptor("loner", "eyes")
+    test_seed.link_descriptor("character1", "hat")
+    assert_memories()
+    assert test_seed.asset_memory("new") == test_seed.asset_memory("character1")
+    assert "loner" not in test_seed.asset_memory("new")
+
+    # The memory is a read-only view
+    assert not hasattr(test_seed.asset_memory("loner"), "add")
+
+    rng = random.Random(0)
+    for step in range(200):
+        asset_name, descriptor_name = f"asset{rng.randrange(12)}", f"desc{rng.randrange(8)}"
+        if rng.random() < 0.6:
+            test_seed.add_description_to_asset(asset_name, descriptor_name, f"word{step}")
+        elif asset_name in test_seed.global_assets and descriptor_name in test_seed.global_assets[asset_name].descriptors:
+            test_seed.remove_descriptor(asset_name, descriptor_name)
+        assert_memories()
+
+    with pytest.raises(errors.AssetNotFound):
+        test_seed.asset_memory("missing")
+    with pytest.raises(errors.AssetNotFound):
+        test_seed.memory_size("missing")
+
+
+
+def test_memories_refresh():
+    links = {"a": ["x"], "b": ["x"], **{name: ["y"] for name in "cdefgh"}}
+    links.update((f"z{i}", [f"z{i}"]) for i in range(10))
+    memories = Memories.build(links.items())
+    assert sorted(map(len, memories)) == [1] * 10 + [2, 6]
+
+    # Only the stale memory is rebuilt, and it stays stale after joining a larger one
+    links["b"] = []
+    memories.unlink("b", "x")
+    links["a"] = ["x", "y"]
+    memories.link("a", "y")
+    memories.refresh(links.get)
+    assert memories.memory("a") == set("acdefgh")
+    assert memories.memory("b") == {"b"}
+
+    # Once most assets are stale everything is rebuilt
+    for name in list(links):
+        for descriptor_name in links[name]:
+            memories.unlink(name, descriptor_name)
+        links[name] = []
+    memories.refresh(links.get)
+    assert sorted(map(len, memories)) == [1] * 18
+
+
+def test_similar_assets():
+    main_seed = MainSeed()
+    rows = [(f"asset{i}", f"desc{j}", "word") for i in range(6) for j in range(i, i + 4)]
+    main_seed.bulk_add_descriptions(rows)
+
+    def brute_force(asset_name, k):
+        asset = main_seed.global_assets[asset_name]
+        scored = [
+            (name, len(asset.descriptors & other.descriptors) / len(asset.descriptors | other.descriptors))
+            for name, other in main_seed.global_assets.items()
+            if name != asset_name and asset.descriptors & other.descriptors
+        ]
+        return sorted(scored, key=lambda item: (-item[1], item[0]))[:k]
+
+    # Overlaps of 3 in 5 and up are found with near certainty
+    similar = main_seed.similar_assets("ASSET2", k=2)
+    assert similar == brute_force("asset2", 2)
+    assert similar == [("asset1", 0.6), ("asset3", 0.6)]
+
+    # Linking and unlinking keep the index up to date
+    for descriptor_name in ("desc0", "desc1"):
+        main_seed.link_descriptor("asset5", descriptor_name)
+    for descriptor_name in ("desc6", "desc7", "desc8"):
+        main_seed.remove_descriptor("asset5", descriptor_name)
+    assert main_seed.global_assets["asset5"].descriptors == {"desc0", "desc1", "desc5"}
+    assert main_seed.similar_assets("asset5", k=1) == [("asset0", 0.4)]
+    main_seed.bulk_add_descriptions([("asset5", "desc2", "word"), ("asset5", "desc3", "word")])
+    assert main_seed.similar_assets("asset5", k=1) == [("asset0", 0.8)]
+
+    main_seed.add_description_to_asset("loner", "unshared", "word")
+    assert main_seed.similar_assets("loner") == []
+    with pytest.raises(errors.AssetNotFound):
+        main_seed.similar_assets("missing")
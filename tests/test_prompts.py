@@ -0,0 +1,84 @@
+import pytest
+
+from seed import errors, prompts
+from seed.models.main_seed import MainSeed
+from seed.prompts import PromptBuilder
+
+
+@pytest.fixture(scope="function")
+def test_seed():
+    main_seed = MainSeed()
+    main_seed.add_description_to_asset("Character1", "eyes", "blue eyes")
+    main_seed.add_description_to_asset("character1", "hair", "blue eyes")
+    main_seed.add_description_to_asset("character1", "hair", "long hair")
+    main_seed.add_description_to_asset("setting1", "grass", "green")
+    main_seed.link_descriptor("setting1", "eyes")
+    main_seed.add_description_to_asset("setting2", "sky", "a very long description indeed")
+    main_seed.link_descriptor("setting2", "eyes")
+    main_seed.link_descriptor("setting2", "hair")
+    main_seed.add_description_to_asset("unrelated", "city", "quiet")
+    yield main_seed
+
+
+def parse(line):
+    """The name and sorted descriptions of a fragment, descriptor sets have no fixed order."""
+    name, _, descriptions = line.partition(": ")
+    return name, sorted(descriptions.split("; ")) if descriptions else []
+
+
+def test_estimate_tokens():
+    assert prompts.estimate_tokens("") == 0
+    assert prompts.estimate_tokens("abcd") == 1
+    assert prompts.estimate_tokens("abcde") == 2
+
+
+def test_build(test_seed):
+    builder = PromptBuilder(test_seed)
+    assert builder.related_assets("character1") == ["setting2", "setting1"]
+
+    prompt = builder.build("CHARACTER1")
+    assert [parse(line) for line in prompt.split("\n")] == [
+        ("character1", ["blue eyes", "long hair"]),
+        ("setting2", ["a very long description indeed", "blue eyes", "long hair"]),
+        ("setting1", ["blue eyes", "green"]),
+    ]
+    assert builder.build_many(["character1", "unrelated"]) == [prompt, "unrelated: quiet"]
+
+    with pytest.raises(errors.AssetNotFound):
+        builder.build("missing")
+    with pytest.raises(ValueError):
+        PromptBuilder(test_seed, budget=0)
+
+
+def test_build_within_budget(test_seed):
+    builder = PromptBuilder(test_seed)
+    own, own_tokens = builder.fragment("character1")
+    setting1, setting1_tokens = builder.fragment("setting1")
+    budget = own_tokens + setting1_tokens
+    builder = PromptBuilder(test_seed, budget=budget)
+
+    # setting2 is too long and skipped, the smaller setting1 after it still fits
+    prompt = builder.build("character1")
+    assert prompt == f"{own}\n{setting1}"
+    assert prompts.estimate_tokens(prompt) <= budget
+
+    # An asset over budget on its own keeps its name and whatever descriptions fit
+    assert PromptBuilder(test_seed, budget=6).build("character1") in ("character1: blue eyes", "character1: long hair")
+    assert PromptBuilder(test_seed, budget=1).build("character1") == "character1"
+
+
+def test_fragment_cache(test_seed):
+    builder = PromptBuilder(test_seed)
+    text, tokens = builder.fragment("setting1")
+    assert tokens == prompts.estimate_tokens(text + "\n")
+    assert builder.fragment("setting1")[0] is text
+
+    # Edits through MainSeed invalidate the fragments of every asset they touch
+    test_seed.add_description("eyes", "brown")
+    assert parse(builder.fragment("setting1")[0]) == ("setting1", ["blue eyes", "brown", "green"])
+    test_seed.remove_descriptor("setting1", "eyes")
+    test_seed.remove_descriptor("setting1", "grass")
+    assert builder.fragment("setting1")[0] == "setting1"
+
+    builder.clear_cache()
+    assert builder.build("setting1") == "setting1"
@@ -0,0 +1,107 @@
+import pytest
+
+from itertools import count
+
+from seed import common, errors
+from seed.models import Asset, Descriptor
+from seed.models.main_seed import MainSeed
+from seed.storage.columnar import ColumnarSeed
+from seed.storage.sqlite import SqliteSeed
+from seed.sequences import FIBONACCI, LevelSequence, LucasSequence, PowersOfTwoSequence
+
+
+class LucasAsset(Asset):
+    level_sequence = LucasSequence()
+
+
+def test_fibonacci_matches_common():
+    for n in range(0, 200):
+        assert FIBONACCI.contains(n) == common.is_fibonacci(n)
+        assert FIBONACCI.next_term(n) == common.get_next_fibonacci(n)
+        assert FIBONACCI.prev_term(n) == common.get_prev_fibonacci(n)
+
+    # Membership also works through the in operator
+    assert 21 in FIBONACCI
+    assert 22 not in FIBONACCI
+
+def test_lucas_sequence():
+    lucas = LucasSequence()
+    assert lucas.terms_through(30) == [1, 2, 3, 4, 7, 11, 18, 29, 47]
+    assert not lucas.contains(0)
+    assert lucas.next_term(0) == 1
+    assert lucas.next_term(4) == 7
+    assert lucas.prev_term(7) == 4
+    assert lucas.prev_term(1) == 0
+
+def test_powers_of_two_sequence():
+    powers = PowersOfTwoSequence()
+    assert powers.contains(1024)
+    assert not powers.contains(1000)
+    assert powers.next_term(1000) == 1024
+    assert powers.prev_term(1000) == 512
+    assert powers.next_term(2**100) == 2**101
+
+def test_custom_sequence():
+    every_third = LevelSequence(count(1, 3), name="every_third")
+    assert every_third.name == "every_third"
+    assert every_third.contains(7)
+    assert not every_third.contains(8)
+    assert every_third.next_term(7) == 10
+
+    # Consecutive duplicates are collapsed
+    duplicates = LevelSequence([1, 1, 2, 2, 3])
+    assert duplicates.terms_through(3) == [1, 2, 3]
+
+    # Finite sequences run out of thresholds
+    with pytest.raises(ValueError):
+        duplicates.next_term(3)
+    assert duplicates.prev_term(10) == 3
+
+    # Terms must not decrease
+    with pytest.raises(ValueError):
+        LevelSequence([1, 5, 3]).contains(6)
+
+def test_model_level_sequence():
+    asset = LucasAsset(name="lucas", descriptors={"a", "b", "c", "d"})
+    assert asset.level_up
+    assert asset.next_fib == 7
+
+    asset.add_descriptor("e")
+    assert not asset.level_up
+    assert asset.next_fib == 7
+
+    # Other models are untouched
+    assert Asset.level_sequence is FIBONACCI
+    assert Descriptor.level_sequence is FIBONACCI
+    assert Asset(name="fib", descriptors={"a", "b", "c", "d"}).next_fib == 5
+
+def test_description_length_independent_of_level_sequence(monkeypatch):
+    monkeypatch.setattr(Descriptor, "level_sequence", PowersOfTwoSequence())
+    main_seed = MainSeed()
+
+    # Word counts follow the Fibonacci rule whatever the level sequence is, 3 is not a power of two
+    main_seed.add_description_to_asset("asset", "eyes", "deep blue eyes")
+    with pytest.raises(errors.FailedDescriptionLength):
+        main_seed.add_description_to_asset("asset", "eyes", "four words long description")
+    failed = main_seed.bulk_add_descriptions([("asset", "eyes", "bright green eyes"), ("asset", "eyes", "a b c d")])
+    assert [index for index, _ in failed] == [1]
+
+    # Levels do follow the level sequence, 2 descriptions is a power of two
+    desc = main_seed.global_descriptors["eyes"]
+    assert desc.level_up
+    assert desc.next_fib == 4
+
+    # What add_description accepted loads again
+    reloaded = MainSeed.model_validate_json(main_seed.model_dump_json())
+    assert reloaded == main_seed
+    assert reloaded.global_descriptors["eyes"].descriptions == ["deep blue eyes", "bright green eyes"]
+
+    # The storage backends check word counts the same way
+    columnar = ColumnarSeed()
+    columnar.add_description_to_asset("asset", "eyes", "deep blue eyes")
+    with pytest.raises(errors.FailedDescriptionLength):
+        columnar.add_description_to_asset("asset", "eyes", "four words long description")
+    with SqliteSeed() as seed_db:
+        seed_db.add_description_to_asset("asset", "eyes", "deep blue eyes")
+        with pytest.raises(errors.FailedDescriptionLength):
+            seed_db.add_description_to_asset("asset", "eyes", "four words long description")
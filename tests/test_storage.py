@@ -0,0 +1,482 @@
+import io
+import os
+import json
+import logging
+import sqlite3
+import pytest
+
+from seed import errors
+from seed.models.main_seed import MainSeed
+from seed.models.lazy import LazyModels
+from seed.storage import json_stream, snapshot
+from seed.storage.columnar import ColumnarSeed
+from seed.storage.journal import ADD_DESCRIPTION, JournaledSeed, encode_record
+from seed.storage.sqlite import SqliteSeed
+
+pytestmark = pytest.mark.storage
+
+
+@pytest.fixture(scope="function")
+def test_seed_dict(basic_json):
+    yield json.loads(basic_json)
+
+
+@pytest.fixture(scope="function")
+def test_seed(basic_json):
+    main_seed = MainSeed.model_validate_json(basic_json)
+    main_seed.add_description_to_asset("Zürich", "Città", "naïve café")
+    yield main_seed
+
+
+def test_stream_dump_matches_model_dump(test_seed):
+    expected = test_seed.model_dump_json()
+
+    text = io.StringIO()
+    json_stream.dump(test_seed, text)
+    assert text.getvalue() == expected
+
+    binary = io.BytesIO()
+    json_stream.dump(test_seed, binary)
+    assert binary.getvalue() == expected.encode()
+
+    empty = io.StringIO()
+    json_stream.dump(MainSeed(), empty)
+    assert empty.getvalue() == MainSeed().model_dump_json()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, json_stream.CHUNK_SIZE])
+def test_stream_load_round_trip(test_seed, chunk_size):
+    binary = io.BytesIO()
+    json_stream.dump(test_seed, binary)
+
+    # Small chunks split keys, numbers and multi-byte characters
+    for trusted in (False, True):
+        binary.seek(0)
+        assert json_stream.load(binary, trusted=trusted, chunk_size=chunk_size) == test_seed
+
+    text = io.StringIO(json.dumps(json.loads(binary.getvalue()), indent=4))
+    assert json_stream.load(text, chunk_size=chunk_size) == test_seed
+
+
+def test_stream_load_sanitizes(invalid_desc_next_fib_json, basic_json):
+    main_seed = json_stream.load(io.StringIO(invalid_desc_next_fib_json))
+    assert main_seed == MainSeed.model_validate_json(invalid_desc_next_fib_json)
+
+    strict_json = json.loads(invalid_desc_next_fib_json)
+    strict_json["strict"] = True
+    with pytest.raises(errors.SeedValidationException):
+        json_stream.load(io.StringIO(json.dumps(strict_json)))
+
+    # Entries are keyed by their canonical name
+    seed_dict = json.loads(basic_json)
+    seed_dict["global_assets"] = {key.upper(): value for key, value in seed_dict["global_assets"].items()}
+    main_seed = json_stream.load(io.StringIO(json.dumps(seed_dict)))
+    assert list(main_seed.global_assets) == [key.lower() for key in seed_dict["global_assets"]]
+
+
+def test_loaders_merge_duplicate_names(duplicate_names_json):
+    expected = MainSeed.model_validate_json(duplicate_names_json)
+    assert json_stream.load(io.StringIO(duplicate_names_json), chunk_size=16) == expected
+
+    lazy = MainSeed.load(duplicate_names_json, lazy=True)
+    assert lazy.num_descriptors == expected.num_descriptors
+    assert lazy.global_assets.hydrate_all() == expected.global_assets
+    assert lazy.global_descriptors["eyes"].descriptions == expected.global_descriptors["eyes"].descriptions
+
+    strict_json = json.loads(duplicate_names_json)
+    strict_json["strict"] = True
+    with pytest.raises(errors.SeedValidationException):
+        json_stream.load(io.StringIO(json.dumps(strict_json)))
+    with pytest.raises(errors.SeedValidationException):
+        MainSeed.load(json.dumps(strict_json), lazy=True).global_assets.hydrate_all()
+
+    parallel = pytest.importorskip("seed.storage.parallel")
+    assert parallel.load(duplicate_names_json, workers=1, shards_per_worker=2) == expected
+    with pytest.raises(errors.AggregatedValidationException) as exc_info:
+        parallel.load(json.dumps(strict_json), workers=1)
+    assert [(field, name) for field, name, _ in exc_info.value.errors] == [
+        ("global_descriptors", "eyes"),
+        ("global_assets", "billy"),
+    ]
+
+
+def test_stream_load_malformed(basic_json):
+    for document in (basic_json[:-2], basic_json + "{}", '{"global_assets": []}', ""):
+        with pytest.raises(json.JSONDecodeError):
+            json_stream.load(io.StringIO(document), chunk_size=16)
+
+
+def test_snapshot_round_trip(test_seed, tmp_path):
+    path = str(tmp_path / "seed.snap")
+    snapshot.dump(test_seed, path)
+
+    for trusted in (False, True):
+        assert snapshot.load(path, lazy=False, trusted=trusted) == test_seed
+
+    # Nothing is decoded until it is accessed
+    main_seed = snapshot.load(path)
+    assert isinstance(main_seed.global_assets, LazyModels)
+    assert main_seed.num_assets == test_seed.num_assets
+    assert main_seed.global_assets.num_hydrated == 0
+    assert main_seed.global_descriptors["città"] == test_seed.global_descriptors["città"]
+    assert main_seed.global_descriptors.num_hydrated == 1
+    assert main_seed.global_assets.hydrate_all() == test_seed.global_assets
+    assert main_seed.global_descriptors.hydrate_all() == test_seed.global_descriptors
+
+    # Closing releases the map, models accessed before stay usable
+    with snapshot.load(path) as main_seed:
+        character = main_seed.global_assets["character1"]
+    assert character == test_seed.global_assets["character1"]
+    with pytest.raises(ValueError):
+        main_seed.global_assets["setting1"]
+    main_seed.close()
+    with snapshot.load(path, lazy=False) as main_seed:
+        assert main_seed == test_seed
+
+
+def test_snapshot_json_conversion(test_seed, tmp_path):
+    path = str(tmp_path / "seed.snap")
+    snapshot.json_to_snapshot(io.StringIO(test_seed.model_dump_json()), path)
+    assert snapshot.load(path, lazy=False) == test_seed
+
+    exported = io.StringIO()
+    snapshot.snapshot_to_json(path, exported)
+    assert MainSeed.model_validate_json(exported.getvalue()) == test_seed
+
+    empty_path = str(tmp_path / "empty.snap")
+    snapshot.dump(MainSeed(), empty_path)
+    assert snapshot.load(empty_path, lazy=False) == MainSeed()
+
+
+def test_snapshot_invalid_file(basic_json, test_seed, tmp_path):
+    path = tmp_path / "seed.json"
+    for content in (basic_json, ""):
+        path.write_text(content)
+        with pytest.raises(errors.SnapshotFormatError):
+            snapshot.load(str(path))
+
+    # Truncated snapshots, cut in the header, the records or the string table
+    snapshot_path = tmp_path / "seed.snap"
+    snapshot.dump(test_seed, str(snapshot_path))
+    data = snapshot_path.read_bytes()
+    for length in (len(snapshot.MAGIC) + 2, 40, len(data) // 2, len(data) - 1):
+        path.write_bytes(data[:length])
+        with pytest.raises(errors.SnapshotFormatError):
+            snapshot.load(str(path))
+
+    # A damaged record only raises once it is decoded
+    header = snapshot._HEADER.unpack_from(data)
+    asset_index = header[-1]
+    damaged = bytearray(data)
+    offset = int.from_bytes(data[asset_index : asset_index + 8], "little")
+    damaged[offset : offset + 4] = (2**32 - 1).to_bytes(4, "little")
+    path.write_bytes(bytes(damaged))
+    with snapshot.load(str(path)) as main_seed:
+        assert main_seed.num_assets == header[7]
+        with pytest.raises(errors.SnapshotFormatError):
+            main_seed.global_assets.hydrate_all()
+
+
+def test_sqlite_matches_main_seed(test_seed, caplog):
+    with SqliteSeed.from_main_seed(test_seed) as seed_db:
+        assert seed_db.to_main_seed() == test_seed
+        assert seed_db.num_assets == test_seed.num_assets
+        assert seed_db.global_assets_next_fib == test_seed.global_assets_next_fib
+        assert seed_db.global_desc_level_up == test_seed.global_desc_level_up
+
+        rows = [("character1", "desc1", "red"), ("SETTING1", "Desc1", "blue hair"), ("new", "desc4", "one two")]
+        for row in rows:
+            test_seed.add_description_to_asset(*row)
+            seed_db.add_description_to_asset(*row)
+        test_seed.link_descriptor("new", "desc2")
+        seed_db.link_descriptor("NEW", "desc2")
+
+        assert seed_db.to_main_seed() == test_seed
+        for name in test_seed.global_assets:
+            assert seed_db.get_asset(name) == test_seed.global_assets[name]
+            assert seed_db.asset_relations(name) == test_seed.asset_relations(name)
+            assert sorted(seed_db.export_asset_descriptions(name)) == sorted(test_seed.export_asset_descriptions(name))
+        assert seed_db.get_descriptor("DESC1") == test_seed.global_descriptors["desc1"]
+
+        with pytest.raises(errors.FailedDescriptionLength):
+            seed_db.add_description_to_asset("new", "desc4", "one two three four")
+        with pytest.raises(errors.AssetNotFound):
+            seed_db.asset_relations("missing")
+        with pytest.raises(KeyError):
+            seed_db.link_descriptor("missing", "desc1")
+
+        # Duplicates are skipped and logged
+        with caplog.at_level(logging.INFO, logger="seed.storage.sqlite"):
+            seed_db.add_description("desc1", "RED")
+        assert "red has already been added to this descriptor: desc1" in caplog.text
+
+        seed_db.remove_description("desc1", "RED")
+        seed_db.remove_descriptor("new", "desc2")
+        test_seed.remove_description("desc1", "RED")
+        test_seed.remove_descriptor("new", "desc2")
+        assert seed_db.to_main_seed() == test_seed
+        with pytest.raises(ValueError):
+            seed_db.remove_description("desc1", "red")
+
+
+def test_sqlite_counts_follow_rollback(monkeypatch):
+    def fail(*args):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    with SqliteSeed() as seed_db:
+        seed_db.add_description_to_asset("asset1", "desc1", "red")
+        monkeypatch.setattr(seed_db, "_add_description", fail)
+        with pytest.raises(sqlite3.OperationalError):
+            seed_db.add_description_to_asset("asset2", "desc2", "blue")
+        with pytest.raises(sqlite3.OperationalError):
+            seed_db.add_description("desc3", "green")
+
+        # The rolled back names were never counted
+        assert list(seed_db.to_main_seed().global_assets) == ["asset1"]
+        assert (seed_db.num_assets, seed_db.num_descriptors) == (1, 1)
+        assert seed_db.global_assets_next_fib == MainSeed.level_sequence.next_term(1)
+        monkeypatch.undo()
+        seed_db.add_description_to_asset("asset2", "desc2", "blue")
+        assert (seed_db.num_assets, seed_db.num_descriptors) == (2, 2)
+
+
+def test_sqlite_bulk_add_descriptions(tmp_path):
+    rows = [
+        ("asset1", "desc1", "red"),
+        ("Asset1", "DESC1", "Red"),
+        ("asset2", "desc1", "one two three four"),
+        ("asset2", None, "blue"),
+        ("asset2", "desc2", "blue hair"),
+        ("asset3", "desc2", "green"),
+    ]
+    main_seed = MainSeed()
+    for asset_name, descriptor_name, description in rows[:1] + rows[4:]:
+        main_seed.add_description_to_asset(asset_name, descriptor_name, description)
+
+    path = str(tmp_path / "seed.db")
+    with SqliteSeed(path) as seed_db:
+        failed = seed_db.bulk_add_descriptions(rows, batch_size=4)
+        assert [index for index, _ in failed] == [2, 3]
+        assert isinstance(failed[0][1], errors.FailedDescriptionLength)
+        assert seed_db.to_main_seed() == main_seed
+
+    # Reopening keeps the data and the counts
+    with SqliteSeed(path) as seed_db:
+        assert seed_db.num_assets == 3
+        assert seed_db.num_descriptors == 2
+        assert seed_db.asset_relations("asset3") == {"desc2": {"asset2"}}
+
+
+def test_columnar_matches_main_seed(test_seed, caplog):
+    seed = ColumnarSeed.from_main_seed(test_seed)
+    assert seed.to_main_seed() == test_seed
+    assert seed.num_descriptors == test_seed.num_descriptors
+
+    levels, expected_levels = [], []
+    seed.add_level_listener(lambda *args: levels.append(args))
+    test_seed.add_level_listener(lambda *args: expected_levels.append(args))
+    rows = [("character1", "desc1", "red"), ("SETTING1", "Desc1", "blue hair"), ("new", "desc4", "one two")]
+    for row in rows:
+        test_seed.add_description_to_asset(*row)
+        seed.add_description_to_asset(*row)
+    test_seed.link_descriptor("new", "desc2")
+    seed.link_descriptor("NEW", "desc2")
+    assert levels == expected_levels
+
+    assert seed.to_main_seed().model_dump() == test_seed.model_dump()
+    for name in test_seed.global_assets:
+        assert seed.get_asset(name) == test_seed.global_assets[name]
+        assert seed.asset_relations(name) == test_seed.asset_relations(name)
+        assert sorted(seed.export_asset_descriptions(name)) == sorted(test_seed.export_asset_descriptions(name))
+    assert seed.get_descriptor("DESC1") == test_seed.global_descriptors["desc1"]
+
+    with pytest.raises(errors.FailedDescriptionLength):
+        seed.add_description_to_asset("new", "desc4", "one two three four")
+    with pytest.raises(errors.AssetNotFound):
+        seed.asset_relations("missing")
+    with pytest.raises(KeyError):
+        seed.link_descriptor("missing", "desc1")
+    with pytest.raises(ValueError):
+        seed.remove_description("desc1", "missing")
+
+    # Duplicates are skipped and logged
+    with caplog.at_level(logging.INFO, logger="seed.storage.columnar"):
+        seed.add_description("desc1", "RED")
+    assert "red has already been added to this descriptor: desc1" in caplog.text
+
+    seed.remove_description("desc1", "RED")
+    seed.remove_descriptor("new", "desc2")
+    test_seed.remove_description("desc1", "RED")
+    test_seed.remove_descriptor("new", "desc2")
+    seed.relevel_all()
+    assert seed.to_main_seed().model_dump() == test_seed.model_dump()
+
+
+def test_columnar_bulk_add_descriptions():
+    rows = [
+        ("asset1", "desc1", "red"),
+        ("Asset1", "DESC1", "Red"),
+        ("asset2", "desc1", "one two three four"),
+        ("asset2", None, "blue"),
+        ("asset2", "desc2", "blue hair"),
+        ("asset3", "desc2", "green"),
+    ]
+    main_seed = MainSeed()
+    main_seed.bulk_add_descriptions(rows)
+
+    seed = ColumnarSeed()
+    failed = seed.bulk_add_descriptions(rows)
+    assert [index for index, _ in failed] == [2, 3]
+    assert seed.to_main_seed().model_dump() == main_seed.model_dump()
+    assert seed.asset_relations("asset3") == {"desc2": {"asset2"}}
+
+    # A later batch repeating what the rows already hold adds nothing twice
+    levels, expected_levels = [], []
+    seed.add_level_listener(lambda *args: levels.append(args))
+    main_seed.add_level_listener(lambda *args: expected_levels.append(args))
+    more = [("asset1", "desc1", "red"), ("asset1", "desc1", "bright red"), ("asset1", "desc1", "bright red")]
+    more += [(f"asset{i}", "desc2", "blue hair") for i in range(10)]
+    main_seed.bulk_add_descriptions(more)
+    seed.bulk_add_descriptions(more)
+    assert levels == expected_levels
+    assert seed.to_main_seed().model_dump() == main_seed.model_dump()
+    assert seed.get_descriptor("desc1").descriptions == ["red", "bright red"]
+
+    seed.remove_descriptor("asset1", "desc1")
+    with pytest.raises(KeyError):
+        seed.remove_descriptor("asset1", "desc1")
+
+
+def journal_edits(seed):
+    seed.add_description_to_asset("Character1", "Eyes", "blue")
+    seed.add_description_to_asset("setting1", "eyes", "green")
+    seed.add_description("desc3", "tall")
+    seed.link_descriptor("character1", "desc3")
+    seed.remove_description("eyes", "GREEN")
+    seed.remove_descriptor("setting1", "eyes")
+
+
+def test_journal_replay(test_seed, tmp_path):
+    expected = test_seed.model_copy(deep=True)
+    journal_edits(expected)
+
+    directory = str(tmp_path / "world")
+    snapshot_dir = tmp_path / "world"
+    snapshot_dir.mkdir()
+    snapshot.dump(test_seed, str(snapshot_dir / "snapshot-00000000.snap"))
+
+    with JournaledSeed(directory) as journaled:
+        journal_edits(journaled)
+        assert journaled.seed == expected
+
+        # Failed edits change nothing and are not recorded
+        with pytest.raises(errors.FailedDescriptionLength):
+            journaled.add_description("eyes", "one two three four")
+        with pytest.raises(errors.FailedDescriptionLength):
+            journaled.add_description_to_asset("hero", "iris", "one two three four")
+        with pytest.raises(KeyError):
+            journaled.link_descriptor("character1", "nope")
+        with pytest.raises(KeyError):
+            journaled.remove_descriptor("character1", "nope")
+        assert journaled.seed == expected
+
+    # A torn record at the end is dropped on recovery
+    journal_path = snapshot_dir / "journal-00000000.log"
+    with open(journal_path, "ab") as fp:
+        fp.write(encode_record(ADD_DESCRIPTION, "eyes", "torn")[:-3])
+
+    with JournaledSeed(directory) as journaled:
+        assert journaled.seed == expected
+        journaled.add_description("eyes", "brown")
+    expected.add_description("eyes", "brown")
+
+    with JournaledSeed(directory) as journaled:
+        assert journaled.seed == expected
+
+
+def test_journal_compaction(tmp_path):
+    directory = tmp_path / "world"
+    expected = MainSeed()
+    with JournaledSeed(str(directory), compact_threshold=256) as journaled:
+        for index in range(50):
+            row = (f"asset{index % 7}", f"desc{index % 5}", f"word{index}")
+            journaled.add_description_to_asset(*row)
+            expected.add_description_to_asset(*row)
+        assert journaled.generation >= 1
+
+        # Fold the rest once the background compaction is done
+        journaled.wait_for_compaction()
+        journaled.compact(wait=True)
+        assert journaled.seed.global_assets == expected.global_assets
+
+    # Only the newest snapshot and journal are left behind
+    assert sorted(os.listdir(directory)) == [f"journal-{journaled.generation:08d}.log", f"snapshot-{journaled.generation:08d}.snap"]
+    with JournaledSeed(str(directory)) as journaled:
+        assert journaled.seed.global_descriptors.hydrate_all() == expected.global_descriptors
+        assert journaled.seed.global_assets.hydrate_all() == expected.global_assets
+
+
+def test_parallel_load(test_seed, invalid_desc_next_fib_json):
+    parallel = pytest.importorskip("seed.storage.parallel")
+    seed_json = test_seed.model_dump_json()
+    assert parallel.load(seed_json, workers=2, shards_per_worker=2) == MainSeed.model_validate_json(seed_json)
+    assert parallel.load(invalid_desc_next_fib_json, workers=1) == MainSeed.model_validate_json(invalid_desc_next_fib_json)
+
+    strict_json = json.loads(invalid_desc_next_fib_json)
+    strict_json["strict"] = True
+    with pytest.raises(errors.SeedValidationException):
+        parallel.load(json.dumps(strict_json), workers=1)
+
+
+def test_parallel_load_aggregates_errors(test_seed_dict):
+    parallel = pytest.importorskip("seed.storage.parallel")
+    test_seed_dict["global_descriptors"]["desc2"]["descriptions"] = ["one two three four"]
+    test_seed_dict["global_assets"]["setting1"]["next_fib"] = 8
+    test_seed_dict["global_assets"]["setting1"]["strict"] = True
+    test_seed_dict["global_assets"]["character1"]["name"] = None
+
+    with pytest.raises(errors.AggregatedValidationException) as exc_info:
+        parallel.load(json.dumps(test_seed_dict), workers=2)
+    failed = {(section, name) for section, name, _ in exc_info.value.errors}
+    assert failed == {("global_descriptors", "desc2"), ("global_assets", "setting1"), ("global_assets", "character1")}
+    assert "3 entities failed validation" in str(exc_info.value)
+
+    # In process as well
+    with pytest.raises(errors.AggregatedValidationException) as exc_info:
+        parallel.load(json.dumps(test_seed_dict), workers=1)
+    assert len(exc_info.value.errors) == 3
+
+
+def test_parallel_load_shards_raw_bytes():
+    parallel = pytest.importorskip("seed.storage.parallel")
+    main_seed = MainSeed()
+    # Braces, escaped quotes and backslashes inside strings, and names that are also section keys
+    main_seed.add_description_to_asset("global_assets", "global_descriptors", 'a "}, {" b c')
+    main_seed.add_description_to_asset("global_assets", "quote\\", "back\\slash")
+    main_seed.add_description_to_asset('say "hi"', "braces", "{")
+    for index in range(40):
+        main_seed.add_description_to_asset(f"asset{index}", f"desc{index % 7}", f"description {index}")
+
+    seed_json = main_seed.model_dump_json()
+    for workers, shards_per_worker in ((1, 1), (1, 3), (2, 5)):
+        assert parallel.load(seed_json, workers=workers, shards_per_worker=shards_per_worker) == main_seed
+    # Whitespace between the tokens, and sections in another order
+    indented = json.dumps(dict(reversed(json.loads(seed_json).items())), indent=2)
+    assert parallel.load(indented, workers=1, shards_per_worker=4) == main_seed
+
+    # The shards hold whole entries, nothing else
+    rest, sections = parallel._split_sections(seed_json.encode())
+    assert json.loads(rest)["global_assets"] == {}
+    shards = list(parallel._shards(seed_json.encode(), sections["global_assets"], 4))
+    assert len(shards) == 4
+    assert sum(len(json.loads(b"{" + shard.lstrip(b", ") + b"}")) for shard in shards) == main_seed.num_assets
+
+    # Entries that aren't objects still reach validation
+    broken = json.loads(seed_json)
+    broken["global_assets"]["zzz"] = 5
+    with pytest.raises(errors.AggregatedValidationException) as exc_info:
+        parallel.load(json.dumps(broken), workers=1)
+    assert [name for _, name, _ in exc_info.value.errors] == ["zzz"]
+
+    with pytest.raises(ValueError):
+        parallel.load(seed_json[:-1], workers=1)
@@ -0,0 +1,54 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from seed import common, vectorized
+from seed.models import Asset, Descriptor
+from seed.models.main_seed import MainSeed
+from seed.sequences import LevelSequence, PowersOfTwoSequence
+
+
+def test_is_fibonacci_array():
+    values = np.arange(-5, 5000)
+    expected = [common.is_fibonacci(int(n)) for n in values]
+    assert vectorized.is_fibonacci(values).tolist() == expected
+
+    # Empty input keeps its shape
+    assert vectorized.is_fibonacci(np.array([], dtype=np.int64)).shape == (0,)
+
+def test_get_next_fibonacci_array():
+    values = np.arange(-5, 5000)
+    expected = [common.get_next_fibonacci(int(n)) for n in values]
+    assert vectorized.get_next_fibonacci(values).tolist() == expected
+
+    # Larger counts regrow the cached term array
+    big = np.array([common.get_fibonacci(60), common.get_fibonacci(60) + 1])
+    assert vectorized.get_next_fibonacci(big).tolist() == [common.get_fibonacci(61)] * 2
+
+def test_level_sequence_arrays():
+    powers = PowersOfTwoSequence()
+    values = np.array([0, 1, 3, 4, 1000])
+    assert vectorized.level_contains(values, powers).tolist() == [False, True, False, True, False]
+    assert vectorized.level_next_term(values, powers).tolist() == [1, 2, 4, 8, 1024]
+
+    with pytest.raises(ValueError):
+        vectorized.level_next_term([1, 2, 3], LevelSequence([1, 2, 3]))
+
+def test_relevel_all():
+    seed = MainSeed()
+    for asset_index in range(10):
+        for descriptor_index in range(asset_index):
+            seed.add_description_to_asset(f"asset{asset_index}", f"desc{descriptor_index}", f"word{asset_index}")
+
+    # Scramble the levels, then fix everything in one pass
+    for model in list(seed.global_assets.values()) + list(seed.global_descriptors.values()):
+        model.level_up = not model.level_up
+        model.next_fib = 0
+    seed.relevel_all()
+
+    for asset in seed.global_assets.values():
+        assert asset == Asset(name=asset.name, descriptors=asset.descriptors)
+    for desc in seed.global_descriptors.values():
+        assert desc == Descriptor(name=desc.name, descriptions=desc.descriptions, asset_links=desc.asset_links)
+    assert seed.global_assets_next_fib == common.get_next_fibonacci(seed.num_assets)
+    assert seed.global_desc_level_up == common.is_fibonacci(seed.num_descriptors)